@@ -2,4 +2,5 @@
 
 from .aggregator import Aggregator
 from .weighted_voting import WeightedVotingAggregator
-from .majority_voting import MajorityVotingAggregator
+from .majority_voting import MajorityVotingAggregator, IncrementalMajorityVoter
+from .bayesian_inference import BayesianAggregator
@@ -0,0 +1,236 @@
+from typing import List, Dict, Optional, Sequence
+import numpy as np
+from utils.label_encoding import LabelVocabulary, present_mask
+from .aggregator import Aggregator
+from .weighted_voting import WeightedVotingAggregator
+
+class BayesianAggregator(Aggregator):
+    """
+    Implements Dawid-Skene aggregation: every model gets a confusion matrix giving the
+    probability of each predicted label given the true label, and the true labels are
+    inferred by expectation-maximization over all items at once.
+    """
+
+    def __init__(self, classes: Optional[Sequence] = None, max_iter: int = 50, tol: float = 1e-6,
+                 smoothing: float = 1.0, decay: float = 1.0):
+        """
+        Initializes the aggregator.
+
+        Args:
+            classes (Sequence, optional): Known labels; labels seen later are added automatically.
+            max_iter (int): Maximum number of EM iterations per batch.
+            tol (float): Stop EM once the mean log-likelihood improves by less than this.
+            smoothing (float): Dirichlet pseudo-count added to every confusion cell, doubled on the
+                diagonal so models start out assumed better than chance.
+            decay (float): Factor applied to the statistics of earlier batches before adding a new one
+                (1.0 keeps all history, lower values track drifting models).
+        """
+        self.vocabulary = LabelVocabulary(classes)
+        self.max_iter = max_iter
+        self.tol = tol
+        self.smoothing = smoothing
+        self.decay = decay
+        self.confusion_counts = None  # (n_models, n_classes, n_classes) expected counts
+        self.class_counts = None  # (n_classes,) expected counts
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.confusion_counts is not None
+
+    def fit(self, label_matrix: np.ndarray) -> Dict:
+        """
+        Estimates the model confusion matrices from scratch.
+
+        Args:
+            label_matrix (np.ndarray): Array of shape (n_models, n_items); None or NaN marks a missing prediction.
+
+        Returns:
+            Dict: Aggregated result for the items, as returned by aggregate_batch.
+        """
+        self.confusion_counts = None
+        self.class_counts = None
+        return self.partial_fit(label_matrix)
+
+    def partial_fit(self, label_matrix: np.ndarray) -> Dict:
+        """
+        Updates the model confusion matrices with a new batch, warm-starting EM from the current estimates.
+        Only the accumulated expected counts are kept, so the cost is linear in items x models of the batch.
+
+        Args:
+            label_matrix (np.ndarray): Array of shape (n_models, n_items); None or NaN marks a missing prediction.
+
+        Returns:
+            Dict: Aggregated result for the batch, as returned by aggregate_batch.
+        """
+        codes = self._encode(label_matrix)
+        n_classes = len(self.vocabulary)
+        one_hot = self._one_hot(codes, n_classes)
+
+        if self.is_fitted:
+            history_confusion = self.confusion_counts * self.decay
+            history_classes = self.class_counts * self.decay
+            posteriors, _ = self._e_step(one_hot, *self._parameters(history_confusion, history_classes))
+        else:
+            history_confusion = np.zeros((codes.shape[0], n_classes, n_classes))
+            history_classes = np.zeros(n_classes)
+            posteriors = self._vote_posteriors(one_hot)
+
+        previous_likelihood = -np.inf
+        for _ in range(self.max_iter):
+            # M-step: expected confusion counts of this batch added to the history
+            batch_confusion = posteriors.T @ one_hot
+            batch_classes = posteriors.sum(axis=0)
+            parameters = self._parameters(history_confusion + batch_confusion, history_classes + batch_classes)
+
+            # E-step: posterior over the true label of every item
+            posteriors, likelihood = self._e_step(one_hot, *parameters)
+            if likelihood - previous_likelihood < self.tol:
+                break
+            previous_likelihood = likelihood
+
+        self.confusion_counts = history_confusion + posteriors.T @ one_hot
+        self.class_counts = history_classes + posteriors.sum(axis=0)
+        return self._result(posteriors)
+
+    def predict_proba(self, label_matrix: np.ndarray) -> np.ndarray:
+        """
+        Computes the posterior over true labels without updating the model.
+        Labels the model was not fitted on carry no evidence and are treated like missing predictions.
+
+        Args:
+            label_matrix (np.ndarray): Array of shape (n_models, n_items); None or NaN marks a missing prediction.
+
+        Returns:
+            np.ndarray: Array of shape (n_items, n_classes) with the posterior of each label.
+        """
+        if not self.is_fitted:
+            raise ValueError("BayesianAggregator must be fitted before predicting.")
+        codes = self._encode(label_matrix, update=False)
+        one_hot = self._one_hot(codes, len(self.vocabulary))
+        posteriors, _ = self._e_step(one_hot, *self._parameters(self.confusion_counts, self.class_counts))
+        return posteriors
+
+    def aggregate_batch(self, label_matrix: np.ndarray, update: bool = True) -> Dict:
+        """
+        Aggregates predictions for many items at once.
+
+        Args:
+            label_matrix (np.ndarray): Array of shape (n_models, n_items); None or NaN marks a missing prediction.
+            update (bool): Whether to refine the confusion matrices with this batch.
+
+        Returns:
+            Dict: "result" holds the most probable label per item, "details" the (n_items, n_labels)
+            posterior table and "labels" the label of each column.
+        """
+        if update or not self.is_fitted:
+            return self.partial_fit(label_matrix)
+        return self._result(self.predict_proba(label_matrix))
+
+    def aggregate(self, predictions: List[Dict], confidences: List[float] = None) -> Dict:
+        """
+        Aggregate the predictions of all models for a single item.
+        Falls back to confidence-weighted voting until the confusion matrices have been fitted.
+
+        Args:
+            predictions (List[Dict]): One prediction per model, in the order used for fitting.
+            confidences (List[float], optional): Confidence scores used by the fallback.
+
+        Returns:
+            Dict: Aggregated result as a dictionary.
+        """
+        if not self.is_fitted or len(predictions) != self.confusion_counts.shape[0]:
+            confidences = confidences if confidences is not None else [1.0] * len(predictions)
+            return WeightedVotingAggregator().aggregate(predictions, confidences)
+
+        label_matrix = np.array([[pred["label"]] for pred in predictions], dtype=object)
+        posteriors = self.predict_proba(label_matrix)[0]
+        details = {label: float(posterior) for label, posterior in zip(self.vocabulary.labels, posteriors)}
+        return {"result": self.vocabulary.labels[int(np.argmax(posteriors))], "details": details}
+
+    def confusion_matrices(self) -> np.ndarray:
+        """
+        Returns the estimated confusion matrices.
+
+        Returns:
+            np.ndarray: Array of shape (n_models, n_classes, n_classes) where entry [m, k, l] is the
+            probability that model m predicts label l when the true label is k.
+        """
+        if not self.is_fitted:
+            raise ValueError("BayesianAggregator must be fitted first.")
+        return np.exp(self._parameters(self.confusion_counts, self.class_counts)[0])
+
+    def _encode(self, label_matrix: np.ndarray, update: bool = True) -> np.ndarray:
+        """
+        Encodes labels to integer codes, with -1 for missing predictions. New labels grow the
+        vocabulary and the stored statistics, or are encoded as missing when update is False.
+        """
+        label_matrix = np.asarray(label_matrix)
+        if label_matrix.ndim != 2:
+            raise ValueError("label_matrix must have shape (n_models, n_items).")
+        if self.is_fitted and label_matrix.shape[0] != self.confusion_counts.shape[0]:
+            raise ValueError(f"Expected predictions from {self.confusion_counts.shape[0]} models.")
+
+        present = present_mask(label_matrix)
+        codes = np.full(label_matrix.shape, -1, dtype=np.int64)
+        if not update:
+            # Encoded against a copy, so the fitted vocabulary and statistics stay untouched
+            known = len(self.vocabulary)
+            present_codes = LabelVocabulary(self.vocabulary.labels).encode(label_matrix[present])
+            codes[present] = np.where(present_codes < known, present_codes, -1)
+            return codes
+        codes[present] = self.vocabulary.encode(label_matrix[present])
+
+        if self.is_fitted and len(self.vocabulary) > len(self.class_counts):
+            grow = len(self.vocabulary) - len(self.class_counts)
+            self.confusion_counts = np.pad(self.confusion_counts, ((0, 0), (0, grow), (0, grow)))
+            self.class_counts = np.pad(self.class_counts, (0, grow))
+        return codes
+
+    @staticmethod
+    def _one_hot(codes: np.ndarray, n_classes: int) -> np.ndarray:
+        """
+        Expands codes of shape (n_models, n_items) to one-hot rows; missing predictions are all zeros.
+        """
+        one_hot = np.zeros(codes.shape + (n_classes,))
+        models, items = np.nonzero(codes >= 0)
+        one_hot[models, items, codes[models, items]] = 1.0
+        return one_hot
+
+    @staticmethod
+    def _vote_posteriors(one_hot: np.ndarray) -> np.ndarray:
+        """
+        Initial posteriors from the vote share of each label, used when there is no history.
+        """
+        votes = one_hot.sum(axis=0)
+        totals = votes.sum(axis=1, keepdims=True)
+        uniform = np.full_like(votes, 1.0 / max(votes.shape[1], 1))
+        return np.divide(votes, totals, out=uniform, where=totals > 0)
+
+    def _parameters(self, confusion_counts: np.ndarray, class_counts: np.ndarray):
+        """
+        Turns expected counts plus the Dirichlet prior into log confusion matrices and log class priors.
+        """
+        n_classes = len(class_counts)
+        prior = self.smoothing * (1.0 + np.eye(n_classes))
+        confusion = confusion_counts + prior
+        log_confusion = np.log(confusion / confusion.sum(axis=2, keepdims=True))
+        classes = class_counts + self.smoothing
+        log_prior = np.log(classes / classes.sum())
+        return log_confusion, log_prior
+
+    @staticmethod
+    def _e_step(one_hot: np.ndarray, log_confusion: np.ndarray, log_prior: np.ndarray):
+        """
+        Computes item posteriors and the mean log-likelihood of the batch.
+        """
+        # log P(observed labels | true label k) summed over models: (n_items, n_classes)
+        log_joint = log_prior + (one_hot @ log_confusion.transpose(0, 2, 1)).sum(axis=0)
+        log_max = log_joint.max(axis=1, keepdims=True)
+        log_evidence = log_max + np.log(np.exp(log_joint - log_max).sum(axis=1, keepdims=True))
+        posteriors = np.exp(log_joint - log_evidence)
+        likelihood = float(log_evidence.mean()) if len(log_evidence) else 0.0
+        return posteriors, likelihood
+
+    def _result(self, posteriors: np.ndarray) -> Dict:
+        labels = np.asarray(self.vocabulary.labels)
+        return {"result": labels[np.argmax(posteriors, axis=1)], "details": posteriors, "labels": labels}
@@ -1,5 +1,7 @@
 from collections import Counter
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence
+import numpy as np
+from utils.label_encoding import LabelVocabulary, encode_labels, present_mask
 from .aggregator import Aggregator
 
 class MajorityVotingAggregator(Aggregator):
@@ -26,3 +28,185 @@ class MajorityVotingAggregator(Aggregator):
         # Determine final result by selecting the most common prediction
         result = votes.most_common(1)[0][0]
         return {"result": result, "details": dict(votes)}
+
+class IncrementalMajorityVoter:
+    """
+    Majority voting that consumes predictions as models report them.
+    Vote counts are kept per item in a compact (n_items, n_labels) array, and an item is
+    finalized as soon as every model has reported it, so results for early pages are
+    available while models are still running on later ones.
+    """
+
+    def __init__(self, models: Sequence[str], classes: Optional[Sequence] = None, keep_finalized: bool = True):
+        """
+        Initializes the voter.
+
+        Args:
+            models (Sequence[str]): Names of all models expected to report each item.
+            classes (Sequence, optional): Known labels; labels seen later are added automatically.
+            keep_finalized (bool): Whether finalized items stay in result(). When False their rows are
+                released once emitted, so memory only grows with the items still in flight; a later
+                report for a released item starts a new item.
+        """
+        self.models = list(models)
+        self.keep_finalized = keep_finalized
+        self.vocabulary = LabelVocabulary(classes)
+        self._slots = {}
+        self._free = []
+        self._item_ids = np.empty(0, dtype=object)
+        self._counts = np.zeros((0, len(self.vocabulary)), dtype=np.int32)
+        self._reported = np.zeros((0, len(self.models)), dtype=bool)
+        self._active = np.zeros(0, dtype=bool)
+        self._finalized = np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def update(self, model: str, item_ids: Sequence, labels: Sequence) -> Dict:
+        """
+        Adds one model's predictions for a batch of items.
+
+        Args:
+            model (str): Name of the reporting model.
+            item_ids (Sequence): Identifier of each item (e.g. page numbers).
+            labels (Sequence): Predicted label per item; None or NaN records an abstention.
+
+        Returns:
+            Dict: Items finalized by this batch, in the format of result().
+        """
+        if model not in self.models:
+            raise ValueError(f"Unknown model {model}. Expected one of: {', '.join(self.models)}")
+        model_index = self.models.index(model)
+        item_ids = np.asarray(item_ids)
+        labels = np.asarray(labels)
+        if item_ids.ndim != 1 or labels.shape != item_ids.shape:
+            raise ValueError("item_ids and labels must be one-dimensional and of equal length.")
+
+        # Checked before any slot is allocated, so a rejected batch leaves no items behind
+        known = self._slots_for(item_ids, allocate=False)
+        duplicated = len(encode_labels(item_ids)[0]) != len(item_ids)
+        if duplicated or self._reported[known[known >= 0], model_index].any():
+            raise ValueError(f"Model {model} reported the same item more than once.")
+        slots = self._slots_for(item_ids)
+
+        present = present_mask(labels)
+        codes = self.vocabulary.encode(labels[present])
+        self._reserve(len(self._active), len(self.vocabulary))
+        # Slots are unique within the batch, so plain fancy indexing adds each vote once
+        self._counts[slots[present], codes] += 1
+        self._reported[slots, model_index] = True
+        return self._finalize(slots)
+
+    def merge(self, other: "IncrementalMajorityVoter") -> Dict:
+        """
+        Adds the votes collected by another voter, e.g. one run by a different worker.
+
+        Args:
+            other (IncrementalMajorityVoter): Voter over the same models.
+
+        Returns:
+            Dict: Items finalized by the merge, in the format of result().
+        """
+        if other.models != self.models:
+            raise ValueError("Only voters over the same models can be merged.")
+
+        other_slots = np.flatnonzero(other._active)
+        label_codes = self.vocabulary.add(other.vocabulary.labels)
+        known = self._slots_for(other._item_ids[other_slots], allocate=False)
+        if (self._reported[known[known >= 0]] & other._reported[other_slots[known >= 0]]).any():
+            raise ValueError("Both voters hold a report from the same model for the same item.")
+        slots = self._slots_for(other._item_ids[other_slots])
+
+        self._reserve(len(self._active), len(self.vocabulary))
+        self._counts[np.ix_(slots, label_codes)] += other._counts[other_slots, :len(label_codes)]
+        self._reported[slots] |= other._reported[other_slots]
+        # Items finalized only in the other voter are new here, so _finalize emits them
+        return self._finalize(slots)
+
+    def result(self) -> Dict:
+        """
+        Returns the current majority for every tracked item.
+
+        Returns:
+            Dict: "items" holds the item ids, "result" the winning label per item (None if every
+            model abstained), "details" the (n_items, n_labels) vote counts, "labels" the label of
+            each count column and "finalized" whether all models have reported the item.
+            Ties go to the label this voter saw first.
+        """
+        slots = np.flatnonzero(self._active)
+        result = self._result(slots)
+        result["finalized"] = self._finalized[slots]
+        return result
+
+    def _result(self, slots: np.ndarray) -> Dict:
+        counts = self._counts[slots]
+        labels = np.empty(len(self.vocabulary), dtype=object)
+        labels[:] = self.vocabulary.labels
+        winners = np.full(len(slots), None, dtype=object)
+        voted = counts.any(axis=1)
+        winners[voted] = labels[np.argmax(counts[voted], axis=1)]
+        return {"items": self._item_ids[slots], "result": winners, "details": counts, "labels": labels}
+
+    def _finalize(self, slots: np.ndarray) -> Dict:
+        """
+        Emits the given items that all models have now reported and that were not emitted before.
+        """
+        slots = slots[self._reported[slots].all(axis=1) & ~self._finalized[slots]]
+        self._finalized[slots] = True
+        result = self._result(slots)
+        if not self.keep_finalized:
+            self._release(slots)
+        return result
+
+    def _slots_for(self, item_ids: np.ndarray, allocate: bool = True) -> np.ndarray:
+        """
+        Maps item ids to rows of the count arrays, allocating rows for unseen items
+        (or mapping them to -1 when allocate is False). Only the distinct ids are looked up in Python.
+        """
+        if len(item_ids) == 0:
+            return np.empty(0, dtype=np.int64)
+        uniques, inverse = encode_labels(item_ids)
+        unique_slots = np.empty(len(uniques), dtype=np.int64)
+        for index, item_id in enumerate(uniques.tolist()):
+            slot = self._slots.get(item_id)
+            if slot is None and not allocate:
+                slot = -1
+            elif slot is None:
+                slot = self._free.pop() if self._free else len(self._slots) + len(self._free)
+                self._reserve(slot + 1, len(self.vocabulary))
+                self._slots[item_id] = slot
+                self._item_ids[slot] = item_id
+                self._active[slot] = True
+            unique_slots[index] = slot
+        return unique_slots[inverse]
+
+    def _release(self, slots: np.ndarray):
+        for slot in slots.tolist():
+            del self._slots[self._item_ids[slot]]
+            self._free.append(slot)
+        self._counts[slots] = 0
+        self._reported[slots] = False
+        self._active[slots] = False
+        self._finalized[slots] = False
+        self._item_ids[slots] = None
+
+    def _reserve(self, n_slots: int, n_labels: int):
+        """
+        Grows the count arrays to hold at least n_slots items and n_labels labels.
+        Rows grow geometrically so appending items stays amortized O(1).
+        """
+        rows, columns = self._counts.shape
+        if n_slots <= rows and n_labels <= columns:
+            return
+        new_rows = max(n_slots, 2 * rows, 64) if n_slots > rows else rows
+        new_columns = max(n_labels, columns)
+
+        counts = np.zeros((new_rows, new_columns), dtype=np.int32)
+        counts[:rows, :columns] = self._counts
+        self._counts = counts
+        if new_rows > rows:
+            grow = new_rows - rows
+            self._item_ids = np.concatenate([self._item_ids, np.full(grow, None, dtype=object)])
+            self._reported = np.vstack([self._reported, np.zeros((grow, len(self.models)), dtype=bool)])
+            self._active = np.concatenate([self._active, np.zeros(grow, dtype=bool)])
+            self._finalized = np.concatenate([self._finalized, np.zeros(grow, dtype=bool)])
@@ -1,4 +1,6 @@
-from typing import List, Dict
+from typing import List, Dict, Sequence
+import numpy as np
+from utils.label_encoding import encode_labels
 from .aggregator import Aggregator
 
 class WeightedVotingAggregator(Aggregator):
@@ -6,17 +8,44 @@ class WeightedVotingAggregator(Aggregator):
     Implements confidence-weighted voting aggregation.
     """
 
-    def aggregate(self, predictions: List[Dict], confidences: List[float]) -> Dict:
+    def __init__(self, weight_adjuster=None):
+        """
+        Initializes the aggregator.
+
+        Args:
+            weight_adjuster (DynamicWeightAdjuster, optional): Source of learned model weights, used
+                whenever no confidences are passed explicitly.
+        """
+        self.weight_adjuster = weight_adjuster
+
+    def model_weights(self, model_names: Sequence[str]) -> List[float]:
+        """
+        Looks up the learned weight of each model.
+
+        Args:
+            model_names (Sequence[str]): Names of the models.
+
+        Returns:
+            List[float]: Weight of each model; 1.0 when there is no adjuster or no feedback yet.
+        """
+        if self.weight_adjuster is None:
+            return [1.0] * len(model_names)
+        return [self.weight_adjuster.get_weight(name) for name in model_names]
+
+    def aggregate(self, predictions: List[Dict], confidences: List[float] = None) -> Dict:
         """
         Aggregate predictions using confidence-weighted voting.
 
         Args:
             predictions (List[Dict]): List of model predictions.
-            confidences (List[float]): List of confidence scores for each model.
+            confidences (List[float], optional): List of confidence scores for each model. Defaults to
+                the learned weights of the models named by each prediction's "model" key.
 
         Returns:
             Dict: Aggregated result as a dictionary.
         """
+        if confidences is None:
+            confidences = self.model_weights([pred.get("model") for pred in predictions])
         weighted_scores = {}
         total_confidence = sum(confidences)
 
@@ -29,3 +58,49 @@ class WeightedVotingAggregator(Aggregator):
         # Determine final result by selecting the max-weighted score
         result = max(weighted_scores, key=weighted_scores.get)
         return {"result": result, "details": weighted_scores}
+
+    def aggregate_batch(self, label_matrix: np.ndarray, confidences: Sequence[float] = None,
+                        model_names: Sequence[str] = None) -> Dict:
+        """
+        Aggregate predictions for many items at once using confidence-weighted voting.
+
+        Args:
+            label_matrix (np.ndarray): Array of shape (n_models, n_items) with each model's label per item.
+            confidences (Sequence[float], optional): Confidence score for each model. Defaults to the
+                learned weights of the models in model_names.
+            model_names (Sequence[str], optional): Name of the model behind each row of label_matrix.
+
+        Returns:
+            Dict: "result" holds the winning label per item, "details" the (n_items, n_labels)
+            array of normalized scores and "labels" the label of each score column.
+            Ties go to the label that sorts first.
+
+        Raises:
+            ValueError: If the confidence scores do not sum to a positive value.
+        """
+        label_matrix = np.asarray(label_matrix)
+        if confidences is None:
+            if model_names is None:
+                raise ValueError("Either confidences or model_names must be given.")
+            confidences = self.model_weights(model_names)
+        weights = np.asarray(confidences, dtype=float)
+        if label_matrix.ndim != 2:
+            raise ValueError("label_matrix must have shape (n_models, n_items).")
+        if weights.shape != (label_matrix.shape[0],):
+            raise ValueError("Expected one confidence score per model.")
+        total_weight = weights.sum()
+        if not total_weight > 0:
+            raise ValueError("Confidence scores must sum to a positive value.")
+
+        n_models, n_items = label_matrix.shape
+        labels, codes = encode_labels(label_matrix)
+        if n_items == 0:
+            return {"result": labels.copy(), "details": np.zeros((0, 0)), "labels": labels}
+
+        # Each (item, label) pair gets one bin; every vote adds its model's normalized weight
+        bins = np.arange(n_items) * len(labels) + codes
+        vote_weights = np.repeat(weights / total_weight, n_items)
+        scores = np.bincount(bins.ravel(), weights=vote_weights, minlength=n_items * len(labels))
+        scores = scores.reshape(n_items, len(labels))
+
+        return {"result": labels[np.argmax(scores, axis=1)], "details": scores, "labels": labels}
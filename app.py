@@ -0,0 +1,255 @@
+import argparse
+import json
+import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from main import load_weight_adjuster, predict_file, postprocess
+from models.registry import default_registry
+from models.scheduler import ModelScheduler
+from utils.logger import setup_logger
+
+logger = setup_logger('app', None)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".txt", ".csv", ".jpg", ".png")
+SUPPORTED_FORMATS = ("json", "text")
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+
+INDEX_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>PdfSpliter</title></head>
+<body>
+<h1>PdfSpliter</h1>
+<input type="file" id="file" accept=".pdf,.txt,.csv,.jpg,.png">
+<button onclick="upload()">Process</button>
+<pre id="result"></pre>
+<script>
+async function upload() {
+    const file = document.getElementById("file").files[0];
+    if (!file) return;
+    const response = await fetch("/predict?filename=" + encodeURIComponent(file.name), {method: "POST", body: file});
+    document.getElementById("result").textContent = await response.text();
+}
+</script>
+</body>
+</html>
+"""
+
+class InferenceService:
+    def __init__(self, pipeline, workers=2, queue_size=16):
+        """
+        Runs pipeline jobs on a fixed set of worker threads fed by a bounded queue.
+        :param pipeline: Callable taking (input_path, output_format) and returning the formatted result.
+        :param workers: Number of jobs processed concurrently.
+        :param queue_size: Maximum number of jobs waiting for a worker.
+        """
+        self.pipeline = pipeline
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self.workers = [
+            threading.Thread(target=self._work, name=f"pipeline-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def _work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            future, input_path, output_format = job
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self.pipeline(input_path, output_format))
+                except Exception as e:
+                    future.set_exception(e)
+            self.jobs.task_done()
+
+    def submit(self, input_path, output_format):
+        """
+        Queues a job without blocking.
+        :param input_path: Path to the uploaded input file.
+        :param output_format: Output format ("json" or "text").
+        :return: Future resolved with the formatted result.
+        :raises queue.Full: If the queue is already at capacity.
+        """
+        future = Future()
+        self.jobs.put_nowait((future, input_path, output_format))
+        return future
+
+    def pending(self):
+        """
+        Returns the number of jobs waiting for a worker.
+        """
+        return self.jobs.qsize()
+
+    def shutdown(self):
+        """
+        Stops the workers once the queued jobs are done.
+        """
+        for _ in self.workers:
+            self.jobs.put(None)
+        for worker in self.workers:
+            worker.join()
+
+class PipelineServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service, scheduler, request_timeout=None):
+        """
+        HTTP server exposing the inference pipeline.
+        :param address: (host, port) tuple to listen on.
+        :param service: InferenceService running the pipeline jobs.
+        :param scheduler: ModelScheduler whose registry holds the warm models.
+        :param request_timeout: Seconds a request waits for its result before failing (None waits forever).
+        """
+        super().__init__(address, PipelineRequestHandler)
+        self.service = service
+        self.scheduler = scheduler
+        self.request_timeout = request_timeout
+
+class PipelineRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/":
+            self._send(200, INDEX_PAGE, "text/html")
+        elif path == "/health":
+            registry = self.server.scheduler.registry
+            status = {
+                "status": "ok",
+                "loaded_models": [name for name in registry.names() if registry.is_loaded(name)],
+                "queued_jobs": self.server.service.pending(),
+            }
+            self._send(200, json.dumps(status), "application/json")
+        else:
+            self._send_error(404, "Not found")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/predict":
+            self._send_error(404, "Not found")
+            return
+
+        query = parse_qs(url.query)
+        file_name = query.get("filename", [self.headers.get("X-Filename", "")])[0]
+        output_format = query.get("format", ["json"])[0]
+        extension = os.path.splitext(file_name)[1].lower()
+        if extension not in SUPPORTED_EXTENSIONS:
+            self._send_error(400, f"Unsupported file format. Supported formats: {', '.join(SUPPORTED_EXTENSIONS)}")
+            return
+        if output_format not in SUPPORTED_FORMATS:
+            self._send_error(400, f"Unsupported output format. Supported formats: {', '.join(SUPPORTED_FORMATS)}")
+            return
+
+        content_length = int(self.headers.get("Content-Length", 0))
+        if content_length > MAX_UPLOAD_BYTES:
+            self._send_error(413, "Upload too large")
+            return
+
+        # Preprocessors read from disk, so the upload is spooled to a temporary file
+        with tempfile.NamedTemporaryFile(suffix=extension, delete=False) as upload:
+            upload.write(self.rfile.read(content_length))
+        try:
+            future = self.server.service.submit(upload.name, output_format)
+        except queue.Full:
+            os.remove(upload.name)
+            self._send_error(503, "Server busy, try again later", {"Retry-After": "1"})
+            return
+        # The job owns the upload: after a timeout it may still be running and reading the file
+        future.add_done_callback(lambda _: os.remove(upload.name))
+
+        try:
+            result = future.result(timeout=self.server.request_timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self._send_error(504, "Processing timed out")
+            return
+        except Exception as e:
+            self._send_error(500, str(e))
+            return
+
+        content_type = "application/json" if output_format == "json" else "text/plain"
+        self._send(200, result, content_type)
+
+    def _send(self, status, body, content_type, headers=None):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status, message, headers=None):
+        self._send(status, json.dumps({"error": message}), "application/json", headers)
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} - {format % args}")
+
+def create_server(host="127.0.0.1", port=5000, model_names=None, workers=2, queue_size=16,
+                  model_timeout=None, request_timeout=None, registry=None, weights_path=None):
+    """
+    Loads the models once and builds the HTTP server around them.
+    :param host: Interface to listen on.
+    :param port: Port to listen on (0 picks a free port).
+    :param model_names: Optional subset of models to serve.
+    :param workers: Number of requests processed concurrently.
+    :param queue_size: Maximum number of requests waiting for a worker.
+    :param model_timeout: Optional per-model prediction timeout in seconds.
+    :param request_timeout: Optional number of seconds a request waits for its result.
+    :param registry: Registry of models, defaults to the standard model set.
+    :param weights_path: Optional JSON snapshot of learned model weights used for voting.
+    :return: PipelineServer ready to serve_forever().
+    """
+    registry = registry if registry is not None else default_registry()
+    weight_adjuster = load_weight_adjuster(weights_path)
+    scheduler = ModelScheduler(registry, default_timeout=model_timeout)
+
+    # Load every served model up front so requests never pay for model loading
+    for name in registry.select(names=model_names):
+        try:
+            registry.get(name)
+            logger.info(f"Loaded model {name}")
+        except Exception as e:
+            logger.warning(f"Model {name} could not be loaded: {e}")
+
+    def pipeline(input_path, output_format):
+        result = predict_file(input_path, model_names, scheduler=scheduler, weight_adjuster=weight_adjuster)
+        return postprocess(result, output_format)
+
+    service = InferenceService(pipeline, workers=workers, queue_size=queue_size)
+    return PipelineServer((host, port), service, scheduler, request_timeout)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the PdfSpliter pipeline over HTTP with warm models.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=5000, help="Port to listen on")
+    parser.add_argument("--models", help="Comma-separated subset of models to serve (e.g. RandomForest,SVM)")
+    parser.add_argument("--workers", type=int, default=2, help="Number of requests processed concurrently")
+    parser.add_argument("--queue-size", type=int, default=16, help="Maximum number of requests waiting for a worker")
+    parser.add_argument("--timeout", type=float, help="Per-model prediction timeout in seconds")
+    parser.add_argument("--request-timeout", type=float, help="Seconds a request waits for its result")
+    parser.add_argument("--weights", help="JSON snapshot of learned model weights")
+    args = parser.parse_args()
+
+    model_names = [name.strip() for name in args.models.split(",")] if args.models else None
+    server = create_server(
+        args.host, args.port, model_names, args.workers, args.queue_size, args.timeout, args.request_timeout,
+        weights_path=args.weights
+    )
+    logger.info(f"Serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+        server.scheduler.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import subprocess
+import sys
+import time
+
+# Frameworks that should only be imported once a model or preprocessor needs them
+HEAVY_MODULES = ["torch", "transformers", "cv2", "sklearn", "nltk", "tensorflow"]
+
+# Commands whose startup cost is measured, as (label, python arguments)
+STARTUP_COMMANDS = [
+    ("main.py --help", ["main.py", "--help"]),
+    ("import main", ["-c", "import main"]),
+    # Discovery imports every test module without running any test
+    ("import tests", ["-c", "import unittest; unittest.defaultTestLoader.discover('tests', top_level_dir='.')"]),
+]
+
+def parse_importtime(stderr):
+    """
+    Parses the output of `python -X importtime`.
+
+    Args:
+        stderr (str): Standard error of the profiled interpreter.
+
+    Returns:
+        Dict[str, int]: Cumulative import time in microseconds for each imported module,
+        keyed by module name indented by its nesting depth.
+    """
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[1].strip().isdigit():
+            continue  # Header line
+        timings[fields[2][1:].rstrip()] = int(fields[1])
+    return timings
+
+def profile_command(args):
+    """
+    Runs a Python command with import profiling enabled.
+
+    Args:
+        args (List[str]): Arguments passed to the interpreter.
+
+    Returns:
+        Tuple[float, Dict[str, int]]: Wall-clock time in seconds and per-module import times.
+    """
+    start_time = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start_time
+    return elapsed, parse_importtime(completed.stderr)
+
+def imported_heavy_modules(timings):
+    """
+    Lists the heavy frameworks that were imported.
+
+    Args:
+        timings (Dict[str, int]): Per-module import times from parse_importtime.
+
+    Returns:
+        List[str]: Names of the heavy frameworks found in the timings.
+    """
+    imported = {name.strip() for name in timings}
+    return [module for module in HEAVY_MODULES if module in imported]
+
+def format_report(label, elapsed, timings, top=10):
+    """
+    Formats the startup report for one command.
+
+    Args:
+        label (str): Name of the profiled command.
+        elapsed (float): Wall-clock time in seconds.
+        timings (Dict[str, int]): Per-module cumulative import times in microseconds.
+        top (int): Number of slowest top-level imports to list.
+
+    Returns:
+        str: Human-readable report.
+    """
+    heavy = imported_heavy_modules(timings)
+    top_level = {name: value for name, value in timings.items() if not name.startswith(" ")}
+    slowest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:top]
+
+    report = f"{label}: {elapsed * 1000:.0f} ms wall clock\n"
+    report += f"  heavy frameworks imported: {', '.join(heavy) if heavy else 'none'}\n"
+    report += "  slowest top-level imports:\n"
+    for name, value in slowest:
+        report += f"    {value / 1000:8.1f} ms  {name}\n"
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Report interpreter startup and import times.")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list")
+    args = parser.parse_args()
+
+    failed = False
+    for label, command in STARTUP_COMMANDS:
+        elapsed, timings = profile_command(command)
+        print(format_report(label, elapsed, timings, args.top))
+        failed = failed or bool(imported_heavy_modules(timings))
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,3 @@
-from .performance_metrics import PerformanceMetrics
+from .performance_metrics import PerformanceMetrics, MetricsAccumulator
 from .dynamic_weight_adjuster import DynamicWeightAdjuster
 from .disagreement_handler import DisagreementHandler
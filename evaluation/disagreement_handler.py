@@ -1,4 +1,5 @@
 import numpy as np
+from utils.label_encoding import encode_labels, present_mask
 
 class DisagreementHandler:
     def __init__(self, threshold=0.2):
@@ -14,24 +15,55 @@ class DisagreementHandler:
         :param model_predictions: Dictionary of model names and their predictions.
         :return: Resolved prediction or None if no consensus is reached.
         """
-        # Aggregate predictions
-        aggregated_predictions = {}
-        for model, predictions in model_predictions.items():
-            for i, prediction in enumerate(predictions):
-                if i not in aggregated_predictions:
-                    aggregated_predictions[i] = []
-                aggregated_predictions[i].append(prediction)
-
-        # Resolve disagreements
-        resolved_predictions = []
-        for pred_list in aggregated_predictions.values():
-            pred_counts = np.unique(pred_list, return_counts=True)
-            majority_vote = pred_counts[0][np.argmax(pred_counts[1])]
-
-            # Check if majority confidence exceeds the threshold
-            if max(pred_counts[1]) / len(pred_list) > self.threshold:
-                resolved_predictions.append(majority_vote)
-            else:
-                resolved_predictions.append(None)  # No consensus
-        
-        return resolved_predictions
+        resolved, consensus, _ = self.resolve_batch(model_predictions)
+        return np.where(consensus, resolved, None).tolist()
+
+    def resolve_batch(self, model_predictions):
+        """
+        Resolves disagreements for all items at once using integer-encoded label counts.
+        Models may return different numbers of predictions, and None (or NaN) marks a missing output;
+        each item is judged only on the models that reported it.
+        :param model_predictions: Dictionary of model names and their predictions, or an (n_models, n_items) array.
+        :return: Tuple of (resolved, consensus, agreement) arrays with one entry per item: the majority label,
+                 whether its agreement ratio exceeds the threshold, and the agreement ratio itself.
+        """
+        rows = list(model_predictions.values()) if isinstance(model_predictions, dict) else list(model_predictions)
+        n_items = max((len(row) for row in rows), default=0)
+
+        # Flatten the reported (item, label) pairs of every model, dropping missing outputs
+        item_indices = []
+        values = []
+        for row in rows:
+            row = np.asarray(row)
+            present = present_mask(row)
+            item_indices.append(np.flatnonzero(present))
+            values.append(self._clean(row[present]))
+        item_indices = np.concatenate(item_indices) if item_indices else np.empty(0, dtype=int)
+        values = np.concatenate(values) if values else np.empty(0)
+
+        labels, codes = encode_labels(values)
+        n_labels = len(labels)
+        counts = np.bincount(item_indices * n_labels + codes, minlength=n_items * n_labels)
+        counts = counts.reshape(n_items, n_labels)
+
+        reported = np.bincount(item_indices, minlength=n_items)
+        if n_labels:
+            majority = counts.argmax(axis=1)
+            resolved = labels[majority]
+            majority_counts = counts[np.arange(n_items), majority]
+        else:
+            resolved = np.full(n_items, None, dtype=object)
+            majority_counts = np.zeros(n_items)
+
+        agreement = np.divide(majority_counts, reported, out=np.zeros(n_items), where=reported > 0)
+        consensus = agreement > self.threshold
+        return resolved, consensus, agreement
+
+    @staticmethod
+    def _clean(values):
+        """
+        Converts the reported values of an object row back to a native NumPy dtype.
+        """
+        if values.dtype == object:
+            return np.array(values.tolist())
+        return values
@@ -1,14 +1,22 @@
+import json
+import numpy as np
+from utils.file_manager import atomic_write
+from utils.label_encoding import present_mask
+
 class DynamicWeightAdjuster:
-    def __init__(self, initial_weights=None, learning_rate=0.1, decay_factor=0.99):
+    def __init__(self, initial_weights=None, learning_rate=0.1, decay_factor=0.99, snapshot_path=None):
         """
         Initializes the dynamic weight adjuster.
         :param initial_weights: Dictionary of model weights.
         :param learning_rate: Rate of weight adjustment.
         :param decay_factor: Factor to decay weights over time.
+        :param snapshot_path: Optional JSON file the weights are saved to after every batch update.
         """
         self.weights = initial_weights if initial_weights else {}
         self.learning_rate = learning_rate
         self.decay_factor = decay_factor
+        self.snapshot_path = snapshot_path
+        self.updates = 0
 
     def update_weight(self, model_name, performance_score):
         """
@@ -18,16 +26,88 @@ class DynamicWeightAdjuster:
         """
         if model_name not in self.weights:
             self.weights[model_name] = 1.0  # Initialize weight if not present
-        
+
         # Adjust weight based on performance
         self.weights[model_name] = (
             self.weights[model_name] * self.decay_factor +
             self.learning_rate * performance_score
         )
 
+    def update_batch(self, predictions, true_labels):
+        """
+        Updates the weights of several models from one batch of labelled feedback.
+        Each model's accuracy on the batch is computed with array operations and fed to update_weight,
+        so the cost per batch does not depend on how many batches came before.
+        :param predictions: Dictionary mapping model names to arrays of predicted labels (None or NaN when missing).
+        :param true_labels: Array of true labels for the batch.
+        :return: Dictionary of the accuracy of each model on the batch.
+        """
+        true_labels = np.asarray(true_labels)
+        scores = {}
+        for model_name, model_predictions in predictions.items():
+            model_predictions = np.asarray(model_predictions)
+            if model_predictions.shape != true_labels.shape:
+                raise ValueError(f"Predictions of {model_name} do not match the number of true labels.")
+            present = present_mask(model_predictions)
+            if not present.any():
+                continue  # No feedback for this model in the batch
+            scores[model_name] = float(np.mean(model_predictions[present] == true_labels[present]))
+            self.update_weight(model_name, scores[model_name])
+
+        self.updates += 1
+        if self.snapshot_path:
+            self.save()
+        return scores
+
+    def get_weight(self, model_name, default=1.0):
+        """
+        Returns the current weight of a model.
+        :param model_name: Name of the model.
+        :param default: Weight returned for models without feedback yet.
+        :return: Weight of the model.
+        """
+        return self.weights.get(model_name, default)
+
     def get_weights(self):
         """
         Returns the current model weights.
         :return: Dictionary of model weights.
         """
         return self.weights
+
+    def save(self, path=None):
+        """
+        Saves the weights as JSON. The file is written next to the target and moved into place,
+        so readers never see a partially written snapshot.
+        :param path: Destination file, defaults to the snapshot path.
+        """
+        path = path or self.snapshot_path
+        if not path:
+            raise ValueError("No path given to save the weights to.")
+        state = {
+            "weights": self.weights,
+            "learning_rate": self.learning_rate,
+            "decay_factor": self.decay_factor,
+            "updates": self.updates,
+        }
+        with atomic_write(path, fsync=True) as file:
+            json.dump(state, file, indent=4)
+
+    @classmethod
+    def load(cls, path, snapshot=True):
+        """
+        Restores an adjuster from a saved snapshot.
+        :param path: JSON file written by save.
+        :param snapshot: Whether later batch updates keep writing to the same file.
+        :return: DynamicWeightAdjuster with the saved weights and settings.
+        """
+        with open(path, "r") as file:
+            state = json.load(file)
+        adjuster = cls(
+            initial_weights=state["weights"],
+            learning_rate=state["learning_rate"],
+            decay_factor=state["decay_factor"],
+            snapshot_path=path if snapshot else None,
+        )
+        adjuster.updates = state.get("updates", 0)
+        return adjuster
@@ -1,4 +1,5 @@
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+import numpy as np
+from utils.label_encoding import LabelVocabulary
 
 class PerformanceMetrics:
     def evaluate(self, true_labels, predictions):
@@ -8,10 +9,114 @@ class PerformanceMetrics:
         :param predictions: Predicted labels from the model.
         :return: Dictionary of performance metrics.
         """
-        metrics = {
-            "accuracy": accuracy_score(true_labels, predictions),
-            "precision": precision_score(true_labels, predictions, average="weighted", zero_division=0),
-            "recall": recall_score(true_labels, predictions, average="weighted", zero_division=0),
-            "f1_score": f1_score(true_labels, predictions, average="weighted", zero_division=0)
+        accumulator = MetricsAccumulator()
+        accumulator.update(true_labels, predictions)
+        return accumulator.compute()
+
+class MetricsAccumulator:
+    def __init__(self, classes=None):
+        """
+        Accumulates confusion matrices batch by batch, so metrics over any number of predictions
+        need one pass and memory proportional to the number of classes only.
+        :param classes: Optional known labels; labels seen later are added automatically.
+        """
+        self.vocabulary = LabelVocabulary(classes)
+        self.confusion = {}  # Model name (None for a single stream) -> (n_classes, n_classes) counts
+
+    def update(self, true_labels, predictions, model=None):
+        """
+        Adds a batch of predictions.
+        :param true_labels: Ground truth labels of the batch.
+        :param predictions: Predicted labels of the batch.
+        :param model: Optional name of the model that made the predictions.
+        """
+        true_codes = self.vocabulary.encode(np.asarray(true_labels).ravel())
+        predicted_codes = self.vocabulary.encode(np.asarray(predictions).ravel())
+        if true_codes.shape != predicted_codes.shape:
+            raise ValueError("true_labels and predictions must have the same length.")
+
+        n_classes = len(self.vocabulary)
+        counts = np.bincount(true_codes * n_classes + predicted_codes, minlength=n_classes * n_classes)
+        self._matrix(model)[...] += counts.reshape(n_classes, n_classes)
+
+    def merge(self, other):
+        """
+        Adds the counts of another accumulator, e.g. one filled by a different process.
+        :param other: MetricsAccumulator to merge into this one.
+        :return: This accumulator.
+        """
+        codes = self.vocabulary.add(other.vocabulary.labels)
+        for model, confusion in other.confusion.items():
+            self._matrix(model)[np.ix_(codes, codes)] += confusion
+        return self
+
+    def confusion_matrix(self, model=None):
+        """
+        Returns the accumulated confusion matrix.
+        :param model: Optional name of the model.
+        :return: Array where entry [i, j] counts items of class labels[i] predicted as labels[j].
+        """
+        return self._matrix(model).copy()
+
+    def compute(self, model=None):
+        """
+        Derives accuracy and support-weighted precision, recall and F1 from the confusion matrix,
+        matching sklearn's average="weighted" with zero_division=0.
+        :param model: Optional name of the model.
+        :return: Dictionary of performance metrics.
+        """
+        confusion = self._matrix(model)
+        per_class = self._per_class(confusion)
+        support = per_class["support"]
+        total = support.sum()
+        if total == 0:
+            return {"accuracy": 0.0, "precision": 0.0, "recall": 0.0, "f1_score": 0.0}
+        return {
+            "accuracy": float(np.trace(confusion) / total),
+            "precision": float(per_class["precision"] @ support / total),
+            "recall": float(per_class["recall"] @ support / total),
+            "f1_score": float(per_class["f1_score"] @ support / total),
+        }
+
+    def per_class(self, model=None):
+        """
+        Breaks the metrics down by class.
+        :param model: Optional name of the model.
+        :return: Dictionary mapping each label to its precision, recall, F1 score and support.
+        """
+        per_class = self._per_class(self._matrix(model))
+        return {
+            label: {metric: values[index].item() for metric, values in per_class.items()}
+            for index, label in enumerate(self.vocabulary.labels)
         }
-        return metrics
+
+    def per_model(self):
+        """
+        Computes the metrics of every model that reported predictions.
+        :return: Dictionary mapping model names to their performance metrics.
+        """
+        return {model: self.compute(model) for model in self.confusion if model is not None}
+
+    def _matrix(self, model):
+        """
+        Returns the confusion matrix of a model, growing it when new labels have appeared.
+        """
+        n_classes = len(self.vocabulary)
+        confusion = self.confusion.get(model)
+        if confusion is None or len(confusion) < n_classes:
+            grown = np.zeros((n_classes, n_classes), dtype=np.int64)
+            if confusion is not None:
+                grown[:len(confusion), :len(confusion)] = confusion
+            confusion = self.confusion[model] = grown
+        return confusion
+
+    @staticmethod
+    def _per_class(confusion):
+        true_positives = np.diag(confusion).astype(float)
+        support = confusion.sum(axis=1)
+        predicted = confusion.sum(axis=0)
+        precision = np.divide(true_positives, predicted, out=np.zeros_like(true_positives), where=predicted > 0)
+        recall = np.divide(true_positives, support, out=np.zeros_like(true_positives), where=support > 0)
+        denominator = precision + recall
+        f1 = np.divide(2 * precision * recall, denominator, out=np.zeros_like(true_positives), where=denominator > 0)
+        return {"precision": precision, "recall": recall, "f1_score": f1, "support": support}
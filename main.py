@@ -1,20 +1,30 @@
 import argparse
 import os
+import numpy as np
 from preprocessing.text_preprocessor import TextPreprocessor
+from preprocessing.pdf_cache import PdfTextCache
 from preprocessing.image_preprocessor import ImagePreprocessor
 from preprocessing.tabular_preprocessor import TabularPreprocessor
-from models.supervised.random_forest_model import RandomForestModel
-from models.supervised.svm_model import SVMModel
-from models.supervised.neural_network_model import NeuralNetworkModel
-from models.unsupervised.kmeans_model import KMeansModel
-from models.unsupervised.dbscan_model import DBSCANModel
-from models.pretrained.bert_model import BERTModel
-from models.pretrained.gpt_model import GPTModel
+from models.registry import default_registry, TEXT, IMAGE, TABULAR
+from models.scheduler import ModelScheduler
 from aggregation.weighted_voting import WeightedVotingAggregator
 from evaluation.performance_metrics import PerformanceMetrics
+from evaluation.dynamic_weight_adjuster import DynamicWeightAdjuster
+from utils.label_encoding import LabelVocabulary
 from postprocessing.result_formatter import format_to_json, format_to_plain_text
 
 
+def detect_modality(input_path):
+    if input_path.endswith((".txt", ".pdf")):
+        return TEXT
+    elif input_path.endswith((".jpg", ".png")):
+        return IMAGE
+    elif input_path.endswith(".csv"):
+        return TABULAR
+    else:
+        raise ValueError("Unsupported file format. Supported formats: .txt, .pdf, .jpg, .png, .csv")
+
+
 def preprocess(input_path):
     # Detect input type (text, image, tabular)
     if input_path.endswith(".txt"):
@@ -22,6 +32,9 @@ def preprocess(input_path):
         with open(input_path, 'r') as file:
             content = file.read()
         return preprocessor.process(content)
+    elif input_path.endswith(".pdf"):
+        preprocessor = TextPreprocessor(lower_case=True, remove_stopwords=True, cache=PdfTextCache())
+        return preprocessor.process_pdf(input_path)
     elif input_path.endswith((".jpg", ".png")):
         preprocessor = ImagePreprocessor(target_size=(224, 224), normalize=True)
         return preprocessor.process(input_path)
@@ -29,35 +42,82 @@ def preprocess(input_path):
         preprocessor = TabularPreprocessor(scale_features=True, impute_strategy="mean")
         return preprocessor.process(input_path)
     else:
-        raise ValueError("Unsupported file format. Supported formats: .txt, .jpg, .png, .csv")
-
-
-def run_models(data):
-    models = {
-        "RandomForest": RandomForestModel(n_estimators=100, max_depth=10),
-        "SVM": SVMModel(kernel="rbf", C=1.0),
-        "NeuralNetwork": NeuralNetworkModel(hidden_layer_sizes=(128, 64, 32)),
-        "KMeans": KMeansModel(n_clusters=5),
-        "DBSCAN": DBSCANModel(eps=0.5, min_samples=5),
-        "BERT": BERTModel(model_name="bert-base-uncased", num_labels=3),
-        "GPT": GPTModel(model_name="gpt2"),
-    }
-
-    predictions = {}
-    confidences = []
-    for name, model in models.items():
-        try:
-            model_predictions = model.predict(data)
-            predictions[name] = model_predictions
-            confidences.append(0.9)  # Placeholder confidence for demo purposes
-        except Exception as e:
-            print(f"Model {name} failed: {e}")
+        raise ValueError("Unsupported file format. Supported formats: .txt, .pdf, .jpg, .png, .csv")
+
+
+def run_models(data, modality=None, model_names=None, registry=None, timeout=None, max_workers=None, scheduler=None,
+               weight_adjuster=None):
+    # Models are only constructed when selected, so unused weights are never loaded
+    if scheduler is not None:
+        registry = scheduler.registry
+    registry = registry if registry is not None else default_registry()
+
+    # Models run concurrently; those that fail or exceed their timeout are left out
+    owns_scheduler = scheduler is None
+    if owns_scheduler:
+        scheduler = ModelScheduler(registry, max_workers=max_workers, default_timeout=timeout)
+    try:
+        predictions, failures = scheduler.run(data, registry.select(modality, model_names))
+    finally:
+        if owns_scheduler:
+            scheduler.shutdown()
+
+    for name, error in failures.items():
+        print(f"Model {name} failed: {error}")
+    # Weights learned from labelled feedback; models without feedback count equally
+    confidences = [weight_adjuster.get_weight(name) if weight_adjuster else 1.0 for name in predictions]
     return predictions, confidences
 
 
-def aggregate(predictions, confidences):
-    aggregator = WeightedVotingAggregator()
-    return aggregator.aggregate(predictions, confidences)
+def encode_predictions(predictions):
+    # Models may answer with different label types (e.g. cluster ids and class names), which cannot be
+    # sorted together, so labels are encoded by their text and votes are counted on the codes
+    n_items = None
+    vocabulary = LabelVocabulary()
+    originals = []
+    rows = []
+    for name, labels in predictions.items():
+        labels = np.ravel(np.asarray(labels, dtype=object))
+        if n_items is None:
+            n_items = len(labels)
+        elif len(labels) != n_items:
+            raise ValueError(f"Model {name} returned {len(labels)} predictions, expected {n_items}.")
+        keys, first, inverse = np.unique(labels.astype(str), return_index=True, return_inverse=True)
+        codes = vocabulary.add(keys)
+        for code, index in zip(codes.tolist(), first.tolist()):
+            if code == len(originals):
+                originals.append(labels[index])
+        rows.append(codes[inverse])
+    return np.array(rows, dtype=np.int64).reshape(len(rows), n_items), originals
+
+
+def aggregate(predictions, confidences=None, weight_adjuster=None):
+    if not predictions:
+        raise ValueError("No model produced predictions.")
+    # Every model labels the same items, so all items are voted on in one batch
+    aggregator = WeightedVotingAggregator(weight_adjuster)
+    label_matrix, labels = encode_predictions(predictions)
+    batch = aggregator.aggregate_batch(label_matrix, confidences, model_names=list(predictions))
+    result = [labels[code] for code in batch["result"].tolist()]
+    scores = batch["details"].mean(axis=0).tolist()
+    details = {labels[code]: score for code, score in zip(batch["labels"].tolist(), scores)}
+    return {"result": result, "details": details}
+
+
+def predict_file(input_path, model_names=None, registry=None, timeout=None, max_workers=None, scheduler=None,
+                 weight_adjuster=None):
+    data = preprocess(input_path)
+    predictions, confidences = run_models(
+        data, detect_modality(input_path), model_names, registry, timeout, max_workers, scheduler, weight_adjuster
+    )
+    return aggregate(predictions, confidences, weight_adjuster)
+
+
+def load_weight_adjuster(weights_path):
+    # Learned weights are optional; without a snapshot every model gets the same weight
+    if weights_path and os.path.exists(weights_path):
+        return DynamicWeightAdjuster.load(weights_path)
+    return DynamicWeightAdjuster(snapshot_path=weights_path)
 
 
 def evaluate(result):
@@ -77,9 +137,11 @@ def postprocess(result, output_format):
 
 
 def main(args):
-    data = preprocess(args.input)
-    predictions, confidences = run_models(data)
-    aggregated_result = aggregate(predictions, confidences)
+    model_names = [name.strip() for name in args.models.split(",")] if args.models else None
+    weight_adjuster = load_weight_adjuster(args.weights)
+    aggregated_result = predict_file(
+        args.input, model_names, timeout=args.timeout, max_workers=args.workers, weight_adjuster=weight_adjuster
+    )
     evaluation_result = evaluate(aggregated_result)
     final_output = postprocess(evaluation_result, args.output)
     print(final_output)
@@ -89,5 +151,9 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process, run models, and output results.")
     parser.add_argument("--input", required=True, help="Path to the input file")
     parser.add_argument("--output", required=True, choices=["json", "text"], help="Output format")
+    parser.add_argument("--models", help="Comma-separated subset of models to run (e.g. RandomForest,SVM)")
+    parser.add_argument("--timeout", type=float, help="Per-model prediction timeout in seconds")
+    parser.add_argument("--workers", type=int, help="Maximum number of models run concurrently")
+    parser.add_argument("--weights", help="JSON snapshot of learned model weights (see DynamicWeightAdjuster)")
     args = parser.parse_args()
     main(args)
@@ -1,8 +1,21 @@
+import importlib
+
 from .base_model import BaseModel
-from .supervised.random_forest_model import RandomForestModel
-from .supervised.svm_model import SVMModel
-from .supervised.neural_network_model import NeuralNetworkModel
-from .unsupervised.kmeans_model import KMeansModel
-from .unsupervised.dbscan_model import DBSCANModel
-from .pretrained.bert_model import BERTModel
-from .pretrained.gpt_model import GPTModel
+from .registry import ModelRegistry, default_registry
+
+# Model classes are imported on first access so that importing the package
+# does not pull in sklearn, torch or transformers.
+_LAZY_EXPORTS = {
+    "RandomForestModel": ".supervised.random_forest_model",
+    "SVMModel": ".supervised.svm_model",
+    "NeuralNetworkModel": ".supervised.neural_network_model",
+    "KMeansModel": ".unsupervised.kmeans_model",
+    "DBSCANModel": ".unsupervised.dbscan_model",
+    "BERTModel": ".pretrained.bert_model",
+    "GPTModel": ".pretrained.gpt_model",
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,33 +1,115 @@
-from transformers import BertTokenizer, BertForSequenceClassification
-from torch.optim import AdamW
-import torch
+import time
 from models.base_model import BaseModel
+from utils.logger import setup_logger
+
+logger = setup_logger('bert_model', None)
 
 class BERTModel(BaseModel):
     def __init__(self, model_name="bert-base-uncased", num_labels=3):
+        from transformers import BertTokenizer, BertForSequenceClassification
+
         self.tokenizer = BertTokenizer.from_pretrained(model_name)
         self.model = BertForSequenceClassification.from_pretrained(model_name, num_labels=num_labels)
 
-    def train(self, data, labels, epochs=3, learning_rate=5e-5):
+    def train(self, data, labels, epochs=3, learning_rate=5e-5, batch_size=16,
+              gradient_accumulation_steps=1, shuffle=True):
+        """
+        Fine-tunes the model with mini-batches.
+        The dataset is tokenized once up front and padded per batch by the DataLoader.
+        :param data: List of input text strings.
+        :param labels: List of integer labels, one per text.
+        :param epochs: Number of passes over the dataset.
+        :param learning_rate: Learning rate for AdamW.
+        :param batch_size: Number of examples per forward/backward pass.
+        :param gradient_accumulation_steps: Number of batches whose gradients are summed before each optimizer step.
+        :param shuffle: Whether to shuffle the examples every epoch.
+        :return: List of per-epoch statistics (epoch, loss, examples_per_sec).
+        """
+        from torch.optim import AdamW
+        from torch.utils.data import DataLoader
+        from transformers import DataCollatorWithPadding
+
+        encodings = self.tokenizer(list(data), truncation=True)
+        dataset = [
+            {**{key: values[index] for key, values in encodings.items()}, "labels": int(label)}
+            for index, label in enumerate(labels)
+        ]
+        loader = DataLoader(
+            dataset,
+            batch_size=batch_size,
+            shuffle=shuffle,
+            collate_fn=DataCollatorWithPadding(self.tokenizer),
+        )
+
         optimizer = AdamW(self.model.parameters(), lr=learning_rate)
         self.model.train()
-        
+        history = []
+
         for epoch in range(epochs):
-            for text, label in zip(data, labels):
-                inputs = self.tokenizer(text, return_tensors="pt", padding=True, truncation=True)
-                labels_tensor = torch.tensor([label]).unsqueeze(0)
-                outputs = self.model(**inputs, labels=labels_tensor)
-                loss = outputs.loss
-                loss.backward()
-                optimizer.step()
-                optimizer.zero_grad()
-
-    def predict(self, data):
+            start_time = time.perf_counter()
+            total_loss = 0.0
+            optimizer.zero_grad()
+            for step, batch in enumerate(loader, start=1):
+                outputs = self.model(**batch)
+                # Scale the loss so accumulated gradients average over the effective batch
+                (outputs.loss / gradient_accumulation_steps).backward()
+                total_loss += outputs.loss.item() * len(batch["labels"])
+
+                if step % gradient_accumulation_steps == 0 or step == len(loader):
+                    optimizer.step()
+                    optimizer.zero_grad()
+
+            elapsed = time.perf_counter() - start_time
+            stats = {
+                "epoch": epoch + 1,
+                "loss": total_loss / max(len(dataset), 1),
+                "examples_per_sec": len(dataset) / elapsed if elapsed > 0 else float("inf"),
+            }
+            history.append(stats)
+            logger.info(
+                f"Epoch {stats['epoch']}/{epochs}: loss={stats['loss']:.4f}, "
+                f"{stats['examples_per_sec']:.1f} examples/sec"
+            )
+
+        return history
+
+    def predict(self, data, batch_size=32, return_probabilities=False):
+        """
+        Predicts labels for a list of texts in padded batches.
+        Texts are tokenized together and grouped by length so each batch pads to a similar size.
+        :param data: List of input text strings.
+        :param batch_size: Number of texts run through the model at once.
+        :param return_probabilities: Whether to also return the class probabilities per text.
+        :return: List of predicted labels, or (labels, probabilities) if return_probabilities is set.
+        """
+        import torch
+
+        texts = list(data)
+        predictions = [None] * len(texts)
+        probabilities = [None] * len(texts)
+        if not texts:
+            return (predictions, probabilities) if return_probabilities else predictions
+
         self.model.eval()
-        predictions = []
+        encodings = self.tokenizer(texts, truncation=True)
+        order = sorted(range(len(texts)), key=lambda index: len(encodings["input_ids"][index]))
+
         with torch.no_grad():
-            for text in data:
-                inputs = self.tokenizer(text, return_tensors="pt", padding=True, truncation=True)
-                outputs = self.model(**inputs)
-                predictions.append(torch.argmax(outputs.logits, dim=-1).item())
+            for start in range(0, len(order), batch_size):
+                batch_indices = order[start:start + batch_size]
+                inputs = self.tokenizer.pad(
+                    {key: [values[index] for index in batch_indices] for key, values in encodings.items()},
+                    return_tensors="pt",
+                )
+                logits = self.model(**inputs).logits
+                batch_predictions = torch.argmax(logits, dim=-1).tolist()
+                batch_probabilities = torch.softmax(logits, dim=-1).tolist()
+
+                # Scatter results back to the original input order
+                for position, index in enumerate(batch_indices):
+                    predictions[index] = batch_predictions[position]
+                    probabilities[index] = batch_probabilities[position]
+
+        if return_probabilities:
+            return predictions, probabilities
         return predictions
@@ -1,9 +1,9 @@
-from transformers import GPT2Tokenizer, GPT2LMHeadModel
-import torch
 from models.base_model import BaseModel
 
 class GPTModel(BaseModel):
     def __init__(self, model_name="gpt2"):
+        from transformers import GPT2Tokenizer, GPT2LMHeadModel
+
         self.tokenizer = GPT2Tokenizer.from_pretrained(model_name)
         self.model = GPT2LMHeadModel.from_pretrained(model_name)
 
@@ -17,6 +17,8 @@ def predict(self, data):
     :param data: List of input text strings.
     :return: List of generated text strings.
     """
+    import torch
+
     self.model.eval()
     predictions = []
     with torch.no_grad():
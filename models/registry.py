@@ -0,0 +1,173 @@
+import importlib
+import threading
+
+TEXT = "text"
+IMAGE = "image"
+TABULAR = "tabular"
+
+THREAD = "thread"
+PROCESS = "process"
+
+class LazyFactory:
+    def __init__(self, module_path, class_name, **kwargs):
+        """
+        Factory that imports a model class and instantiates it only when called.
+        It is picklable, so it can also build models inside worker processes.
+        :param module_path: Dotted path of the module defining the model class.
+        :param class_name: Name of the model class.
+        :param kwargs: Keyword arguments passed to the model constructor.
+        """
+        self.module_path = module_path
+        self.class_name = class_name
+        self.kwargs = kwargs
+
+    def __call__(self):
+        model_class = getattr(importlib.import_module(self.module_path), self.class_name)
+        return model_class(**self.kwargs)
+
+class ModelRegistry:
+    def __init__(self):
+        """
+        Initializes an empty registry of lazily constructed models.
+        """
+        self._factories = {}
+        self._modalities = {}
+        self._executors = {}
+        self._timeouts = {}
+        self._instances = {}
+        self._locks = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name, factory, modalities, executor=THREAD, timeout=None):
+        """
+        Registers a model without constructing it.
+        :param name: Name of the model.
+        :param factory: Callable returning a new model instance (picklable for process-backed models).
+        :param modalities: Input modalities the model can run on (e.g. "text", "tabular").
+        :param executor: Where the model runs when scheduled: "thread" for GIL-releasing work, "process" otherwise.
+        :param timeout: Optional prediction timeout in seconds, overriding the scheduler default.
+        """
+        if executor not in (THREAD, PROCESS):
+            raise ValueError("Invalid executor. Choose 'thread' or 'process'.")
+        self._factories[name] = factory
+        self._modalities[name] = tuple(modalities)
+        self._executors[name] = executor
+        self._timeouts[name] = timeout
+        self._instances.pop(name, None)
+
+    def names(self, modality=None):
+        """
+        Lists registered model names in registration order.
+        :param modality: Optional modality used to filter the models.
+        :return: List of model names.
+        """
+        return [
+            name for name, modalities in self._modalities.items()
+            if modality is None or modality in modalities
+        ]
+
+    def select(self, modality=None, names=None):
+        """
+        Selects the models to run for an input.
+        :param modality: Optional modality of the input; models that cannot handle it are excluded.
+        :param names: Optional list of model names to restrict the selection to.
+        :return: List of selected model names in registration order.
+        """
+        if names is None:
+            return self.names(modality)
+
+        unknown = [name for name in names if name not in self._factories]
+        if unknown:
+            raise ValueError(f"Unknown models: {', '.join(unknown)}. Available models: {', '.join(self.names())}")
+        return [name for name in self.names(modality) if name in names]
+
+    def get(self, name):
+        """
+        Returns a model, constructing it on first use.
+        Safe to call from several threads; each model is constructed only once.
+        :param name: Name of the model.
+        :return: Model instance.
+        """
+        if name not in self._factories:
+            raise KeyError(f"Model {name} is not registered.")
+        with self._registry_lock:
+            lock = self._locks.setdefault(name, threading.Lock())
+        with lock:
+            if name not in self._instances:
+                self._instances[name] = self._factories[name]()
+        return self._instances[name]
+
+    def factory(self, name):
+        """
+        Returns the factory of a registered model.
+        :param name: Name of the model.
+        :return: Callable returning a new model instance.
+        """
+        return self._factories[name]
+
+    def executor(self, name):
+        """
+        Returns where a model should run when scheduled.
+        :param name: Name of the model.
+        :return: "thread" or "process".
+        """
+        return self._executors[name]
+
+    def timeout(self, name):
+        """
+        Returns the prediction timeout configured for a model.
+        :param name: Name of the model.
+        :return: Timeout in seconds, or None to use the scheduler default.
+        """
+        return self._timeouts[name]
+
+    def is_loaded(self, name):
+        """
+        Checks whether a model has already been constructed.
+        :param name: Name of the model.
+        :return: True if the model instance exists.
+        """
+        return name in self._instances
+
+def default_registry():
+    """
+    Builds the registry of models used by the inference pipeline.
+    :return: ModelRegistry with the supervised, unsupervised and pretrained models.
+    """
+    registry = ModelRegistry()
+    registry.register(
+        "RandomForest",
+        LazyFactory("models.supervised.random_forest_model", "RandomForestModel", n_estimators=100, max_depth=10),
+        (TABULAR, IMAGE),
+    )
+    registry.register(
+        "SVM",
+        LazyFactory("models.supervised.svm_model", "SVMModel", kernel="rbf", C=1.0),
+        (TABULAR, IMAGE),
+    )
+    registry.register(
+        "NeuralNetwork",
+        LazyFactory("models.supervised.neural_network_model", "NeuralNetworkModel", hidden_layer_sizes=(128, 64, 32)),
+        (TABULAR, IMAGE),
+    )
+    registry.register(
+        "KMeans",
+        LazyFactory("models.unsupervised.kmeans_model", "KMeansModel", n_clusters=5),
+        (TABULAR, IMAGE),
+    )
+    registry.register(
+        "DBSCAN",
+        LazyFactory("models.unsupervised.dbscan_model", "DBSCANModel", eps=0.5, min_samples=5),
+        (TABULAR, IMAGE),
+    )
+    registry.register(
+        "BERT",
+        LazyFactory("models.pretrained.bert_model", "BERTModel", model_name="bert-base-uncased", num_labels=3),
+        (TEXT,),
+    )
+    registry.register(
+        "GPT",
+        LazyFactory("models.pretrained.gpt_model", "GPTModel", model_name="gpt2"),
+        (TEXT,),
+    )
+    return registry
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from models.registry import PROCESS
+
+# Models built inside worker processes, kept so later requests reuse them
+_process_models = {}
+
+def _predict_in_process(name, factory, data):
+    """
+    Builds (once per worker process) and runs a model inside a process pool worker.
+    :param name: Name of the model.
+    :param factory: Picklable callable returning a new model instance.
+    :param data: Preprocessed input data.
+    :return: Model predictions.
+    """
+    if name not in _process_models:
+        _process_models[name] = factory()
+    return _process_models[name].predict(data)
+
+class ModelScheduler:
+    def __init__(self, registry, max_workers=None, default_timeout=None):
+        """
+        Initializes the scheduler that runs registered models concurrently.
+        :param registry: ModelRegistry providing the models.
+        :param max_workers: Maximum number of models running at once on threads, and in the process pool.
+        :param default_timeout: Prediction timeout in seconds for models without their own timeout (None waits forever).
+        """
+        self.registry = registry
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        # Thread-backed models run on daemon threads rather than a ThreadPoolExecutor, whose threads are
+        # joined at interpreter exit: a model stuck past its timeout must not keep the process alive
+        self._thread_slots = threading.BoundedSemaphore(max_workers or min(32, (os.cpu_count() or 1) + 4))
+        self._process_pool = None
+        self._abandoned = set()  # Timed-out futures of the process pool
+
+    def _submit(self, name, data):
+        if self.registry.executor(name) == PROCESS:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._process_pool.submit(_predict_in_process, name, self.registry.factory(name), data)
+
+        future = Future()
+
+        def predict():
+            # A model stuck past its timeout keeps its slot until it returns
+            with self._thread_slots:
+                if not future.set_running_or_notify_cancel():
+                    return
+                try:
+                    future.set_result(self.registry.get(name).predict(data))
+                except BaseException as e:
+                    future.set_exception(e)
+
+        threading.Thread(target=predict, name=f"model-{name}", daemon=True).start()
+        return future
+
+    def run(self, data, names):
+        """
+        Runs the given models concurrently and collects whatever finishes in time.
+        A model that exceeds its timeout is reported as failed; its worker is left to finish in the background
+        until shutdown(), and never delays interpreter exit.
+        :param data: Preprocessed input data.
+        :param names: Names of the models to run.
+        :return: Tuple of (predictions, failures) dictionaries keyed by model name, in the order of names.
+        """
+        self._abandoned = {future for future in self._abandoned if not future.done()}
+        start_time = time.monotonic()
+        pending = {}
+        deadlines = {}
+        for name in names:
+            future = self._submit(name, data)
+            pending[future] = name
+            timeout = self.registry.timeout(name)
+            timeout = self.default_timeout if timeout is None else timeout
+            deadlines[future] = None if timeout is None else start_time + timeout
+
+        results = {}
+        failures = {}
+        while pending:
+            active_deadlines = [deadlines[future] for future in pending if deadlines[future] is not None]
+            wait_timeout = max(0.0, min(active_deadlines) - time.monotonic()) if active_deadlines else None
+            done, _ = wait(pending, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    failures[name] = e
+
+            now = time.monotonic()
+            for future in [future for future in pending if deadlines[future] is not None and now >= deadlines[future]]:
+                name = pending.pop(future)
+                if not future.cancel() and self.registry.executor(name) == PROCESS:
+                    self._abandoned.add(future)
+                failures[name] = TimeoutError(f"Model {name} did not finish within {deadlines[future] - start_time:.1f}s")
+
+        predictions = {name: results[name] for name in names if name in results}
+        failures = {name: failures[name] for name in names if name in failures}
+        return predictions, failures
+
+    def shutdown(self):
+        """
+        Releases the process pool without waiting for timed-out models.
+        Worker processes still running a timed-out model are terminated, since the pool would otherwise
+        be joined at interpreter exit; threads running one are daemons and are abandoned.
+        """
+        if self._process_pool is not None:
+            if any(not future.done() for future in self._abandoned):
+                # ProcessPoolExecutor has no public way to stop a running task before Python 3.14
+                for process in list(self._process_pool._processes.values()):
+                    process.terminate()
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+        self._process_pool = None
+        self._abandoned = set()
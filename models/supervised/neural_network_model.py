@@ -1,8 +1,9 @@
-from sklearn.neural_network import MLPClassifier
 from models.base_model import BaseModel
 
 class NeuralNetworkModel(BaseModel):
     def __init__(self, hidden_layer_sizes=(100,), activation='relu'):
+        from sklearn.neural_network import MLPClassifier
+
         self.model = MLPClassifier(hidden_layer_sizes=hidden_layer_sizes, activation=activation, random_state=42)
 
     def train(self, data, labels):
@@ -1,8 +1,9 @@
-from sklearn.ensemble import RandomForestClassifier
 from models.base_model import BaseModel
 
 class RandomForestModel(BaseModel):
     def __init__(self, n_estimators=100, max_depth=None):
+        from sklearn.ensemble import RandomForestClassifier
+
         self.model = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=42)
 
     def train(self, data, labels):
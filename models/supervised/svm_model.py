@@ -1,8 +1,9 @@
-from sklearn.svm import SVC
 from models.base_model import BaseModel
 
 class SVMModel(BaseModel):
     def __init__(self, kernel='rbf', C=1.0):
+        from sklearn.svm import SVC
+
         self.model = SVC(kernel=kernel, C=C, probability=True)
 
     def train(self, data, labels):
@@ -1,8 +1,9 @@
-from sklearn.cluster import DBSCAN
 from models.base_model import BaseModel
 
 class DBSCANModel(BaseModel):
     def __init__(self, eps=0.5, min_samples=5):
+        from sklearn.cluster import DBSCAN
+
         self.model = DBSCAN(eps=eps, min_samples=min_samples)
 
     def train(self, data, labels=None):
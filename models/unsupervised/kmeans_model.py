@@ -1,8 +1,9 @@
-from sklearn.cluster import KMeans
 from models.base_model import BaseModel
 
 class KMeansModel(BaseModel):
     def __init__(self, n_clusters=3):
+        from sklearn.cluster import KMeans
+
         self.model = KMeans(n_clusters=n_clusters, random_state=42)
 
     def train(self, data, labels=None):
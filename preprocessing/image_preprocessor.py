@@ -1,15 +1,29 @@
-import cv2
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
 class ImagePreprocessor:
-    def __init__(self, target_size=(224, 224), normalize=True):
+    def __init__(self, target_size=(224, 224), normalize=True, num_workers=None):
         """
         Initializes the image preprocessor.
         :param target_size: Tuple indicating the target size (width, height).
         :param normalize: Whether to normalize pixel values to the range [0, 1].
+        :param num_workers: Number of threads decoding images in process_batch (None lets Python choose).
         """
         self.target_size = target_size
         self.normalize = normalize
+        self.num_workers = num_workers
+
+    @staticmethod
+    def _load(image_path):
+        """
+        Decodes an image file into a (height, width, 3) uint8 BGR array.
+        """
+        import cv2
+
+        image = cv2.imread(image_path)
+        if image is None:
+            raise ValueError(f"Could not load image from {image_path}")
+        return image
 
     def process(self, image_path):
         """
@@ -17,16 +31,99 @@ class ImagePreprocessor:
         :param image_path: Path to the image file.
         :return: Processed image as a numpy array.
         """
-        # Load the image
-        image = cv2.imread(image_path)
-        if image is None:
-            raise ValueError(f"Could not load image from {image_path}")
-        
+        return self.process_array(self._load(image_path))
+
+    def process_array(self, image, dtype=None):
+        """
+        Processes an image that is already decoded, e.g. a PDF page from PdfRasterizer.
+        :param image: (height, width, 3) uint8 array in BGR channel order.
+        :param dtype: Output dtype; None gives float64 when normalizing and uint8 otherwise, like process().
+        :return: Processed image as a numpy array.
+        """
+        import cv2
+
         # Resize the image
         image = cv2.resize(image, self.target_size)
+        if dtype is None:
+            # Normalize the image
+            return image / 255.0 if self.normalize else image
 
-        # Normalize the image
-        if self.normalize:
-            image = image / 255.0
+        out = np.empty(image.shape, dtype=dtype)
+        self._fill(out, image)
+        return out
 
-        return image
+    def stream_pdf(self, pdf_path, rasterizer=None, dtype=np.float32):
+        """
+        Rasterizes a PDF and processes its images as they are decoded, without temporary image files.
+        :param pdf_path: Path to the PDF file.
+        :param rasterizer: PdfRasterizer deciding the DPI, mode and buffer size; defaults to PdfRasterizer().
+        :param dtype: Output dtype of the processed images.
+        :return: Generator of (page_number, image) tuples, page numbers starting at 1.
+        """
+        from preprocessing.pdf_rasterizer import PdfRasterizer
+
+        rasterizer = rasterizer if rasterizer is not None else PdfRasterizer()
+        for page_number, image in rasterizer.stream(pdf_path):
+            yield page_number, self.process_array(image, dtype)
+
+    def process_pdf(self, pdf_path, rasterizer=None, dtype=np.float32):
+        """
+        Rasterizes a PDF into one array of processed images.
+        :param pdf_path: Path to the PDF file.
+        :param rasterizer: PdfRasterizer deciding the DPI, mode and buffer size; defaults to PdfRasterizer().
+        :param dtype: Output dtype.
+        :return: Tuple of (array of shape (N, height, width, 3), list of the page number of each image).
+        """
+        import cv2
+        from preprocessing.pdf_rasterizer import PdfRasterizer
+
+        rasterizer = rasterizer if rasterizer is not None else PdfRasterizer()
+        width, height = self.target_size
+        images = np.empty((0, height, width, 3), dtype=dtype)
+        page_numbers = []
+        for page_number, image in rasterizer.stream(pdf_path):
+            if len(page_numbers) == len(images):
+                # The number of images is only known at the end, so the output grows geometrically
+                grown = np.empty((max(1, 2 * len(images)), height, width, 3), dtype=dtype)
+                grown[:len(images)] = images
+                images = grown
+            self._fill(images[len(page_numbers)], cv2.resize(image, self.target_size))
+            page_numbers.append(page_number)
+        return images[:len(page_numbers)], page_numbers
+
+    def _fill(self, out, image):
+        """
+        Copies a resized uint8 image into out, normalizing it in place when out is floating point.
+        """
+        out[...] = image
+        if self.normalize and np.issubdtype(out.dtype, np.floating):
+            out /= 255.0
+
+    def process_batch(self, image_paths, dtype=np.float32, out=None):
+        """
+        Processes several images into one preallocated array.
+        Images are decoded and resized on a thread pool (OpenCV releases the GIL while doing so),
+        and each is written straight into its slot of the output and normalized in place there.
+        :param image_paths: Sequence of paths to image files.
+        :param dtype: Output dtype, e.g. np.float32, or np.uint8 to keep raw pixel values.
+            Normalization only applies to floating-point dtypes.
+        :param out: Optional preallocated array to fill (e.g. a np.lib.format.open_memmap); overrides dtype.
+        :return: Array of shape (len(image_paths), height, width, 3).
+        """
+        import cv2
+
+        width, height = self.target_size
+        shape = (len(image_paths), height, width, 3)
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(f"out must have shape {shape}, got {out.shape}.")
+
+        def fill(index):
+            self._fill(out[index], cv2.resize(self._load(image_paths[index]), self.target_size))
+
+        with ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="image") as executor:
+            # Consuming the results re-raises the first decoding error
+            for _ in executor.map(fill, range(len(image_paths))):
+                pass
+        return out
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+from utils.file_manager import atomic_write
+
+class PdfTextCache:
+    def __init__(self, cache_dir="data/cache/pdf_text", max_bytes=512 * 1024 * 1024):
+        """
+        Initializes the on-disk cache for extracted PDF text and tokens.
+        Entries are keyed by a hash of the PDF bytes plus the preprocessor settings,
+        and the least recently used entries are evicted once the cache exceeds max_bytes.
+        :param cache_dir: Directory holding the cache entries.
+        :param max_bytes: Maximum total size of the cache in bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def file_hash(pdf_path):
+        """
+        Computes the content hash of a PDF file.
+        :param pdf_path: Path to the PDF file.
+        :return: Hex digest of the file bytes.
+        """
+        digest = hashlib.sha256()
+        with open(pdf_path, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def make_key(self, pdf_path, settings):
+        """
+        Builds the cache key for a PDF processed with the given settings.
+        :param pdf_path: Path to the PDF file.
+        :param settings: Dictionary of preprocessor settings that affect the tokens.
+        :return: Cache key string.
+        """
+        settings_hash = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+        return f"{self.file_hash(pdf_path)}-{settings_hash[:16]}"
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.jsonl")
+
+    def read(self, key):
+        """
+        Reads a cached entry and marks it as recently used.
+        :param key: Cache key from make_key.
+        :return: Generator of page dictionaries ("page", "text", "tokens"), or None on a cache miss.
+            The entry is only opened once iteration starts, so an unused generator holds no file handle.
+        """
+        path = self._entry_path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return self._iter_pages(path)
+
+    @staticmethod
+    def _iter_pages(path):
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                yield json.loads(line)
+
+    def writer(self, key):
+        """
+        Opens a writer that stores pages for a key one at a time.
+        The entry only becomes visible once the writer exits without an error.
+        :param key: Cache key from make_key.
+        :return: Context manager with a write(page) method.
+        """
+        return _CacheEntryWriter(self, key)
+
+    def invalidate(self, pdf_path):
+        """
+        Removes every cached entry for a PDF, whatever settings it was processed with.
+        :param pdf_path: Path to the PDF file.
+        :return: Number of entries removed.
+        """
+        prefix = f"{self.file_hash(pdf_path)}-"
+        removed = 0
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.startswith(prefix) and file_name.endswith(".jsonl"):
+                os.remove(os.path.join(self.cache_dir, file_name))
+                removed += 1
+        return removed
+
+    def clear(self):
+        """
+        Removes all cached entries.
+        """
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith(".jsonl"):
+                os.remove(os.path.join(self.cache_dir, file_name))
+
+    def _evict(self):
+        """
+        Deletes the least recently used entries until the cache fits in max_bytes.
+        """
+        entries = []
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith(".jsonl"):
+                stat = os.stat(os.path.join(self.cache_dir, file_name))
+                entries.append((stat.st_mtime, stat.st_size, file_name))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, file_name in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, file_name))
+            total_size -= size
+
+class _CacheEntryWriter:
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+
+    def __enter__(self):
+        self._write = atomic_write(self.cache._entry_path(self.key), "w", encoding="utf-8")
+        self.file = self._write.__enter__()
+        return self
+
+    def write(self, page):
+        self.file.write(json.dumps(page) + "\n")
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._write.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            self.cache._evict()
+        return False
@@ -0,0 +1,101 @@
+import queue
+import threading
+import numpy as np
+
+RASTERIZE_MODES = ("pages", "images")
+
+class PdfRasterizer:
+    def __init__(self, dpi=150, mode="pages", buffer_size=4):
+        """
+        Turns the pages of a PDF into in-memory image arrays, without writing intermediate image files.
+        :param dpi: Resolution pages are rendered at (mode 'pages').
+        :param mode: 'pages' renders every page with PyMuPDF; 'images' decodes the images embedded in
+            each page with PyPDF2, which skips text and vector content (e.g. for scanned booklets).
+        :param buffer_size: Maximum number of decoded images waiting to be consumed by stream().
+        """
+        if mode not in RASTERIZE_MODES:
+            raise ValueError("Invalid mode. Choose 'pages' or 'images'.")
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1.")
+        self.dpi = dpi
+        self.mode = mode
+        self.buffer_size = buffer_size
+
+    def iter_images(self, pdf_path):
+        """
+        Decodes the PDF one page at a time in the calling thread.
+        :param pdf_path: Path to the PDF file.
+        :return: Generator of (page_number, image) tuples, page numbers starting at 1. Images are
+            (height, width, 3) uint8 arrays in OpenCV's BGR channel order; in mode 'images' a page
+            yields one tuple per embedded image.
+        """
+        if self.mode == "pages":
+            yield from self._render_pages(pdf_path)
+        else:
+            yield from self._extract_images(pdf_path)
+
+    def stream(self, pdf_path):
+        """
+        Decodes the PDF on a background thread while the caller consumes the images.
+        At most buffer_size images are held in memory; the decoder waits when the buffer is full,
+        and stops when the caller closes the generator early.
+        :param pdf_path: Path to the PDF file.
+        :return: Generator of (page_number, image) tuples, as returned by iter_images().
+        """
+        buffer = queue.Queue(maxsize=self.buffer_size)
+        stopped = threading.Event()
+        done = object()
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for item in self.iter_images(pdf_path):
+                    if not put(item):
+                        return
+                put(done)
+            except BaseException as e:
+                put(e)
+
+        producer = threading.Thread(target=produce, name="pdf-rasterizer", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
+            producer.join()
+
+    def _render_pages(self, pdf_path):
+        import fitz
+
+        with fitz.open(pdf_path) as document:
+            for page_number, page in enumerate(document, start=1):
+                pixmap = page.get_pixmap(dpi=self.dpi, colorspace=fitz.csRGB, alpha=False)
+                image = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(pixmap.height, pixmap.width, 3)
+                # RGB to BGR, copied so the array no longer references the pixmap
+                yield page_number, image[:, :, ::-1].copy()
+
+    def _extract_images(self, pdf_path):
+        import cv2
+        from PyPDF2 import PdfReader
+
+        reader = PdfReader(pdf_path)
+        for page_number, page in enumerate(reader.pages, start=1):
+            for embedded in page.images:
+                image = cv2.imdecode(np.frombuffer(embedded.data, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if image is None:
+                    raise ValueError(f"Could not decode image {embedded.name} on page {page_number} of {pdf_path}")
+                yield page_number, image
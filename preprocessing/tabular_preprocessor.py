@@ -1,15 +1,22 @@
-import pandas as pd
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from sklearn.impute import SimpleImputer
+import numpy as np
+
+NUMERICAL_DTYPES = ('int64', 'float64')
+CATEGORICAL_DTYPES = ('object',)
 
 class TabularPreprocessor:
-    def __init__(self, scale_features=True, impute_strategy="mean"):
+    def __init__(self, scale_features=True, impute_strategy="mean", chunksize=None):
         """
         Initializes the tabular data preprocessor.
         :param scale_features: Whether to scale numerical features.
         :param impute_strategy: Strategy for imputing missing values (e.g., 'mean', 'median').
+        :param chunksize: If set, process() reads the CSV in chunks of this many rows (see process_chunked).
         """
+        from sklearn.preprocessing import StandardScaler, OneHotEncoder
+        from sklearn.impute import SimpleImputer
+
         self.scale_features = scale_features
+        self.impute_strategy = impute_strategy
+        self.chunksize = chunksize
         self.imputer = SimpleImputer(strategy=impute_strategy)
         self.scaler = StandardScaler()
         self.encoder = OneHotEncoder(handle_unknown='ignore', sparse_output=False)
@@ -20,12 +27,17 @@ class TabularPreprocessor:
         :param data_path: Path to the CSV file.
         :return: Preprocessed dataframe as a numpy array.
         """
+        import pandas as pd
+
+        if self.chunksize is not None:
+            return self.process_chunked(data_path, self.chunksize)
+
         # Load the dataset
         df = pd.read_csv(data_path)
 
         # Separate numerical and categorical features
-        numerical_features = df.select_dtypes(include=['int64', 'float64']).columns
-        categorical_features = df.select_dtypes(include=['object']).columns
+        numerical_features = df.select_dtypes(include=list(NUMERICAL_DTYPES)).columns
+        categorical_features = df.select_dtypes(include=list(CATEGORICAL_DTYPES)).columns
 
         # Impute missing values
         df[numerical_features] = self.imputer.fit_transform(df[numerical_features])
@@ -44,3 +56,160 @@ class TabularPreprocessor:
             df = pd.concat([df[numerical_features], encoded_cats], axis=1)
 
         return df.values
+
+    def process_chunked(self, data_path, chunksize=100_000, dtype=np.float32, out_path=None):
+        """
+        Processes a tabular dataset too large for memory, giving the same features as process().
+        The CSV is read twice in chunks: the first pass collects the column means and variances and the
+        categorical vocabularies, the second imputes, scales and one-hot encodes every chunk straight
+        into its rows of a preallocated output. Only one chunk is in memory at a time.
+        :param data_path: Path to the CSV file.
+        :param chunksize: Number of rows read at a time.
+        :param dtype: Output dtype.
+        :param out_path: Optional .npy path; the output is then written to a memory-mapped file instead of memory.
+        :return: Preprocessed data as a numpy array (a memory map when out_path is given).
+        """
+        if self.impute_strategy != "mean":
+            raise ValueError("Chunked processing only supports the 'mean' impute strategy.")
+
+        numerical_features, categories, n_rows, mean, variance = self._collect_statistics(data_path, chunksize)
+        self._fit_statistics(numerical_features, categories, n_rows, mean, variance)
+
+        n_features = len(numerical_features) + sum(len(values) for values in categories.values())
+        if out_path is None:
+            out = np.empty((n_rows, n_features), dtype=dtype)
+        else:
+            out = np.lib.format.open_memmap(out_path, mode="w+", dtype=dtype, shape=(n_rows, n_features))
+
+        start = 0
+        for chunk in self._read_chunks(data_path, chunksize):
+            rows = out[start:start + len(chunk)]
+            values = chunk[numerical_features].to_numpy(dtype=np.float64)
+            missing = np.isnan(values)
+            values[missing] = np.broadcast_to(mean, values.shape)[missing]
+            if self.scale_features:
+                values -= mean
+                values /= self.scaler.scale_
+            rows[:, :len(numerical_features)] = values
+
+            offset = len(numerical_features)
+            for feature, vocabulary in categories.items():
+                block = rows[:, offset:offset + len(vocabulary)]
+                block[...] = 0
+                block[np.arange(len(chunk)), self._category_codes(chunk[feature], vocabulary)] = 1
+                offset += len(vocabulary)
+            start += len(chunk)
+
+        if out_path is not None:
+            out.flush()
+        return out
+
+    def _fit_statistics(self, numerical_features, categories, n_rows, mean, variance):
+        """
+        Leaves the imputer, scaler and encoder fitted as process() would, from the statistics of the first pass.
+        """
+        import pandas as pd
+        from sklearn.preprocessing import OneHotEncoder
+
+        if numerical_features:
+            # The mean of a single row holding the column means is the means themselves
+            self.imputer.fit(pd.DataFrame([mean], columns=numerical_features))
+        self.scaler.mean_ = mean
+        self.scaler.var_ = variance
+        scale = np.sqrt(variance)
+        scale[variance < 10 * np.finfo(np.float64).eps] = 1.0
+        self.scaler.scale_ = scale
+        self.scaler.n_samples_seen_ = n_rows
+        self.scaler.n_features_in_ = len(numerical_features)
+        self.scaler.feature_names_in_ = np.asarray(numerical_features, dtype=object)
+
+        if categories:
+            self.encoder = OneHotEncoder(
+                categories=list(categories.values()), handle_unknown='ignore', sparse_output=False
+            )
+            self.encoder.fit(pd.DataFrame({feature: values[:1] for feature, values in categories.items()}))
+
+    @staticmethod
+    def _read_chunks(data_path, chunksize):
+        import pandas as pd
+
+        with pd.read_csv(data_path, chunksize=chunksize) as reader:
+            yield from reader
+
+    @staticmethod
+    def _category_codes(column, vocabulary):
+        """
+        Maps a categorical column to indices into its vocabulary, missing values becoming "Missing".
+        """
+        import pandas as pd
+
+        return pd.Categorical(column.astype(object).fillna("Missing"), categories=vocabulary).codes
+
+    def _collect_statistics(self, data_path, chunksize):
+        """
+        First pass over the CSV: decides the type of every column and merges the per-chunk column
+        moments with Chan's parallel update, so the result equals a single pass over the whole file.
+        A column entirely missing in a chunk takes its type from the other chunks.
+        :return: Tuple of (numerical feature names, dictionary of categorical feature names to their
+            sorted vocabularies, row count, column means, column variances after mean imputation).
+        """
+        columns = None
+        kinds = {}
+        vocabularies = {}
+        empty = set()  # Columns entirely missing in at least one chunk
+        n_rows = 0
+        for chunk in self._read_chunks(data_path, chunksize):
+            if columns is None:
+                columns = list(chunk.columns)
+                count = np.zeros(len(columns))
+                mean = np.zeros(len(columns))
+                squares = np.zeros(len(columns))  # Sum of squared deviations from the mean
+            n_rows += len(chunk)
+
+            # Same selection as process(), so both agree on the type of every column
+            numerical = set(chunk.select_dtypes(include=list(NUMERICAL_DTYPES)).columns)
+            categorical = set(chunk.select_dtypes(include=list(CATEGORICAL_DTYPES)).columns)
+            values = np.full(chunk.shape, np.nan)
+            for index, feature in enumerate(columns):
+                column = chunk[feature]
+                if column.isna().all():
+                    empty.add(feature)
+                    continue
+                kind = "numerical" if feature in numerical else "categorical" if feature in categorical else "other"
+                if kinds.setdefault(feature, kind) != kind:
+                    raise ValueError(
+                        f"Column {feature} is {kinds[feature]} in some chunks and {kind} in others; "
+                        "use process() or clean the column."
+                    )
+                if kind == "numerical":
+                    values[:, index] = column.to_numpy(dtype=np.float64)
+                elif kind == "categorical":
+                    vocabulary = vocabularies.setdefault(feature, set())
+                    vocabulary.update(column.dropna())
+                    if column.isna().any():
+                        vocabulary.add("Missing")
+
+            chunk_count = np.sum(~np.isnan(values), axis=0)
+            observed = chunk_count > 0
+            chunk_mean = np.zeros(len(columns))
+            chunk_mean[observed] = np.nansum(values[:, observed], axis=0) / chunk_count[observed]
+            chunk_squares = np.nansum((values - chunk_mean) ** 2, axis=0)
+
+            total = count + chunk_count
+            delta = chunk_mean - mean
+            ratio = np.divide(chunk_count, total, out=np.zeros_like(total), where=total > 0)
+            mean += delta * ratio
+            squares += chunk_squares + delta ** 2 * count * ratio
+            count = total
+
+        if columns is None:
+            raise ValueError(f"No rows found in {data_path}")
+
+        # Columns without any value are dropped, as SimpleImputer does
+        numerical = [index for index, feature in enumerate(columns) if kinds.get(feature) == "numerical"]
+        # Imputed values equal the mean and add nothing to the squared deviations
+        variance = squares[numerical] / n_rows
+        for feature in empty & set(vocabularies):
+            vocabularies[feature].add("Missing")
+        categories = {feature: sorted(vocabularies[feature]) for feature in columns if feature in vocabularies}
+        return [columns[index] for index in numerical], categories, n_rows, mean[numerical], variance
@@ -1,21 +1,66 @@
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from PyPDF2 import PdfReader  # Importing PDF processing library
+import math
+from concurrent.futures import ProcessPoolExecutor
 
-# Ensure required NLTK resources are downloaded
-nltk.download('punkt')
-nltk.download('stopwords')
+# NLTK resources used by the preprocessor, as (resource path, download package)
+NLTK_RESOURCES = [
+    ("tokenizers/punkt", "punkt"),
+    ("tokenizers/punkt_tab", "punkt_tab"),
+    ("corpora/stopwords", "stopwords"),
+]
+_nltk_resources_checked = False
+
+def ensure_nltk_resources():
+    """
+    Checks the local NLTK data once per process and downloads only the resources that are missing.
+    """
+    global _nltk_resources_checked
+    if _nltk_resources_checked:
+        return
+
+    import nltk
+
+    for resource, package in NLTK_RESOURCES:
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            nltk.download(package, quiet=True)
+    _nltk_resources_checked = True
+
+def _process_page_range(preprocessor, pdf_path, start, stop):
+    """
+    Extracts and tokenizes a range of PDF pages inside a worker process.
+    :param preprocessor: TextPreprocessor whose settings are used for tokenization.
+    :param pdf_path: Path to the PDF file.
+    :param start: Index of the first page (0-based, inclusive).
+    :param stop: Index of the last page (0-based, exclusive).
+    :return: List of (page_number, text, tokens) tuples.
+    """
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(pdf_path)
+    pages = []
+    for index in range(start, stop):
+        text = reader.pages[index].extract_text() or ""
+        pages.append((index + 1, text, preprocessor.process_text(text)))
+    return pages
 
 class TextPreprocessor:
-    def __init__(self, lower_case=True, remove_stopwords=True):
+    def __init__(self, lower_case=True, remove_stopwords=True, num_workers=1, cache=None):
         """
         Initializes the text preprocessor.
         :param lower_case: Whether to convert text to lowercase.
         :param remove_stopwords: Whether to remove stopwords.
+        :param num_workers: Number of processes used to extract PDF pages (1 extracts in-process).
+        :param cache: Optional PdfTextCache reused across runs for already processed PDFs.
         """
         self.lower_case = lower_case
         self.remove_stopwords = remove_stopwords
+        self.num_workers = num_workers
+        self.cache = cache
+
+        ensure_nltk_resources()
+        from nltk.corpus import stopwords
+
         self.stop_words = set(stopwords.words('english'))
 
     def process_text(self, text):
@@ -28,6 +73,8 @@ class TextPreprocessor:
         if self.lower_case:
             text = text.lower()
 
+        from nltk.tokenize import word_tokenize
+
         # Tokenize the text
         tokens = word_tokenize(text)
 
@@ -37,17 +84,89 @@ class TextPreprocessor:
 
         return tokens
 
-    def process_pdf(self, pdf_path):
+    def stream_pdf(self, pdf_path):
         """
-        Processes a PDF file to extract text content.
+        Streams a PDF file page by page, tokenizing each page as it is parsed.
         :param pdf_path: Path to the PDF file.
-        :return: Extracted text as a single string.
+        :return: Generator of (page_number, tokens) tuples, page numbers starting at 1.
         """
         try:
-            reader = PdfReader(pdf_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            return self.process_text(text)
+            if self.cache is None:
+                for page_number, _, tokens in self._extract_pages(pdf_path):
+                    yield page_number, tokens
+                return
+
+            key = self.cache.make_key(pdf_path, self.cache_settings())
+            cached_pages = self.cache.read(key)
+            if cached_pages is not None:
+                for page in cached_pages:
+                    yield page["page"], page["tokens"]
+                return
+
+            with self.cache.writer(key) as entry:
+                for page_number, text, tokens in self._extract_pages(pdf_path):
+                    entry.write({"page": page_number, "text": text, "tokens": tokens})
+                    yield page_number, tokens
         except Exception as e:
             raise ValueError(f"Error processing PDF: {e}")
+
+    def cache_settings(self):
+        """
+        Returns the settings that determine the tokens produced for a document.
+        :return: Dictionary of settings used in cache keys.
+        """
+        return {"lower_case": self.lower_case, "remove_stopwords": self.remove_stopwords}
+
+    def _extract_pages(self, pdf_path):
+        """
+        Extracts and tokenizes the pages of a PDF, in-process or across a process pool.
+        :param pdf_path: Path to the PDF file.
+        :return: Generator of (page_number, text, tokens) tuples.
+        """
+        if self.num_workers > 1:
+            yield from self._extract_pages_parallel(pdf_path)
+            return
+
+        from PyPDF2 import PdfReader
+
+        reader = PdfReader(pdf_path)
+        for page_number, page in enumerate(reader.pages, start=1):
+            text = page.extract_text() or ""
+            yield page_number, text, self.process_text(text)
+
+    def _extract_pages_parallel(self, pdf_path):
+        """
+        Shards the pages of a PDF across a process pool and yields them back in page order.
+        Each worker opens its own reader, so only the path and page bounds are sent to it. PyPDF2 parses the
+        cross-reference table and page tree whenever a reader is opened, so every shard pays that cost again;
+        parallel extraction only pays off for long documents whose text extraction dominates parsing.
+        :param pdf_path: Path to the PDF file.
+        :return: Generator of (page_number, text, tokens) tuples.
+        """
+        from PyPDF2 import PdfReader
+
+        num_pages = len(PdfReader(pdf_path).pages)
+        # Several shards per worker keep the pool busy when some pages are slower than others
+        shard_size = max(1, math.ceil(num_pages / (self.num_workers * 4)))
+
+        executor = ProcessPoolExecutor(max_workers=self.num_workers)
+        try:
+            futures = [
+                executor.submit(_process_page_range, self, pdf_path, start, min(start + shard_size, num_pages))
+                for start in range(0, num_pages, shard_size)
+            ]
+            for future in futures:
+                yield from future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def process_pdf(self, pdf_path):
+        """
+        Processes a PDF file to extract text content.
+        :param pdf_path: Path to the PDF file.
+        :return: List of processed tokens for the whole document.
+        """
+        tokens = []
+        for _, page_tokens in self.stream_pdf(pdf_path):
+            tokens.extend(page_tokens)
+        return tokens
@@ -1,5 +1,7 @@
 import unittest
-from aggregation import WeightedVotingAggregator, MajorityVotingAggregator
+import numpy as np
+from evaluation.dynamic_weight_adjuster import DynamicWeightAdjuster
+from aggregation import WeightedVotingAggregator, MajorityVotingAggregator, BayesianAggregator, IncrementalMajorityVoter
 
 class TestWeightedVotingAggregator(unittest.TestCase):
     def setUp(self):
@@ -16,6 +18,54 @@ class TestWeightedVotingAggregator(unittest.TestCase):
         self.assertEqual(result["result"], "A", "Weighted voting failed to select the correct label.")
         self.assertGreater(result["details"]["A"], result["details"]["B"], "Confidence weighting is incorrect.")
 
+    def test_weighted_voting_batch(self):
+        label_matrix = np.array([
+            ["A", "B", "C"],
+            ["A", "A", "B"],
+            ["B", "A", "B"],
+        ])
+        confidences = [0.6, 0.3, 0.1]
+        result = self.aggregator.aggregate_batch(label_matrix, confidences)
+
+        self.assertEqual(list(result["result"]), ["A", "B", "C"])
+        self.assertEqual(list(result["labels"]), ["A", "B", "C"])
+        np.testing.assert_allclose(result["details"].sum(axis=1), 1.0)
+        np.testing.assert_allclose(result["details"][1], [0.4, 0.6, 0.0])
+
+    def test_weighted_voting_batch_matches_single_item(self):
+        rng = np.random.default_rng(0)
+        label_matrix = rng.integers(0, 4, size=(7, 200))
+        confidences = rng.random(7)
+        batch_result = self.aggregator.aggregate_batch(label_matrix, confidences)
+
+        for item in range(label_matrix.shape[1]):
+            predictions = [{"label": int(label)} for label in label_matrix[:, item]]
+            single_result = self.aggregator.aggregate(predictions, list(confidences))
+            self.assertEqual(batch_result["result"][item], single_result["result"])
+
+    def test_weighted_voting_batch_edge_cases(self):
+        label_matrix = np.array([["A", "B"], ["B", "B"]])
+        with self.assertRaises(ValueError):
+            self.aggregator.aggregate_batch(label_matrix, [0.0, 0.0])
+
+        result = self.aggregator.aggregate_batch(np.empty((2, 0), dtype=object), [0.5, 0.5])
+        self.assertEqual(len(result["result"]), 0)
+        self.assertEqual(result["details"].shape, (0, 0))
+
+    def test_learned_weights(self):
+        adjuster = DynamicWeightAdjuster(initial_weights={"model_1": 0.2, "model_2": 0.3, "model_3": 0.9})
+        aggregator = WeightedVotingAggregator(adjuster)
+        predictions = [
+            {"model": "model_1", "label": "A"},
+            {"model": "model_2", "label": "A"},
+            {"model": "model_3", "label": "B"},
+        ]
+        self.assertEqual(aggregator.aggregate(predictions)["result"], "B")
+
+        label_matrix = np.array([["A", "B"], ["A", "B"], ["B", "A"]])
+        result = aggregator.aggregate_batch(label_matrix, model_names=["model_1", "model_2", "model_3"])
+        self.assertEqual(result["result"].tolist(), ["B", "A"])
+
 class TestMajorityVotingAggregator(unittest.TestCase):
     def setUp(self):
         self.aggregator = MajorityVotingAggregator()
@@ -38,5 +88,155 @@ class TestMajorityVotingAggregator(unittest.TestCase):
         result = self.aggregator.aggregate(predictions, confidences=None)
         self.assertEqual(result["result"], "B", "Majority voting failed to handle a tie correctly.")
 
+class TestIncrementalMajorityVoter(unittest.TestCase):
+    def setUp(self):
+        self.voter = IncrementalMajorityVoter(["model_1", "model_2", "model_3"])
+
+    def test_items_finalized_when_all_models_report(self):
+        self.assertEqual(len(self.voter.update("model_1", [1, 2], ["A", "B"])["items"]), 0)
+        self.assertEqual(len(self.voter.update("model_2", [2, 1], ["B", "A"])["items"]), 0)
+
+        finalized = self.voter.update("model_3", [2], ["A"])
+        self.assertEqual(finalized["items"].tolist(), [2])
+        self.assertEqual(finalized["result"].tolist(), ["B"])
+
+        result = self.voter.result()
+        self.assertEqual(result["items"].tolist(), [1, 2])
+        self.assertEqual(result["result"].tolist(), ["A", "B"])
+        self.assertEqual(result["finalized"].tolist(), [False, True])
+
+    def test_matches_batch_majority(self):
+        rng = np.random.default_rng(0)
+        label_matrix = rng.integers(0, 4, (3, 500))
+        for model, labels in zip(self.voter.models, label_matrix):
+            self.voter.update(model, np.arange(500), labels)
+
+        result = self.voter.result()
+        for item in range(0, 500, 50):
+            counts = np.bincount(label_matrix[:, item], minlength=4)
+            self.assertEqual(counts.max(), counts[result["result"][item]])
+
+    def test_merge_partial_voters(self):
+        other = IncrementalMajorityVoter(self.voter.models)
+        self.voter.update("model_1", [1, 2], ["A", "B"])
+        self.voter.update("model_2", [1, 2], ["C", "B"])
+        other.update("model_3", [1, 2], ["C", None])
+
+        finalized = self.voter.merge(other)
+        self.assertEqual(finalized["items"].tolist(), [1, 2])
+        self.assertEqual(finalized["result"].tolist(), ["C", "B"])
+
+    def test_merge_emits_items_finalized_in_other(self):
+        other = IncrementalMajorityVoter(self.voter.models)
+        for model in self.voter.models:
+            other.update(model, [1], ["A"])
+        self.voter.update("model_1", [2], ["B"])
+
+        finalized = self.voter.merge(other)
+        self.assertEqual(finalized["items"].tolist(), [1])
+        self.assertEqual(finalized["result"].tolist(), ["A"])
+        self.assertEqual(self.voter.result()["finalized"].tolist(), [False, True])
+        self.assertEqual(len(self.voter.merge(IncrementalMajorityVoter(self.voter.models))["items"]), 0)
+
+    def test_released_items_free_memory(self):
+        voter = IncrementalMajorityVoter(["model_1", "model_2"], keep_finalized=False)
+        for start in range(0, 1000, 100):
+            items = np.arange(start, start + 100)
+            voter.update("model_1", items, items % 3)
+            finalized = voter.update("model_2", items, items % 3)
+            self.assertEqual(len(finalized["items"]), 100)
+        self.assertEqual(len(voter), 0)
+        self.assertLessEqual(voter._counts.shape[0], 128)
+
+    def test_duplicate_report_rejected(self):
+        self.voter.update("model_1", [1], ["A"])
+        with self.assertRaises(ValueError):
+            self.voter.update("model_1", [1], ["B"])
+        with self.assertRaises(ValueError):
+            self.voter.update("unknown", [1], ["B"])
+
+    def test_rejected_report_adds_no_items(self):
+        self.voter.update("model_1", [1], ["A"])
+        with self.assertRaises(ValueError):
+            self.voter.update("model_1", [2, 1], ["B", "B"])
+        with self.assertRaises(ValueError):
+            self.voter.update("model_2", [3, 3], ["B", "B"])
+        self.assertEqual(self.voter.result()["items"].tolist(), [1])
+
+        other = IncrementalMajorityVoter(self.voter.models)
+        other.update("model_1", [4, 1], ["A", "A"])
+        with self.assertRaises(ValueError):
+            self.voter.merge(other)
+        self.assertEqual(self.voter.result()["items"].tolist(), [1])
+
+class TestBayesianAggregator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Three reliable models and four weak ones that mostly answer label 0
+        rng = np.random.default_rng(0)
+        cls.truth = rng.integers(0, 3, 3000)
+        rows = []
+        for accuracy in [0.85, 0.75, 0.7, 0.4, 0.4, 0.35, 0.35]:
+            noise = rng.integers(0, 3, len(cls.truth))
+            if accuracy < 0.5:
+                noise = np.where(rng.random(len(cls.truth)) < 0.8, 0, noise)
+            rows.append(np.where(rng.random(len(cls.truth)) < accuracy, cls.truth, noise))
+        cls.label_matrix = np.array(rows)
+
+    def test_beats_weighted_voting(self):
+        voting_result = WeightedVotingAggregator().aggregate_batch(self.label_matrix, np.ones(7))
+        bayesian_result = BayesianAggregator().fit(self.label_matrix)
+
+        voting_accuracy = (voting_result["result"] == self.truth).mean()
+        bayesian_accuracy = (bayesian_result["result"] == self.truth).mean()
+        self.assertGreater(bayesian_accuracy, voting_accuracy)
+        np.testing.assert_allclose(bayesian_result["details"].sum(axis=1), 1.0)
+
+    def test_incremental_updates(self):
+        aggregator = BayesianAggregator()
+        for batch in np.array_split(np.arange(len(self.truth)), 5):
+            result = aggregator.partial_fit(self.label_matrix[:, batch])
+            self.assertGreater((result["result"] == self.truth[batch]).mean(), 0.9)
+
+        confusion = aggregator.confusion_matrices()
+        self.assertEqual(confusion.shape, (7, 3, 3))
+        np.testing.assert_allclose(confusion.sum(axis=2), 1.0)
+        # The most accurate model is recognized as such
+        self.assertGreater(np.diag(confusion[0]).mean(), np.diag(confusion[6]).mean())
+
+    def test_missing_predictions(self):
+        label_matrix = self.label_matrix.astype(object)
+        label_matrix[0, :1000] = None
+        result = BayesianAggregator().fit(label_matrix)
+        self.assertGreater((result["result"] == self.truth).mean(), 0.9)
+
+    def test_single_item_aggregate(self):
+        aggregator = BayesianAggregator()
+        predictions = [{"label": "A"}, {"label": "B"}, {"label": "B"}]
+        # Before fitting it falls back to weighted voting
+        self.assertEqual(aggregator.aggregate(predictions, [0.6, 0.3, 0.1])["result"], "A")
+
+        aggregator.fit(self.label_matrix)
+        predictions = [{"label": int(label)} for label in self.label_matrix[:, 0]]
+        result = aggregator.aggregate(predictions)
+        self.assertEqual(result["result"], self.truth[0])
+        self.assertAlmostEqual(sum(result["details"].values()), 1.0)
+
+    def test_predict_proba_leaves_model_unchanged(self):
+        aggregator = BayesianAggregator()
+        aggregator.fit(self.label_matrix)
+        confusion = aggregator.confusion_matrices()
+
+        label_matrix = self.label_matrix[:, :5].copy()
+        label_matrix[0] = 7
+        posteriors = aggregator.predict_proba(label_matrix)
+        self.assertEqual(posteriors.shape, (5, 3))
+        self.assertEqual(aggregator.vocabulary.labels, [0, 1, 2])
+        np.testing.assert_array_equal(aggregator.confusion_matrices(), confusion)
+        # The unseen label carries no evidence, like a missing prediction
+        label_matrix = label_matrix.astype(object)
+        label_matrix[0] = None
+        np.testing.assert_allclose(aggregator.predict_proba(label_matrix), posteriors)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,133 @@
+import json
+import os
+import queue
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from app import InferenceService, create_server
+from models.registry import ModelRegistry
+
+class TestInferenceService(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+
+        def pipeline(input_path, output_format):
+            self.release.wait(timeout=5)
+            return f"{input_path}:{output_format}"
+
+        self.service = InferenceService(pipeline, workers=1, queue_size=1)
+
+    def tearDown(self):
+        self.release.set()
+        self.service.shutdown()
+
+    def test_jobs_complete(self):
+        self.release.set()
+        future = self.service.submit("input.pdf", "json")
+        self.assertEqual(future.result(timeout=5), "input.pdf:json")
+
+    def test_queue_is_bounded(self):
+        running = self.service.submit("first.pdf", "json")
+        # Wait until the single worker has picked up the first job
+        while self.service.pending():
+            time.sleep(0.01)
+        queued = self.service.submit("second.pdf", "json")
+
+        with self.assertRaises(queue.Full):
+            self.service.submit("third.pdf", "json")
+
+        self.release.set()
+        self.assertEqual(running.result(timeout=5), "first.pdf:json")
+        self.assertEqual(queued.result(timeout=5), "second.pdf:json")
+
+class TestPipelineServer(unittest.TestCase):
+    def test_health_reports_warm_models(self):
+        registry = ModelRegistry()
+        registry.register("Mock", MockModel, ("tabular",))
+        server = create_server(port=0, registry=registry)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with urlopen(f"http://127.0.0.1:{server.server_port}/health") as response:
+                status = json.loads(response.read())
+            self.assertEqual(status["loaded_models"], ["Mock"])
+            self.assertEqual(status["queued_jobs"], 0)
+        finally:
+            server.shutdown()
+            server.server_close()
+            server.service.shutdown()
+            server.scheduler.shutdown()
+
+class TestPredictEndpoint(unittest.TestCase):
+    def setUp(self):
+        registry = ModelRegistry()
+        registry.register("Mock", MockModel, ("tabular",))
+        self.server = create_server(port=0, registry=registry)
+        self.server.service = MagicMock(wraps=self.server.service)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server.service.shutdown()
+        self.server.scheduler.shutdown()
+
+    def test_unsupported_output_format(self):
+        request = Request(
+            f"http://127.0.0.1:{self.server.server_port}/predict?filename=data.csv&format=xml",
+            data=b"a,b\n1,2\n", method="POST",
+        )
+        with self.assertRaises(HTTPError) as context:
+            urlopen(request)
+        self.assertEqual(context.exception.code, 400)
+        self.server.service.submit.assert_not_called()
+
+class TestUploadLifetime(unittest.TestCase):
+    def test_timed_out_job_keeps_its_upload(self):
+        release = threading.Event()
+        seen = {}
+
+        def pipeline(input_path, output_format):
+            release.wait(timeout=5)
+            seen["exists"] = os.path.exists(input_path)
+            seen["path"] = input_path
+            return "{}"
+
+        registry = ModelRegistry()
+        server = create_server(port=0, registry=registry, request_timeout=0.1)
+        server.service = InferenceService(pipeline, workers=1)
+        submit = server.service.submit
+        server.service.submit = lambda path, output_format: seen.setdefault("future", submit(path, output_format))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            request = Request(
+                f"http://127.0.0.1:{server.server_port}/predict?filename=data.csv", data=b"a\n1\n", method="POST"
+            )
+            with self.assertRaises(HTTPError) as context:
+                urlopen(request)
+            self.assertEqual(context.exception.code, 504)
+
+            release.set()
+            seen["future"].result(timeout=5)
+            self.assertTrue(seen["exists"])
+            # Removed by the job once it is done
+            deadline = time.monotonic() + 5
+            while os.path.exists(seen["path"]) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertFalse(os.path.exists(seen["path"]))
+        finally:
+            release.set()
+            server.shutdown()
+            server.server_close()
+            server.service.shutdown()
+            server.scheduler.shutdown()
+
+class MockModel:
+    def predict(self, data):
+        return data
+
+if __name__ == "__main__":
+    unittest.main()
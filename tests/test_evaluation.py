@@ -1,5 +1,8 @@
+import os
+import tempfile
 import unittest
-from evaluation.performance_metrics import PerformanceMetrics
+import numpy as np
+from evaluation.performance_metrics import PerformanceMetrics, MetricsAccumulator
 from evaluation.dynamic_weight_adjuster import DynamicWeightAdjuster
 from evaluation.disagreement_handler import DisagreementHandler
 
@@ -22,6 +25,43 @@ class TestEvaluation(unittest.TestCase):
             self.assertGreaterEqual(value, 0.0)
             self.assertLessEqual(value, 1.0)
 
+    def test_metrics_accumulator_matches_batch(self):
+        rng = np.random.default_rng(0)
+        true_labels = rng.integers(0, 4, 1000)
+        predictions = np.where(rng.random(1000) < 0.7, true_labels, rng.integers(0, 5, 1000))
+
+        accumulator = MetricsAccumulator()
+        other = MetricsAccumulator()
+        accumulator.update(true_labels[:600], predictions[:600])
+        other.update(true_labels[600:], predictions[600:])
+        accumulator.merge(other)
+
+        from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+        expected = {
+            "accuracy": accuracy_score(true_labels, predictions),
+            "precision": precision_score(true_labels, predictions, average="weighted", zero_division=0),
+            "recall": recall_score(true_labels, predictions, average="weighted", zero_division=0),
+            "f1_score": f1_score(true_labels, predictions, average="weighted", zero_division=0),
+        }
+        self.assertEqual(set(accumulator.compute()), set(expected))
+        for metric, value in accumulator.compute().items():
+            self.assertAlmostEqual(value, expected[metric])
+        self.assertEqual(accumulator.confusion_matrix().sum(), 1000)
+
+    def test_metrics_accumulator_breakdowns(self):
+        accumulator = MetricsAccumulator()
+        accumulator.update(["A", "B", "B"], ["A", "B", "A"], model="ModelA")
+        accumulator.update(["A", "B", "B"], ["A", "B", "B"], model="ModelB")
+
+        per_model = accumulator.per_model()
+        self.assertAlmostEqual(per_model["ModelA"]["accuracy"], 2 / 3)
+        self.assertEqual(per_model["ModelB"]["f1_score"], 1.0)
+
+        per_class = accumulator.per_class("ModelA")
+        self.assertEqual(per_class["A"], {"precision": 0.5, "recall": 1.0, "f1_score": 2 / 3, "support": 1})
+        self.assertEqual(per_class["B"]["recall"], 0.5)
+
     def test_dynamic_weight_adjuster(self):
         adjuster = DynamicWeightAdjuster(initial_weights={"ModelA": 0.5, "ModelB": 0.5}, learning_rate=0.1, decay_factor=0.9)
 
@@ -41,6 +81,31 @@ class TestEvaluation(unittest.TestCase):
         for weight in weights.values():
             self.assertGreaterEqual(weight, 0.0)
 
+    def test_dynamic_weight_adjuster_batch(self):
+        adjuster = DynamicWeightAdjuster(learning_rate=0.5, decay_factor=0.5)
+        true_labels = np.array([0, 1, 1, 0])
+        scores = adjuster.update_batch(
+            {"ModelA": np.array([0, 1, 1, 0]), "ModelB": np.array([1, 1, 0, None], dtype=object)},
+            true_labels,
+        )
+
+        self.assertEqual(scores, {"ModelA": 1.0, "ModelB": 1 / 3})
+        self.assertAlmostEqual(adjuster.get_weight("ModelA"), 1.0)
+        self.assertAlmostEqual(adjuster.get_weight("ModelB"), 0.5 + 0.5 / 3)
+        self.assertEqual(adjuster.get_weight("ModelC"), 1.0)
+
+    def test_dynamic_weight_adjuster_snapshot(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "weights.json")
+            adjuster = DynamicWeightAdjuster(snapshot_path=path)
+            adjuster.update_batch({"ModelA": [0, 1]}, [0, 0])
+            self.assertEqual(os.listdir(temp_dir), ["weights.json"])
+
+            restored = DynamicWeightAdjuster.load(path)
+            self.assertEqual(restored.get_weights(), adjuster.get_weights())
+            self.assertEqual(restored.updates, 1)
+            self.assertEqual(restored.decay_factor, adjuster.decay_factor)
+
     def test_disagreement_handler(self):
         handler = DisagreementHandler(threshold=0.6)
 
@@ -63,5 +128,35 @@ class TestEvaluation(unittest.TestCase):
         # Example: Threshold is 0.6, so predictions with no consensus should return None
         self.assertEqual(resolved_predictions[2], 1)  # For [1, 0, 1], majority is 1
 
+    def test_disagreement_handler_batch(self):
+        handler = DisagreementHandler(threshold=0.6)
+
+        label_matrix = np.array([
+            [0, 1, 1, 2],
+            [0, 1, 0, 1],
+            [0, 0, 1, 0],
+        ])
+        resolved, consensus, agreement = handler.resolve_batch(label_matrix)
+
+        np.testing.assert_array_equal(resolved[:3], [0, 1, 1])
+        np.testing.assert_array_equal(consensus, [True, True, True, False])
+        np.testing.assert_allclose(agreement, [1.0, 2 / 3, 2 / 3, 1 / 3])
+
+    def test_disagreement_handler_missing_outputs(self):
+        handler = DisagreementHandler(threshold=0.6)
+
+        # ModelC stops early and ModelB has no output for the third item
+        model_predictions = {
+            "ModelA": ["x", "y", "y", "x"],
+            "ModelB": ["x", "y", None, "y"],
+            "ModelC": ["x", "x"],
+        }
+        resolved, consensus, agreement = handler.resolve_batch(model_predictions)
+
+        np.testing.assert_array_equal(resolved[:3], ["x", "y", "y"])
+        np.testing.assert_array_equal(consensus, [True, True, True, False])
+        np.testing.assert_allclose(agreement, [1.0, 2 / 3, 1.0, 0.5])
+        self.assertEqual(handler.handle_disagreement(model_predictions), ["x", "y", "y", None])
+
 if __name__ == "__main__":
     unittest.main()
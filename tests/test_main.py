@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+import unittest
+from main import aggregate, postprocess, predict_file
+from models.registry import ModelRegistry
+
+class ClassifierModel:
+    def predict(self, data):
+        return ["pass", "fail", "pass"]
+
+class ClusterModel:
+    def predict(self, data):
+        return [0, 1, 1]
+
+class ShortModel:
+    def predict(self, data):
+        return ["pass"]
+
+class TestPredictFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.temp_dir.name, "input.csv")
+        with open(self.input_path, "w") as file:
+            file.write("a,b\n1,2\n3,4\n5,6\n")
+        self.registry = ModelRegistry()
+        self.registry.register("SVM", ClassifierModel, ("tabular",))
+        self.registry.register("RandomForest", ClassifierModel, ("tabular",))
+        self.registry.register("KMeans", ClusterModel, ("tabular",))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_mixed_label_types(self):
+        result = predict_file(self.input_path, registry=self.registry)
+        self.assertEqual(result["result"], ["pass", "fail", "pass"])
+        self.assertAlmostEqual(sum(result["details"].values()), 1.0)
+        self.assertEqual(set(result["details"]), {"pass", "fail", 0, 1})
+        self.assertEqual(json.loads(postprocess(result, "json"))["result"], ["pass", "fail", "pass"])
+
+    def test_prediction_length_mismatch(self):
+        self.registry.register("Short", ShortModel, ("tabular",))
+        with self.assertRaisesRegex(ValueError, "Model Short returned 1 predictions, expected 3"):
+            predict_file(self.input_path, registry=self.registry)
+
+    def test_labels_keep_their_type(self):
+        result = aggregate({"KMeans": [0, 1], "DBSCAN": [0, 1]})
+        self.assertEqual(result["result"], [0, 1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,7 @@
 import unittest
+import subprocess
+import sys
+import time
 import numpy as np
 from models.supervised.random_forest_model import RandomForestModel
 from models.supervised.svm_model import SVMModel
@@ -7,6 +10,8 @@ from models.unsupervised.kmeans_model import KMeansModel
 from models.unsupervised.dbscan_model import DBSCANModel
 from models.pretrained.bert_model import BERTModel
 from models.pretrained.gpt_model import GPTModel
+from models.registry import ModelRegistry, LazyFactory, default_registry
+from models.scheduler import ModelScheduler
 
 class TestModels(unittest.TestCase):
     @classmethod
@@ -56,6 +61,140 @@ class TestModels(unittest.TestCase):
         predictions = model.predict(self.mock_text_data)
         self.assertEqual(len(predictions), len(self.mock_text_data))
 
+    def test_bert_model_batched_predict(self):
+        model = BERTModel(model_name="bert-base-uncased", num_labels=2)
+        texts = ["Short text.", "A somewhat longer sentence used for testing.", "Mid length text here."]
+
+        labels, probabilities = model.predict(texts, batch_size=2, return_probabilities=True)
+        self.assertEqual(labels, model.predict(texts, batch_size=1))
+        self.assertEqual(len(probabilities), len(texts))
+        for label, row in zip(labels, probabilities):
+            self.assertAlmostEqual(sum(row), 1.0, places=5)
+            self.assertEqual(label, row.index(max(row)))
+
+    def test_bert_model_batched_training(self):
+        model = BERTModel(model_name="bert-base-uncased", num_labels=2)
+        mock_labels = [0, 1] * 5
+        history = model.train(
+            self.mock_text_data, mock_labels, epochs=2, learning_rate=1e-5,
+            batch_size=4, gradient_accumulation_steps=2
+        )
+
+        self.assertEqual([stats["epoch"] for stats in history], [1, 2])
+        for stats in history:
+            self.assertGreater(stats["examples_per_sec"], 0)
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.built = []
+        self.registry = ModelRegistry()
+        self.registry.register("Tabular", self.make_factory("Tabular"), ("tabular",))
+        self.registry.register("Text", self.make_factory("Text"), ("text",))
+
+    def make_factory(self, name):
+        def factory():
+            self.built.append(name)
+            return MockRegistryModel()
+        return factory
+
+    def test_models_are_built_lazily(self):
+        self.assertEqual(self.built, [])
+        self.assertFalse(self.registry.is_loaded("Tabular"))
+
+        model = self.registry.get("Tabular")
+        self.assertIs(self.registry.get("Tabular"), model)
+        self.assertEqual(self.built, ["Tabular"])
+
+    def test_select_by_modality_and_names(self):
+        self.assertEqual(self.registry.select("tabular"), ["Tabular"])
+        self.assertEqual(self.registry.select(names=["Text"]), ["Text"])
+        self.assertEqual(self.registry.select("tabular", names=["Text"]), [])
+        with self.assertRaises(ValueError):
+            self.registry.select(names=["Unknown"])
+        self.assertEqual(self.built, [])
+
+    def test_default_registry_selects_tabular_models(self):
+        registry = default_registry()
+        self.assertEqual(
+            registry.select("tabular"),
+            ["RandomForest", "SVM", "NeuralNetwork", "KMeans", "DBSCAN"]
+        )
+        self.assertEqual(registry.select("text"), ["BERT", "GPT"])
+        self.assertIsInstance(registry.get("RandomForest"), RandomForestModel)
+        self.assertFalse(registry.is_loaded("BERT"))
+
+class TestLazyImports(unittest.TestCase):
+    def test_package_imports_skip_heavy_frameworks(self):
+        script = (
+            "import sys, main, models, preprocessing.text_preprocessor, evaluation, training.model_trainer; "
+            "print(','.join(m for m in ('torch', 'transformers', 'cv2', 'sklearn', 'nltk') if m in sys.modules))"
+        )
+        completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        self.assertEqual(completed.stdout.strip(), "")
+
+class TestModelScheduler(unittest.TestCase):
+    def setUp(self):
+        self.registry = ModelRegistry()
+        self.registry.register("Fast", MockRegistryModel, ("tabular",))
+        self.registry.register("Slow", lambda: MockRegistryModel(delay=2.0), ("tabular",), timeout=0.2)
+        self.registry.register("Broken", MockFailingModel, ("tabular",))
+        self.registry.register(
+            "InProcess", LazyFactory("tests.test_models", "MockRegistryModel"), ("tabular",), executor="process"
+        )
+        self.scheduler = ModelScheduler(self.registry, max_workers=4)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_run_collects_finished_models(self):
+        start_time = time.monotonic()
+        predictions, failures = self.scheduler.run([1, 2, 3], ["Fast", "Slow", "Broken", "InProcess"])
+
+        self.assertLess(time.monotonic() - start_time, 1.5)
+        self.assertEqual(predictions, {"Fast": [1, 2, 3], "InProcess": [1, 2, 3]})
+        self.assertIsInstance(failures["Slow"], TimeoutError)
+        self.assertIsInstance(failures["Broken"], ValueError)
+
+    def test_models_run_concurrently(self):
+        self.registry.register("SlowA", lambda: MockRegistryModel(delay=0.3), ("tabular",))
+        self.registry.register("SlowB", lambda: MockRegistryModel(delay=0.3), ("tabular",))
+
+        start_time = time.monotonic()
+        predictions, failures = self.scheduler.run([1], ["SlowA", "SlowB"])
+
+        self.assertLess(time.monotonic() - start_time, 0.55)
+        self.assertEqual(list(predictions), ["SlowA", "SlowB"])
+        self.assertEqual(failures, {})
+
+    def test_stuck_models_do_not_block_exit(self):
+        for executor in ("thread", "process"):
+            script = (
+                "from models.registry import ModelRegistry, LazyFactory\n"
+                "from models.scheduler import ModelScheduler\n"
+                "registry = ModelRegistry()\n"
+                "factory = LazyFactory('tests.test_models', 'MockRegistryModel', delay=30)\n"
+                f"registry.register('Stuck', factory, ('tabular',), executor={executor!r}, timeout=0.2)\n"
+                "scheduler = ModelScheduler(registry)\n"
+                "print(type(scheduler.run([1], ['Stuck'])[1]['Stuck']).__name__)\n"
+                "scheduler.shutdown()\n"
+            )
+            start_time = time.monotonic()
+            completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=20)
+            self.assertEqual(completed.stdout.strip(), "TimeoutError", completed.stderr)
+            self.assertLess(time.monotonic() - start_time, 10)
+
+class MockRegistryModel:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def predict(self, data):
+        time.sleep(self.delay)
+        return data
+
+class MockFailingModel:
+    def predict(self, data):
+        raise ValueError("Model is not fitted.")
+
 def test_gpt_model(self):
     """
     Test the GPTModel for text generation.
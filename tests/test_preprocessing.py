@@ -2,13 +2,12 @@ import unittest
 import numpy as np
 import pandas as pd
 import os
-import nltk
+import tempfile
 from preprocessing.image_preprocessor import ImagePreprocessor
 from preprocessing.tabular_preprocessor import TabularPreprocessor
 from preprocessing.text_preprocessor import TextPreprocessor
-
-# nltk.download('all')
-nltk.download('punkt_tab')
+from preprocessing.pdf_cache import PdfTextCache
+from preprocessing.pdf_rasterizer import PdfRasterizer
 
 class TestPreprocessing(unittest.TestCase):
     @classmethod
@@ -17,6 +16,7 @@ class TestPreprocessing(unittest.TestCase):
         cls.mock_image_path = "tests/mock_image.jpg"
         cls.mock_tabular_path = "tests/mock_tabular.csv"
         cls.mock_text_data = "This is a sample text for testing the text preprocessor."
+        cls.mock_pdf_path = "data/processed/2024_g4_ela_key.pdf"
 
         # Create a mock image (100x100 RGB)
         mock_image = np.random.randint(0, 255, (100, 100, 3), dtype=np.uint8)
@@ -47,6 +47,20 @@ class TestPreprocessing(unittest.TestCase):
         self.assertEqual(processed_image.shape, (64, 64, 3))
         self.assertTrue((processed_image >= 0).all() and (processed_image <= 1).all())
 
+    def test_image_batch(self):
+        preprocessor = ImagePreprocessor(target_size=(64, 32), normalize=True, num_workers=2)
+        batch = preprocessor.process_batch([self.mock_image_path] * 3)
+
+        self.assertEqual(batch.shape, (3, 32, 64, 3))
+        self.assertEqual(batch.dtype, np.float32)
+        np.testing.assert_allclose(batch[2], preprocessor.process(self.mock_image_path), atol=1e-6)
+
+        raw = preprocessor.process_batch([self.mock_image_path], dtype=np.uint8)
+        np.testing.assert_array_equal(raw[0], np.round(batch[0] * 255).astype(np.uint8))
+
+        with self.assertRaises(ValueError):
+            preprocessor.process_batch([self.mock_image_path, "tests/missing_image.jpg"])
+
     def test_tabular_preprocessor(self):
         preprocessor = TabularPreprocessor(scale_features=True, impute_strategy="mean")
         processed_data = preprocessor.process(self.mock_tabular_path)
@@ -60,6 +74,31 @@ class TestPreprocessing(unittest.TestCase):
         expected_shape = (df.shape[0], len(df.columns) - 1 + num_categorical)
         self.assertEqual(processed_data.shape, expected_shape)
 
+    def test_tabular_preprocessor_chunked(self):
+        expected = TabularPreprocessor(scale_features=True, impute_strategy="mean").process(self.mock_tabular_path)
+
+        # With one row per chunk, some chunks hold only missing values
+        for chunksize in (1, 3, 100):
+            preprocessor = TabularPreprocessor(scale_features=True, impute_strategy="mean")
+            processed_data = preprocessor.process_chunked(self.mock_tabular_path, chunksize=chunksize)
+            self.assertEqual(processed_data.dtype, np.float32)
+            np.testing.assert_allclose(processed_data, expected.astype(float), atol=1e-6)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            out_path = os.path.join(temp_dir, "tabular.npy")
+            TabularPreprocessor(chunksize=2).process_chunked(self.mock_tabular_path, 2, out_path=out_path)
+            np.testing.assert_allclose(np.load(out_path), expected.astype(float), atol=1e-6)
+
+        # The fitted imputer and scaler reproduce the numerical columns
+        df = pd.read_csv(self.mock_tabular_path)
+        numerical = df[["numerical_1", "numerical_2"]]
+        transformed = preprocessor.scaler.transform(preprocessor.imputer.transform(numerical))
+        np.testing.assert_allclose(transformed, expected[:, :2].astype(float), atol=1e-6)
+        self.assertEqual(processed_data.shape, preprocessor.process(self.mock_tabular_path).shape)
+
+        with self.assertRaises(ValueError):
+            TabularPreprocessor(impute_strategy="median").process_chunked(self.mock_tabular_path)
+
     def test_text_preprocessor(self):
         preprocessor = TextPreprocessor(lower_case=True, remove_stopwords=True)
         processed_text = preprocessor.process(self.mock_text_data)
@@ -68,5 +107,153 @@ class TestPreprocessing(unittest.TestCase):
         self.assertGreater(len(processed_text), 0)  # Ensure tokens are returned
         self.assertTrue(all(isinstance(token, str) for token in processed_text))
 
+    def test_text_preprocessor_stream_pdf(self):
+        preprocessor = TextPreprocessor(lower_case=True, remove_stopwords=True)
+        pages = list(preprocessor.stream_pdf(self.mock_pdf_path))
+
+        self.assertEqual([page_number for page_number, _ in pages], [1, 2, 3])
+        streamed_tokens = [token for _, tokens in pages for token in tokens]
+        self.assertEqual(preprocessor.process_pdf(self.mock_pdf_path), streamed_tokens)
+
+    def test_text_preprocessor_parallel_pdf(self):
+        serial = TextPreprocessor(lower_case=True, remove_stopwords=True)
+        parallel = TextPreprocessor(lower_case=True, remove_stopwords=True, num_workers=2)
+
+        self.assertEqual(list(parallel.stream_pdf(self.mock_pdf_path)), list(serial.stream_pdf(self.mock_pdf_path)))
+
+class TestPdfTextCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.cache = PdfTextCache(self.cache_dir.name)
+        self.pdf_path = "data/processed/2024_g4_ela_key.pdf"
+        self.settings = {"lower_case": True, "remove_stopwords": True}
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def write_entry(self, key, pages):
+        with self.cache.writer(key) as entry:
+            for page in pages:
+                entry.write(page)
+
+    def test_cache_round_trip(self):
+        key = self.cache.make_key(self.pdf_path, self.settings)
+        self.assertIsNone(self.cache.read(key))
+
+        pages = [{"page": 1, "text": "Sample text", "tokens": ["sample", "text"]}]
+        self.write_entry(key, pages)
+        self.assertEqual(list(self.cache.read(key)), pages)
+
+        # Different settings produce a different entry
+        other_key = self.cache.make_key(self.pdf_path, {"lower_case": False, "remove_stopwords": True})
+        self.assertNotEqual(key, other_key)
+        self.assertIsNone(self.cache.read(other_key))
+
+    def test_unused_read_holds_no_file(self):
+        import gc
+        import warnings
+
+        key = self.cache.make_key(self.pdf_path, self.settings)
+        self.write_entry(key, [{"page": 1, "text": "", "tokens": []}])
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            pages = self.cache.read(key)
+            self.assertIsNotNone(pages)
+            del pages
+            gc.collect()
+        self.assertEqual([warning for warning in caught if warning.category is ResourceWarning], [])
+
+    def test_cache_invalidate(self):
+        key = self.cache.make_key(self.pdf_path, self.settings)
+        self.write_entry(key, [{"page": 1, "text": "", "tokens": []}])
+
+        self.assertEqual(self.cache.invalidate(self.pdf_path), 1)
+        self.assertIsNone(self.cache.read(key))
+
+    def test_cache_failed_write_is_discarded(self):
+        key = self.cache.make_key(self.pdf_path, self.settings)
+        with self.assertRaises(RuntimeError):
+            with self.cache.writer(key) as entry:
+                entry.write({"page": 1, "text": "", "tokens": []})
+                raise RuntimeError("extraction failed")
+
+        self.assertIsNone(self.cache.read(key))
+        self.assertEqual(os.listdir(self.cache_dir.name), [])
+
+    def test_cache_lru_eviction(self):
+        page = {"page": 1, "text": "x" * 100, "tokens": []}
+        self.write_entry("first", [page])
+        entry_size = os.path.getsize(os.path.join(self.cache_dir.name, "first.jsonl"))
+        self.cache.max_bytes = entry_size * 2
+
+        self.write_entry("second", [page])
+        os.utime(os.path.join(self.cache_dir.name, "first.jsonl"), (0, 0))
+        os.utime(os.path.join(self.cache_dir.name, "second.jsonl"), (1, 1))
+        list(self.cache.read("first"))  # Marks "first" as recently used
+        self.write_entry("third", [page])
+
+        self.assertIsNotNone(self.cache.read("first"))
+        self.assertIsNone(self.cache.read("second"))
+        self.assertIsNotNone(self.cache.read("third"))
+
+    def test_text_preprocessor_uses_cache(self):
+        preprocessor = TextPreprocessor(lower_case=True, remove_stopwords=True, cache=self.cache)
+        first_run = preprocessor.process_pdf(self.pdf_path)
+
+        key = self.cache.make_key(self.pdf_path, preprocessor.cache_settings())
+        cached_pages = list(self.cache.read(key))
+        self.assertEqual([page["page"] for page in cached_pages], [1, 2, 3])
+        self.assertEqual(preprocessor.process_pdf(self.pdf_path), first_run)
+
+class TestPdfRasterizer(unittest.TestCase):
+    def setUp(self):
+        from PIL import Image
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pdf_path = os.path.join(self.temp_dir.name, "scanned.pdf")
+        # A two-page PDF with one embedded image per page
+        first = Image.fromarray(np.random.randint(0, 255, (80, 60, 3), dtype=np.uint8))
+        second = Image.fromarray(np.full((40, 50, 3), 200, dtype=np.uint8))
+        first.save(self.pdf_path, save_all=True, append_images=[second])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_stream_embedded_images(self):
+        rasterizer = PdfRasterizer(mode="images", buffer_size=1)
+        images = list(rasterizer.stream(self.pdf_path))
+
+        self.assertEqual([page_number for page_number, _ in images], [1, 2])
+        self.assertEqual(images[0][1].shape, (80, 60, 3))
+        self.assertEqual(images[1][1].dtype, np.uint8)
+
+        # Closing the stream early stops the background decoder
+        stream = rasterizer.stream(self.pdf_path)
+        next(stream)
+        stream.close()
+
+    def test_image_preprocessor_pdf(self):
+        preprocessor = ImagePreprocessor(target_size=(32, 16), normalize=True)
+        images, page_numbers = preprocessor.process_pdf(self.pdf_path, PdfRasterizer(mode="images"))
+
+        self.assertEqual(images.shape, (2, 16, 32, 3))
+        self.assertEqual(images.dtype, np.float32)
+        self.assertEqual(page_numbers, [1, 2])
+        np.testing.assert_allclose(images[1], 200 / 255.0, atol=0.02)
+
+    def test_render_pages(self):
+        try:
+            import fitz  # noqa: F401
+        except ImportError:
+            self.skipTest("PyMuPDF is not installed")
+
+        images = list(PdfRasterizer(dpi=72).stream(self.pdf_path))
+        self.assertEqual(len(images), 2)
+        self.assertEqual(images[0][1].ndim, 3)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            PdfRasterizer(mode="vector")
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,19 @@
 import os
+import pickle
+import tempfile
 import joblib
+import numpy as np
 import unittest
-from unittest.mock import MagicMock
-from training.model_trainer import ModelTrainer, train_all_models
-from training.hyperparameter_tuning import HyperparameterTuner, perform_hyperparameter_tuning
+from unittest.mock import MagicMock, patch
+from training.model_trainer import ModelTrainer, TrainingScheduler, train_all_models
+from training.hyperparameter_tuning import HyperparameterTuner, perform_hyperparameter_tuning, tune_models_in_shared_pool
+from training.training_pipeline import evaluate_models, load_config, preprocess_data, train_models
+from evaluation.dynamic_weight_adjuster import DynamicWeightAdjuster
+from training.dataset import PreprocessedDataset
+from training.shard_store import ShardStore
+from training.tuning_store import TuningResultStore
+from models.supervised.random_forest_model import RandomForestModel
+from models.supervised.svm_model import SVMModel
 
 from unittest import TestCase
 from training.model_trainer import ModelTrainer
@@ -119,5 +129,378 @@ def test_hyperparameter_tuning(self):
             best_model = joblib.load(model_path)
             self.assertIsInstance(best_model, MockModel)
 
+class MockBrokenModel:
+    def train(self, training_data, labels):
+        raise ValueError("Training failed")
+
+class TestTrainingScheduler(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.temp_dir.name, "data")
+        self.output_dir = os.path.join(self.temp_dir.name, "checkpoints")
+        os.makedirs(self.data_dir)
+        joblib.dump([[i, i % 3, i % 5] for i in range(30)], os.path.join(self.data_dir, "data.pkl"))
+        self.labels = [i % 2 for i in range(30)]
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parallel_training_with_cpu_budgets(self):
+        scheduler = TrainingScheduler(max_cpus=2, cpu_budgets={"RandomForest": 2})
+        self.assertEqual(scheduler.budget("RandomForest"), 2)
+        self.assertEqual(scheduler.budget("SVM"), 1)
+
+        models = {"RandomForest": RandomForestModel(n_estimators=10), "SVM": SVMModel()}
+        trained, timings = scheduler.run(models, self.data_dir, self.labels, self.output_dir)
+
+        self.assertEqual(set(timings), {"RandomForest", "SVM"})
+        self.assertEqual(trained["RandomForest"].model.n_jobs, 2)
+        for model_name in models:
+            self.assertTrue(os.path.exists(os.path.join(self.output_dir, f"{model_name}_model.pkl")))
+            self.assertEqual(len(trained[model_name].predict([[1, 1, 1]])), 1)
+
+    def test_failed_model_does_not_stop_others(self):
+        models = {"Broken": MockBrokenModel(), "SVM": SVMModel()}
+        with self.assertRaises(RuntimeError):
+            train_all_models(models, self.data_dir, self.labels, self.output_dir, max_cpus=2)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "SVM_model.pkl")))
+
+    def test_train_models_from_config(self):
+        data_dir = os.path.join(self.temp_dir.name, "processed")
+        store = ShardStore(os.path.join(data_dir, "tabular"))
+        data = np.random.default_rng(0).normal(size=(40, 3))
+        store.append(data[:25], "first.csv")
+        store.append(data[25:], "second.csv")
+        store.flush()
+        labels = (data[:, 0] > 0).astype(int)
+
+        config = {"random_forest": {"n_estimators": 10, "max_depth": 3}, "svm": {"kernel": "linear", "C": 1.0}}
+        trained = train_models(data_dir, self.output_dir, config, {"max_cpus": 1}, labels)
+
+        self.assertEqual(set(trained), {"RandomForest", "SVM"})
+        self.assertEqual(trained["RandomForest"].model.max_depth, 3)
+        # Both files were trained on, with their labels
+        self.assertGreater(np.mean(trained["SVM"].predict(data) == labels), 0.9)
+
+    def test_train_models_with_shipped_config(self):
+        data_dir = os.path.join(self.temp_dir.name, "processed")
+        store = ShardStore(os.path.join(data_dir, "tabular"))
+        data = np.random.default_rng(0).normal(size=(40, 3))
+        store.append(data, "data.csv")
+        store.flush()
+        labels = (data[:, 0] > 0).astype(int)
+
+        config = load_config("config/training_config.yaml")
+        trained = train_models(data_dir, self.output_dir, config["models"], dict(config["training"], max_cpus=1), labels)
+        self.assertEqual(set(trained), {"RandomForest", "SVM", "NeuralNetwork", "KMeans", "DBSCAN"})
+
+class TestPreprocessedDataset(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        for i in range(3):
+            joblib.dump(np.full((4, 2), i, dtype=float), os.path.join(self.temp_dir.name, f"data_{i}.pkl"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_arrays_are_memory_mapped_once(self):
+        dataset = PreprocessedDataset(self.temp_dir.name)
+        self.assertEqual(len(dataset), 3)
+        for _, data in dataset:
+            self.assertIsInstance(data, np.memmap)
+        self.assertIs(dataset.items(), dataset.items())
+
+        combined = dataset.combined()
+        self.assertEqual(combined.shape, (12, 2))
+        self.assertEqual(combined[4:8].tolist(), [[1.0, 1.0]] * 4)
+
+    def test_pickling_reopens_files(self):
+        dataset = PreprocessedDataset(self.temp_dir.name)
+        dataset.items()
+        payload = pickle.dumps(dataset)
+        self.assertLess(len(payload), 1024)
+
+        restored = pickle.loads(payload)
+        self.assertIs(restored, pickle.loads(payload))
+        self.assertEqual([name for name, _ in restored], ["data_0.pkl", "data_1.pkl", "data_2.pkl"])
+
+class TestShardStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = ShardStore(self.temp_dir.name)
+        self.store.append(np.arange(6, dtype=float).reshape(3, 2), "first.csv")
+        self.store.append(np.arange(6, 10, dtype=float).reshape(2, 2), "second.csv")
+        self.store.flush()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def shard_files(self):
+        return sorted(name for name in os.listdir(self.temp_dir.name) if name.endswith(".npy"))
+
+    def test_append_and_reopen(self):
+        reopened = ShardStore(self.temp_dir.name)
+        self.assertEqual(reopened.sources(), ["first.csv", "second.csv"])
+        self.assertEqual(len(reopened), 5)
+        self.assertIsInstance(reopened.shard("second.csv"), np.memmap)
+        np.testing.assert_array_equal(reopened.to_matrix(), np.arange(10, dtype=float).reshape(5, 2))
+        # Both sources share one shard
+        self.assertEqual(self.shard_files(), ["shard-00000.npy"])
+
+    def test_shard_count_bounded_by_size(self):
+        root = os.path.join(self.temp_dir.name, "images")
+        store = ShardStore(root, max_shard_rows=10)
+        written = []
+        for index in range(25):
+            written += store.append(np.full((1, 2), index, dtype=float), f"image_{index:02d}.png")
+        self.assertEqual(len(written), 20)
+        self.assertEqual(len(store.flush()), 5)
+        self.assertEqual(sorted(os.listdir(root)), ["index.json", "shard-00000.npy", "shard-00001.npy", "shard-00002.npy"])
+        np.testing.assert_array_equal(ShardStore(root).take([0, 24]), [[0, 0], [24, 24]])
+
+    def test_random_access(self):
+        np.testing.assert_array_equal(self.store.take([4, 0, 3]), [[8, 9], [0, 1], [6, 7]])
+        np.testing.assert_array_equal(self.store.take(-1), [8, 9])
+        with self.assertRaises(IndexError):
+            self.store.take(5)
+
+    def test_replacing_sources(self):
+        self.store.append(np.zeros((1, 2)), "first.csv")
+        self.store.flush()
+        self.assertEqual(len(ShardStore(self.temp_dir.name)), 3)
+
+        # The first shard is deleted once none of its rows are referenced
+        self.store.append(np.ones((2, 2)), "second.csv")
+        self.store.flush()
+        self.assertEqual(self.shard_files(), ["shard-00001.npy", "shard-00002.npy"])
+        with self.assertRaises(ValueError):
+            self.store.append(np.zeros((1, 3)), "third.csv")
+            self.store.flush()
+            self.store.to_matrix()
+
+class TestHalvingSearch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.data = rng.normal(size=(200, 4))
+        self.labels = (self.data[:, 0] + self.data[:, 1] > 0).astype(int)
+
+    def test_halving_over_samples(self):
+        tuner = HyperparameterTuner(
+            RandomForestModel(n_estimators=10), {"max_depth": [1, 3, None], "min_samples_leaf": [1, 5]},
+            search_type="halving_grid", cv=3,
+        )
+        best_model = tuner.tune(self.data, self.labels)
+        self.assertTrue(hasattr(best_model, "fit"))
+        self.assertGreater(best_model.score(self.data, self.labels), 0.8)
+
+    def test_halving_over_model_parameter(self):
+        tuner = HyperparameterTuner(
+            RandomForestModel(n_estimators=27), {"max_depth": [1, 2, 3, None]},
+            search_type="halving_random", n_iter=4, cv=3, resource="n_estimators", min_resources=3,
+        )
+        best_model = tuner.tune(self.data, self.labels)
+        self.assertLessEqual(best_model.n_estimators, 27)
+
+    def test_shared_pool_matches_grid_search(self):
+        from sklearn.model_selection import GridSearchCV
+
+        models = {"RandomForest": RandomForestModel(n_estimators=10), "SVM": SVMModel()}
+        param_grids = {"RandomForest": {"max_depth": [1, 3]}, "SVM": {"C": [0.01, 1.0]}}
+        best_models, results = tune_models_in_shared_pool(models, param_grids, self.data, self.labels, cv=3, n_jobs=2)
+
+        for model_name, model in models.items():
+            search = GridSearchCV(model.model, param_grids[model_name], cv=3).fit(self.data, self.labels)
+            np.testing.assert_allclose(results[model_name]["mean_score"], search.cv_results_["mean_test_score"])
+            self.assertEqual(best_models[model_name].get_params(), search.best_estimator_.get_params())
+
+    def test_invalid_search_type(self):
+        with self.assertRaises(ValueError):
+            HyperparameterTuner(RandomForestModel(), {}, search_type="bayesian")
+
+class TestTuningResultStore(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.data = rng.normal(size=(120, 4))
+        self.labels = (self.data[:, 0] > 0).astype(int)
+        self.store = TuningResultStore(":memory:")
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_resume_skips_stored_folds(self):
+        param_grids = {"SVM": {"C": [0.1, 1.0]}}
+        _, first = tune_models_in_shared_pool({"SVM": SVMModel()}, param_grids, self.data, self.labels,
+                                              cv=3, n_jobs=1, store=self.store)
+        self.assertEqual(len(self.store.completed("SVM", self.store.results("SVM")[0]["context"])), 6)
+
+        with patch("training.hyperparameter_tuning._evaluate_candidate") as evaluate:
+            _, second = tune_models_in_shared_pool({"SVM": SVMModel()}, param_grids, self.data, self.labels,
+                                                   cv=3, n_jobs=1, store=self.store)
+        evaluate.assert_not_called()
+        self.assertEqual(first["SVM"]["mean_score"], second["SVM"]["mean_score"])
+
+    def test_resume_in_new_process_with_string_labels(self):
+        import subprocess
+        import sys
+
+        script = (
+            "import sys, numpy as np\n"
+            "from unittest.mock import patch\n"
+            "from models.supervised.svm_model import SVMModel\n"
+            "from training.hyperparameter_tuning import tune_models_in_shared_pool\n"
+            "from training.tuning_store import TuningResultStore\n"
+            "data = np.random.default_rng(0).normal(size=(120, 4))\n"
+            "labels = np.where(data[:, 0] > 0, 'pass', 'fail').astype(object)\n"
+            "store = TuningResultStore(sys.argv[1])\n"
+            "run = lambda: tune_models_in_shared_pool({'SVM': SVMModel()}, {'SVM': {'C': [0.1, 1.0]}}, data, labels,\n"
+            "                                         cv=3, n_jobs=1, store=store)\n"
+            "if sys.argv[2] == 'resume':\n"
+            "    with patch('training.hyperparameter_tuning._evaluate_candidate', side_effect=AssertionError):\n"
+            "        run()\n"
+            "else:\n"
+            "    run()\n"
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "tuning.sqlite")
+            for mode in ("fresh", "resume"):
+                subprocess.run([sys.executable, "-c", script, path, mode], check=True, capture_output=True)
+            store = TuningResultStore(path)
+            self.assertEqual(len(store.results("SVM")), 2)
+            store.close()
+
+    def test_search_context_distinguishes_object_types(self):
+        from training.hyperparameter_tuning import _search_context
+
+        folds = [(np.arange(2), np.arange(2))]
+        contexts = {
+            _search_context(self.data[:2], np.array(labels, dtype=object), folds, None)
+            for labels in ([1, "1"], ["1", "1"], [None, "None"], ["None", "None"])
+        }
+        self.assertEqual(len(contexts), 4)
+        self.assertEqual(
+            _search_context(self.data[:2], np.array([1, "1"], dtype=object), folds, None),
+            _search_context(self.data[:2], np.array([1, "1"], dtype=object), folds, None),
+        )
+
+    def test_fastest_within_tolerance(self):
+        for fold in range(2):
+            self.store.record("A", {"depth": 8}, fold, 0.90, fit_time=2.0, score_time=0.5)
+            self.store.record("A", {"depth": 2}, fold, 0.895, fit_time=1.0, score_time=0.1)
+            self.store.record("A", {"depth": 1}, fold, 0.70, fit_time=0.5, score_time=0.01)
+        self.store.record("A", {"depth": 4}, 0, 0.99, fit_time=0.1, score_time=0.001)  # Incomplete candidate
+
+        self.assertEqual(self.store.results("A")[0]["params"], {"depth": 4})
+        self.assertEqual(self.store.fastest_within(0.01, model="A")["params"], {"depth": 2})
+        self.assertEqual(self.store.fastest_within(0.0, model="A")["params"], {"depth": 8})
+        self.assertIsNone(self.store.fastest_within(model="B"))
+
+class TestPreprocessData(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.raw_dir = os.path.join(self.temp_dir.name, "raw")
+        self.output_dir = os.path.join(self.temp_dir.name, "processed")
+        os.makedirs(self.raw_dir)
+        os.makedirs(self.output_dir)
+        for i in range(3):
+            self._write_csv(f"data_{i}.csv", i)
+        self.config = {
+            "num_workers": 2,
+            "text": {"lower_case": True, "remove_stopwords": True},
+            "image": {"resize": [224, 224], "normalize": True},
+            "tabular": {"scale": True, "impute_missing": True},
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_csv(self, file_name, offset):
+        with open(os.path.join(self.raw_dir, file_name), "w") as file:
+            file.write("a,b\n" + "".join(f"{row + offset},{row * 2}\n" for row in range(10)))
+
+    def test_parallel_preprocessing(self):
+        summary = preprocess_data(self.raw_dir, self.output_dir, self.config)
+        self.assertEqual(summary, {"processed": 3, "skipped": 0, "failed": 0})
+        store = ShardStore(os.path.join(self.output_dir, "tabular"))
+        self.assertEqual(store.sources(), ["data_0.csv", "data_1.csv", "data_2.csv"])
+        self.assertEqual(len({store.location(source) for source in store.sources()}), 1)
+        self.assertEqual(PreprocessedDataset(self.output_dir).combined().shape, (30, 2))
+        self.assertTrue(os.path.exists(self.output_dir + "_manifest.json"))
+
+    def test_rerun_skips_processed_files(self):
+        preprocess_data(self.raw_dir, self.output_dir, self.config)
+        self._write_csv("data_1.csv", 100)
+        with open(os.path.join(self.raw_dir, "broken.csv"), "w"):
+            pass
+
+        summary = preprocess_data(self.raw_dir, self.output_dir, dict(self.config, num_workers=1))
+        self.assertEqual(summary, {"processed": 1, "skipped": 2, "failed": 1})
+
+        # Failed files are retried on the next run
+        summary = preprocess_data(self.raw_dir, self.output_dir, self.config)
+        self.assertEqual(summary, {"processed": 0, "skipped": 3, "failed": 1})
+
+    def test_row_order_independent_of_completion_order(self):
+        from training import training_pipeline
+
+        run_preprocessing = training_pipeline._run_preprocessing
+
+        def reversed_completion(jobs, config, num_workers):
+            return reversed(list(run_preprocessing(jobs, config, 1)))
+
+        with patch("training.training_pipeline._run_preprocessing", reversed_completion):
+            preprocess_data(self.raw_dir, self.output_dir, self.config)
+        store = ShardStore(os.path.join(self.output_dir, "tabular"))
+        self.assertEqual(store.sources(), ["data_0.csv", "data_1.csv", "data_2.csv"])
+
+    def test_pool_workers_extract_pdfs_in_process(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from training.training_pipeline import _run_preprocessing
+
+        configs = []
+        config = dict(self.config, text={"lower_case": True, "remove_stopwords": True, "num_workers": 4})
+        with patch("training.training_pipeline.ProcessPoolExecutor", ThreadPoolExecutor), \
+                patch("training.training_pipeline.preprocess_file", lambda *job: configs.append(job[-1])):
+            list(_run_preprocessing([("a.pdf", self.output_dir)], config, num_workers=2))
+        self.assertEqual(configs[0]["text"]["num_workers"], 1)
+        self.assertEqual(config["text"]["num_workers"], 4)
+
+class TestEvaluateModels(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.temp_dir.name, "processed")
+        self.model_dir = os.path.join(self.temp_dir.name, "checkpoints")
+        self.snapshot_path = os.path.join(self.temp_dir.name, "model_weights.json")
+        os.makedirs(self.model_dir)
+        rng = np.random.default_rng(0)
+        self.data = rng.normal(size=(60, 3))
+        self.labels = (self.data[:, 0] > 0).astype(int)
+        store = ShardStore(os.path.join(self.data_dir, "tabular"))
+        store.append(self.data, "data.csv")
+        store.flush()
+
+        model = RandomForestModel(n_estimators=10)
+        model.train(self.data, self.labels)
+        joblib.dump(model, os.path.join(self.model_dir, "RandomForest_model.pkl"))
+        joblib.dump(MockModel(), os.path.join(self.model_dir, "Broken_model.pkl"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_evaluation_writes_weights_snapshot(self):
+        config = {"weight_adjuster": {"snapshot_path": self.snapshot_path}}
+        scores = evaluate_models(self.model_dir, self.data_dir, config, self.labels)
+
+        self.assertEqual(list(scores), ["RandomForest"])
+        self.assertGreater(scores["RandomForest"], 0.9)
+        adjuster = DynamicWeightAdjuster.load(self.snapshot_path)
+        self.assertEqual(adjuster.updates, 1)
+        self.assertAlmostEqual(adjuster.get_weight("RandomForest"), 0.99 + 0.1 * scores["RandomForest"])
+
+    def test_evaluation_without_labels(self):
+        config = {"weight_adjuster": {"snapshot_path": self.snapshot_path}}
+        self.assertEqual(evaluate_models(self.model_dir, self.data_dir, config), {})
+        self.assertFalse(os.path.exists(self.snapshot_path))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 import os
 import shutil
-from utils import setup_logger, create_directory, save_file, load_file, delete_directory
+from utils import setup_logger, create_directory, save_file, load_file, atomic_write, delete_directory
 from utils.logger import setup_logger, close_logger
 
 class TestLogger(unittest.TestCase):
@@ -52,6 +52,20 @@ class TestFileManager(unittest.TestCase):
         content = load_file(self.test_file)
         self.assertEqual(content, self.test_content, "Loaded content does not match saved content.")
 
+    def test_atomic_write(self):
+        atomic_write_path = os.path.join(self.test_dir, "nested", "example.txt")
+        with atomic_write(atomic_write_path, "wb") as file:
+            file.write(self.test_content)
+        self.assertEqual(load_file(atomic_write_path), self.test_content)
+
+        # A failed write leaves the previous content and no temporary file behind
+        with self.assertRaises(RuntimeError):
+            with atomic_write(atomic_write_path) as file:
+                file.write("partial")
+                raise RuntimeError("interrupted")
+        self.assertEqual(load_file(atomic_write_path), self.test_content)
+        self.assertEqual(os.listdir(os.path.dirname(atomic_write_path)), ["example.txt"])
+
     def test_delete_directory(self):
         create_directory(self.test_dir)
         delete_directory(self.test_dir)
@@ -0,0 +1,90 @@
+import os
+import joblib
+import numpy as np
+from training.shard_store import ShardStore
+
+# Datasets opened in the current process, keyed by (data_dir, mmap_mode)
+_open_datasets = {}
+
+def open_dataset(data_dir, mmap_mode="r"):
+    """
+    Returns the dataset for a directory, loading it at most once per process.
+    :param data_dir: Directory containing preprocessed data.
+    :param mmap_mode: Memory-mapping mode passed to joblib.load (None reads arrays into memory).
+    :return: PreprocessedDataset.
+    """
+    key = (os.path.abspath(data_dir), mmap_mode)
+    if key not in _open_datasets:
+        _open_datasets[key] = PreprocessedDataset(data_dir, mmap_mode)
+    return _open_datasets[key]
+
+class PreprocessedDataset:
+    def __init__(self, data_dir, mmap_mode="r"):
+        """
+        Preprocessed training data shared by every model.
+        Each file is read once; NumPy arrays saved uncompressed and the shards of ShardStore subdirectories
+        are memory-mapped instead of copied, so all models (and worker processes) read the same pages.
+        Every shard is mapped once, however many sources it holds.
+        :param data_dir: Directory containing preprocessed data.
+        :param mmap_mode: Memory-mapping mode passed to joblib.load (None reads arrays into memory).
+        """
+        self.data_dir = data_dir
+        self.mmap_mode = mmap_mode
+        self._items = None
+        self._stores = None
+        self._combined = None
+
+    def __reduce__(self):
+        # Workers reopen the files instead of receiving pickled copies of the arrays
+        return open_dataset, (self.data_dir, self.mmap_mode)
+
+    def items(self):
+        """
+        Loads the data on first use.
+        :return: List of (source file name, data) tuples, without empty files. Shard stores contribute
+            one item per source in index order, each a view into its shard.
+        """
+        if self._items is None:
+            items = []
+            stores = []
+            for file_name in sorted(os.listdir(self.data_dir)):
+                path = os.path.join(self.data_dir, file_name)
+                if os.path.isdir(path):
+                    if ShardStore.is_store(path):
+                        store = ShardStore(path)
+                        stores.append(store)
+                        items.extend((source, store.shard(source, self.mmap_mode)) for source in store.sources())
+                    continue
+                data = joblib.load(path, mmap_mode=self.mmap_mode)
+                if data is not None:
+                    items.append((file_name, data))
+            self._items = items
+            self._stores = stores
+        return self._items
+
+    def __iter__(self):
+        return iter(self.items())
+
+    def __len__(self):
+        return len(self.items())
+
+    def combined(self):
+        """
+        Concatenates the data of all files along the first axis, once.
+        :return: Combined array or DataFrame, or None if the directory holds no data.
+        """
+        if self._combined is None and self.items():
+            parts = [data for _, data in self.items()]
+            if len(self._stores) == 1 and len(self._stores[0].sources()) == len(parts):
+                self._combined = self._stores[0].to_matrix()
+            elif len(parts) == 1:
+                self._combined = parts[0]
+            elif all(isinstance(part, np.ndarray) for part in parts):
+                self._combined = np.concatenate(parts)
+            elif all(hasattr(part, "iloc") for part in parts):
+                import pandas as pd
+
+                self._combined = pd.concat(parts, ignore_index=True)
+            else:
+                self._combined = [row for part in parts for row in part]
+        return self._combined
@@ -1,24 +1,252 @@
+import hashlib
 import os
+import pickle
+import tempfile
+import time
 import joblib
 import logging
-from sklearn.model_selection import GridSearchCV, RandomizedSearchCV
+import numpy as np
+from training.dataset import PreprocessedDataset
+from training.tuning_store import TuningResultStore
 from utils.logger import setup_logger
 
 logger = setup_logger('hyperparameter_tuning', 'training/logs/hyperparameter_tuning.log')
 
+SEARCH_TYPES = ("grid", "random", "halving_grid", "halving_random")
+
+# Memory-mapped arrays opened by the current worker process, for the cache directory of the running search
+_worker_arrays = {"cache_dir": None, "arrays": {}}
+
+def _unwrap_estimator(model):
+    # Model wrappers keep the scikit-learn estimator in their model attribute
+    if not hasattr(model, "get_params") and hasattr(getattr(model, "model", None), "get_params"):
+        return model.model
+    return model
+
+def _load_array(cache_dir, file_name):
+    """
+    Opens a cached array read-only and memory-mapped, once per worker process.
+    :param cache_dir: Directory of the running search's array cache.
+    :param file_name: Name of the .npy file in the cache.
+    :return: Memory-mapped array.
+    """
+    if _worker_arrays["cache_dir"] != cache_dir:
+        _worker_arrays["cache_dir"] = cache_dir
+        _worker_arrays["arrays"] = {}
+    arrays = _worker_arrays["arrays"]
+    if file_name not in arrays:
+        arrays[file_name] = np.load(os.path.join(cache_dir, file_name), mmap_mode="r")
+    return arrays[file_name]
+
+def _evaluate_candidate(estimator, params, cache_dir, fold, scoring):
+    """
+    Fits one candidate on one cached fold; runs inside the shared worker pool.
+    :param estimator: Unfitted scikit-learn estimator.
+    :param params: Candidate parameters.
+    :param cache_dir: Directory of the running search's array cache.
+    :param fold: Index of the fold.
+    :param scoring: Scoring passed to sklearn.metrics.check_scoring.
+    :return: Tuple of (test score, fit time, score time) with times in seconds.
+    """
+    from sklearn.base import clone
+    from sklearn.metrics import check_scoring
+
+    start_time = time.perf_counter()
+    candidate = clone(estimator).set_params(**params)
+    candidate.fit(_load_array(cache_dir, f"fold{fold}_X_train.npy"), _load_array(cache_dir, f"fold{fold}_y_train.npy"))
+    fit_time = time.perf_counter() - start_time
+    scorer = check_scoring(candidate, scoring=scoring)
+    start_time = time.perf_counter()
+    score = scorer(candidate, _load_array(cache_dir, f"fold{fold}_X_test.npy"), _load_array(cache_dir, f"fold{fold}_y_test.npy"))
+    return score, fit_time, time.perf_counter() - start_time
+
+def _search_context(training_data, labels, folds, scoring):
+    """
+    Fingerprints the data, folds and scoring of a search, so stored results are only reused for the same setup.
+    """
+    digest = hashlib.sha256()
+    for array in [training_data, labels] + [indices for fold in folds for indices in fold]:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        if array.dtype == object:
+            # The buffer of an object array holds pointers, which differ between processes; the pickled
+            # elements keep their types, so 1 and "1" or None and "None" hash differently
+            digest.update(pickle.dumps(array.tolist(), protocol=4))
+        else:
+            digest.update(memoryview(array).cast("B"))
+    digest.update(repr(scoring).encode())
+    return digest.hexdigest()
+
+def _refit_best(estimator, params, cache_dir):
+    from sklearn.base import clone
+
+    return clone(estimator).set_params(**params).fit(_load_array(cache_dir, "X.npy"), _load_array(cache_dir, "y.npy"))
+
+def tune_models_in_shared_pool(models, param_grids, training_data, labels, search_type="grid", n_iter=10, cv=5,
+                               n_jobs=-1, scoring=None, random_state=None, store=None):
+    """
+    Tunes several models at once, running the candidates of all models in one worker pool.
+    The training matrix and every fold's train/test split are written once to memory-mapped .npy files,
+    so workers open shared read-only pages instead of receiving pickled copies for every candidate,
+    and the same folds are reused by all candidates of all models.
+    :param models: Dictionary of model names and instances.
+    :param param_grids: Dictionary of parameter grids for each model.
+    :param training_data: Training matrix.
+    :param labels: Target labels.
+    :param search_type: 'grid' for every combination or 'random' for n_iter sampled candidates per model.
+    :param n_iter: Number of candidates sampled per model by random search.
+    :param cv: Number of cross-validation folds or a scikit-learn splitter.
+    :param n_jobs: Number of worker processes (-1 for all cores).
+    :param scoring: Optional scoring name or callable; defaults to each estimator's score method.
+    :param random_state: Seed for random search; fix it to resume a random search.
+    :param store: Optional TuningResultStore. Every fold result is committed as soon as it arrives, and
+        folds already stored for the same data, folds and scoring are not evaluated again.
+    :return: Tuple of (best refitted estimator per model, results per model with "params", "mean_score",
+        "std_score", "mean_fit_time" and "mean_score_time" lists in candidate order).
+    """
+    from joblib import Parallel, delayed
+    from sklearn.base import is_classifier
+    from sklearn.model_selection import ParameterGrid, ParameterSampler, check_cv
+
+    if search_type not in ("grid", "random"):
+        raise ValueError("Invalid search_type for the shared pool. Choose 'grid' or 'random'.")
+    estimators = {name: _unwrap_estimator(model) for name, model in models.items() if name in param_grids}
+    candidates = {
+        name: list(ParameterGrid(param_grids[name])) if search_type == "grid"
+        else list(ParameterSampler(param_grids[name], n_iter, random_state=random_state))
+        for name in estimators
+    }
+    training_data = np.asarray(training_data)
+    labels = np.asarray(labels)
+    if labels.dtype == object:
+        # Object arrays cannot be memory-mapped; string or numeric labels get a native dtype instead.
+        # Mixed types are rejected, as np.asarray would silently turn 1 and "1" into the same label.
+        values = labels.tolist()
+        if len({type(value) for value in values}) > 1:
+            raise ValueError("Labels of mixed types are not supported by the shared pool.")
+        labels = np.asarray(values)
+        if labels.dtype == object:
+            raise ValueError("Labels of mixed types are not supported by the shared pool.")
+    classifier = any(is_classifier(estimator) for estimator in estimators.values())
+    folds = list(check_cv(cv, labels, classifier=classifier).split(training_data, labels))
+
+    with tempfile.TemporaryDirectory(prefix="tuning_") as cache_dir:
+        # Fold data is sliced once here instead of once per candidate in every worker
+        np.save(os.path.join(cache_dir, "X.npy"), training_data)
+        np.save(os.path.join(cache_dir, "y.npy"), labels)
+        for fold, (train, test) in enumerate(folds):
+            for split, indices in (("train", train), ("test", test)):
+                np.save(os.path.join(cache_dir, f"fold{fold}_X_{split}.npy"), training_data[indices])
+                np.save(os.path.join(cache_dir, f"fold{fold}_y_{split}.npy"), labels[indices])
+
+        outcomes = {name: np.zeros((len(candidates[name]), len(folds), 3)) for name in estimators}
+        context = _search_context(training_data, labels, folds, scoring) if store is not None else ""
+        tasks = []
+        for name in estimators:
+            stored = store.completed(name, context) if store is not None else {}
+            for index, params in enumerate(candidates[name]):
+                for fold in range(len(folds)):
+                    key = (TuningResultStore.params_key(params), fold)
+                    if key in stored:
+                        outcomes[name][index, fold] = stored[key]
+                    else:
+                        tasks.append((name, index, fold))
+        logger.info(f"Evaluating {len(tasks)} fits for {len(estimators)} models in a shared pool...")
+
+        with Parallel(n_jobs=n_jobs, return_as="generator") as parallel:
+            evaluations = parallel(
+                delayed(_evaluate_candidate)(estimators[name], candidates[name][index], cache_dir, fold, scoring)
+                for name, index, fold in tasks
+            )
+            # Drain the generator completely, so the pool is free again for the refits below
+            for task, outcome in enumerate(evaluations):
+                name, index, fold = tasks[task]
+                outcomes[name][index, fold] = outcome
+                if store is not None:
+                    store.record(name, candidates[name][index], fold, *outcome, context=context)
+
+            scores = {name: outcomes[name][:, :, 0] for name in estimators}
+
+            results = {}
+            best_params = {}
+            for name in estimators:
+                mean_scores = scores[name].mean(axis=1)
+                best_params[name] = candidates[name][int(np.argmax(mean_scores))]
+                results[name] = {
+                    "params": candidates[name],
+                    "mean_score": mean_scores.tolist(),
+                    "std_score": scores[name].std(axis=1).tolist(),
+                    "mean_fit_time": outcomes[name][:, :, 1].mean(axis=1).tolist(),
+                    "mean_score_time": outcomes[name][:, :, 2].mean(axis=1).tolist(),
+                }
+                logger.info(f"{name}: best parameters {best_params[name]}, score {mean_scores.max():.4f}")
+
+            refitted = list(
+                parallel(delayed(_refit_best)(estimators[name], best_params[name], cache_dir) for name in estimators)
+            )
+    return dict(zip(estimators, refitted)), results
+
 class HyperparameterTuner:
-    def __init__(self, model, param_grid, search_type="grid", n_iter=10):
+    def __init__(self, model, param_grid, search_type="grid", n_iter=10, cv=5, resource="n_samples",
+                 factor=3, min_resources=None, max_resources="auto", random_state=None, store=None, name=None):
         """
         Initializes the hyperparameter tuner.
         :param model: ML model instance.
         :param param_grid: Dictionary of parameters to tune.
-        :param search_type: Type of search ('grid' or 'random').
-        :param n_iter: Number of iterations for random search.
+        :param search_type: Type of search ('grid', 'random', 'halving_grid' or 'halving_random').
+            The halving searches evaluate all candidates on a small budget and only promote the best
+            1/factor of them to the next round with factor times more resources.
+        :param n_iter: Number of iterations for random search, or candidates sampled by halving random search.
+        :param cv: Number of cross-validation folds.
+        :param resource: Budget grown by the halving searches: 'n_samples' or an integer parameter of the
+            model such as 'n_estimators' or 'max_iter' (which must then not be part of param_grid).
+        :param factor: Fraction of candidates kept and growth of the budget between halving rounds.
+        :param min_resources: Budget of the first halving round ('exhaust' for grid and 'smallest' for random search if None).
+        :param max_resources: Budget of the last halving round; 'auto' uses all samples, or the model's current
+            value of resource when it is a parameter.
+        :param random_state: Seed for the random searches; fix it to resume a random search.
+        :param store: Optional TuningResultStore. Grid and random searches then run through
+            tune_models_in_shared_pool, committing each fold as it finishes and skipping stored folds on rerun;
+            halving searches store their results once the search completes.
+        :param name: Name the results are stored under, defaults to the estimator class name.
         """
+        if search_type not in SEARCH_TYPES:
+            raise ValueError(f"Invalid search_type. Choose one of: {', '.join(SEARCH_TYPES)}.")
         self.model = model
         self.param_grid = param_grid
         self.search_type = search_type
         self.n_iter = n_iter
+        self.cv = cv
+        self.resource = resource
+        self.factor = factor
+        self.min_resources = min_resources
+        self.max_resources = max_resources
+        self.random_state = random_state
+        self.store = store
+        self.name = name
+
+    def _estimator(self):
+        return _unwrap_estimator(self.model)
+
+    def _halving_search(self, estimator):
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingGridSearchCV, HalvingRandomSearchCV
+
+        max_resources = self.max_resources
+        if self.resource != "n_samples" and max_resources == "auto":
+            max_resources = estimator.get_params()[self.resource]
+        options = dict(
+            cv=self.cv, factor=self.factor, resource=self.resource, max_resources=max_resources,
+            verbose=2, n_jobs=-1,
+        )
+        if self.search_type == "halving_grid":
+            return HalvingGridSearchCV(
+                estimator, self.param_grid, min_resources=self.min_resources or "exhaust", **options
+            )
+        return HalvingRandomSearchCV(
+            estimator, self.param_grid, n_candidates=self.n_iter, min_resources=self.min_resources or "smallest",
+            random_state=self.random_state, **options,
+        )
 
     def tune(self, training_data, labels):
         """
@@ -27,33 +255,94 @@ class HyperparameterTuner:
         :param labels: Target labels for supervised learning.
         :return: Best model and parameters.
         """
+        from sklearn.model_selection import GridSearchCV, RandomizedSearchCV
+
         logger.info(f"Starting {self.search_type} search for hyperparameter tuning...")
-        
+        estimator = self._estimator()
+        name = self.name or type(estimator).__name__
+
+        if self.store is not None and self.search_type in ("grid", "random"):
+            best_models, _ = tune_models_in_shared_pool(
+                {name: estimator}, {name: self.param_grid}, training_data, labels, self.search_type, self.n_iter,
+                self.cv, random_state=self.random_state, store=self.store,
+            )
+            return best_models[name]
+
         if self.search_type == "grid":
-            search = GridSearchCV(self.model, self.param_grid, cv=5, verbose=2, n_jobs=-1)
+            search = GridSearchCV(estimator, self.param_grid, cv=self.cv, verbose=2, n_jobs=-1)
         elif self.search_type == "random":
             search = RandomizedSearchCV(
-                self.model, self.param_grid, cv=5, n_iter=self.n_iter, verbose=2, n_jobs=-1
+                estimator, self.param_grid, cv=self.cv, n_iter=self.n_iter, random_state=self.random_state,
+                verbose=2, n_jobs=-1,
             )
         else:
-            raise ValueError("Invalid search_type. Choose 'grid' or 'random'.")
-        
+            search = self._halving_search(estimator)
+
         search.fit(training_data, labels)
+        if self.search_type.startswith("halving"):
+            logger.info(
+                f"Successive halving ran {search.n_iterations_} rounds, "
+                f"candidates per round: {search.n_candidates_}, resources per round: {search.n_resources_}"
+            )
+            if self.store is not None:
+                self._store_halving_results(name, search, training_data, labels)
         logger.info(f"Best parameters found: {search.best_params_}")
         logger.info(f"Best score: {search.best_score_}")
-        
+
         return search.best_estimator_
 
-def perform_hyperparameter_tuning(models, param_grids, data_dir, labels, output_dir="training/checkpoints"):
+    def _store_halving_results(self, name, search, training_data, labels):
+        """
+        Stores the per-fold scores of a finished halving search, with the round's budget added to the parameters.
+        Only mean times are reported by scikit-learn, so they are stored for every fold.
+        """
+        context = _search_context(training_data, labels, [], f"{self.search_type}-{self.resource}")
+        results = search.cv_results_
+        for index, params in enumerate(results["params"]):
+            params = dict(params, n_resources=int(results["n_resources"][index]))
+            for fold in range(search.n_splits_):
+                self.store.record(
+                    name, params, fold, results[f"split{fold}_test_score"][index], results["mean_fit_time"][index],
+                    results["mean_score_time"][index], context=context,
+                )
+
+def perform_hyperparameter_tuning(models, param_grids, data_dir, labels, output_dir="training/checkpoints",
+                                  search_type="grid", search_options=None, shared_pool=False, store=None):
     """
     Performs hyperparameter tuning for all models.
     :param models: Dictionary of model names and instances.
     :param param_grids: Dictionary of parameter grids for each model.
-    :param data_dir: Directory containing preprocessed data.
+    :param data_dir: Directory containing preprocessed data, or a PreprocessedDataset.
     :param labels: Labels for supervised models.
     :param output_dir: Directory to save tuned models.
+    :param search_type: Search used for every model (see HyperparameterTuner).
+    :param search_options: Optional dictionary of model names to extra HyperparameterTuner arguments,
+        e.g. {"RandomForest": {"resource": "n_estimators"}}.
+    :param shared_pool: Whether to tune all models together with tune_models_in_shared_pool
+        (grid or random search only; search_options are passed to it as keyword arguments).
+    :param store: Optional TuningResultStore shared by all models; rerunning an interrupted tuning with the
+        same store only evaluates the folds that were not stored yet.
     """
     os.makedirs(output_dir, exist_ok=True)
+    # Loaded and combined once for all models instead of once per model
+    dataset = data_dir if isinstance(data_dir, PreprocessedDataset) else PreprocessedDataset(data_dir)
+
+    if shared_pool:
+        training_data = dataset.combined()
+        if training_data is None:
+            logger.warning(f"No valid training data found in {dataset.data_dir}. Skipping tuning...")
+            return
+        missing = [model_name for model_name in models if model_name not in param_grids]
+        for model_name in missing:
+            logger.warning(f"No parameter grid provided for {model_name}. Skipping...")
+        best_models, _ = tune_models_in_shared_pool(
+            models, param_grids, training_data, labels, search_type, store=store, **(search_options or {})
+        )
+        for model_name, best_model in best_models.items():
+            model_path = os.path.join(output_dir, f"{model_name}_best_model.pkl")
+            joblib.dump(best_model, model_path)
+            logger.info(f"Tuned {model_name} model saved at {model_path}.")
+        return
 
     for model_name, model_instance in models.items():
         logger.info(f"Hyperparameter tuning for {model_name}...")
@@ -62,26 +351,17 @@ def perform_hyperparameter_tuning(models, param_grids, data_dir, labels, output_
             logger.warning(f"No parameter grid provided for {model_name}. Skipping...")
             continue
 
-        tuner = HyperparameterTuner(model_instance, param_grids[model_name])
+        tuner = HyperparameterTuner(
+            model_instance, param_grids[model_name], search_type, store=store, name=model_name,
+            **(search_options or {}).get(model_name, {})
+        )
         
-        # Load training data
-        training_data = []
-        for file_name in os.listdir(data_dir):
-            file_path = os.path.join(data_dir, file_name)
-            data = joblib.load(file_path)
-            if data is not None:
-                training_data.append(data)
-
-        if not training_data:
-            logger.warning(f"No valid training data found in {data_dir}. Skipping {model_name}...")
+        training_data = dataset.combined()
+        if training_data is None:
+            logger.warning(f"No valid training data found in {dataset.data_dir}. Skipping {model_name}...")
             continue
 
-        # Combine data and labels for tuning
-        training_data_combined = training_data[0]
-        for i in range(1, len(training_data)):
-            training_data_combined = training_data_combined.append(training_data[i], ignore_index=True)
-
-        best_model = tuner.tune(training_data_combined, labels)
+        best_model = tuner.tune(training_data, labels)
         
         model_path = os.path.join(output_dir, f"{model_name}_best_model.pkl")
         joblib.dump(best_model, model_path)
@@ -0,0 +1,68 @@
+import json
+import os
+from preprocessing.pdf_cache import PdfTextCache
+from utils.file_manager import atomic_write
+
+class PreprocessingManifest:
+    def __init__(self, path, settings):
+        """
+        Records which raw files have been preprocessed, so interrupted runs can resume.
+        Entries hold the input hash and output path; a file is only skipped while its content,
+        its output and the preprocessing settings are all unchanged.
+        :param path: JSON file the manifest is stored in.
+        :param settings: JSON-serializable preprocessing settings; changing them invalidates every entry.
+        """
+        self.path = path
+        self.settings = settings
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                state = json.load(file)
+            if state.get("settings") == settings:
+                self.entries = state.get("files", {})
+
+    def is_current(self, file_path):
+        """
+        Checks whether a raw file was already processed in its current form.
+        Size and modification time are compared first so unchanged files are not re-hashed.
+        :param file_path: Path to the raw file.
+        :return: True if the recorded output is still valid.
+        """
+        entry = self.entries.get(file_path)
+        if entry is None or not os.path.exists(entry["output"]):
+            return False
+
+        stat = os.stat(file_path)
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return True
+        if entry["size"] != stat.st_size or entry["hash"] != PdfTextCache.file_hash(file_path):
+            return False
+        # Touched but unchanged; remember the new timestamp to skip hashing next time
+        entry["mtime_ns"] = stat.st_mtime_ns
+        return True
+
+    @staticmethod
+    def fingerprint(file_path):
+        """
+        Captures the identity of a raw file before it is processed.
+        :param file_path: Path to the raw file.
+        :return: Dictionary with the content hash, size and modification time.
+        """
+        stat = os.stat(file_path)
+        return {"hash": PdfTextCache.file_hash(file_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def record(self, file_path, output_path, fingerprint):
+        """
+        Records a successfully processed file.
+        :param file_path: Path to the raw file.
+        :param output_path: Path of the preprocessed output.
+        :param fingerprint: Fingerprint taken before the file was processed.
+        """
+        self.entries[file_path] = dict(fingerprint, output=output_path)
+
+    def save(self):
+        """
+        Writes the manifest to a temporary file and moves it into place, so a crash never leaves it truncated.
+        """
+        with atomic_write(self.path) as file:
+            json.dump({"settings": self.settings, "files": self.entries}, file)
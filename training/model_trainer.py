@@ -1,6 +1,10 @@
 import os
+import sys
+import time
 import joblib
 import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from training.dataset import PreprocessedDataset
 from utils.logger import setup_logger
 
 logger = setup_logger('model_trainer', 'training/logs/model_trainer.log')
@@ -33,25 +37,124 @@ class ModelTrainer:
         joblib.dump(self.model, model_path)
         logger.info(f"{self.model_name} model saved at {model_path}.")
 
-def train_all_models(models, data_dir, labels=None, output_dir="training/checkpoints"):
+# CPU cores given to models whose estimators parallelize internally; all others train single-threaded
+DEFAULT_CPU_BUDGETS = {"RandomForest": 4, "KMeans": 2, "BERT": 4, "GPT": 4}
+
+def _limit_cpus(model, cpus):
+    """
+    Caps the threads a model may use while training.
+    :param model: Model wrapper; its estimator's n_jobs is set when it has one.
+    :param cpus: Number of CPU cores available to the model.
+    :return: Context manager limiting the BLAS/OpenMP thread pools.
+    """
+    from threadpoolctl import threadpool_limits
+
+    estimator = getattr(model, "model", None)
+    if hasattr(estimator, "get_params") and "n_jobs" in estimator.get_params():
+        estimator.set_params(n_jobs=cpus)
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(cpus)
+    return threadpool_limits(limits=cpus)
+
+def _train_model_job(model_name, model, dataset, labels, output_dir, cpus):
+    """
+    Trains and saves one model; runs inside a training worker process.
+    :return: Tuple of (trained model, training time in seconds).
+    """
+    start_time = time.perf_counter()
+    trainer = ModelTrainer(model, model_name, output_dir)
+    with _limit_cpus(model, cpus):
+        # One fit on all files, so labels line up with the rows of the combined data
+        trainer.train(dataset.combined(), labels)
+    trainer.save_model()
+    return trainer.model, time.perf_counter() - start_time
+
+class TrainingScheduler:
+    def __init__(self, max_cpus=None, cpu_budgets=None):
+        """
+        Trains independent models concurrently in worker processes within a CPU budget.
+        :param max_cpus: Total CPU cores shared by all models (defaults to all cores).
+        :param cpu_budgets: Dictionary of CPU cores per model name; unlisted models get one core.
+        """
+        self.max_cpus = max_cpus or os.cpu_count() or 1
+        self.cpu_budgets = DEFAULT_CPU_BUDGETS if cpu_budgets is None else cpu_budgets
+
+    def budget(self, model_name):
+        """
+        Returns the CPU cores a model trains with, capped by the total budget.
+        :param model_name: Name of the model.
+        :return: Number of CPU cores.
+        """
+        return max(1, min(self.cpu_budgets.get(model_name, 1), self.max_cpus))
+
+    def run(self, models, data_dir, labels=None, output_dir="training/checkpoints"):
+        """
+        Trains and saves all models, starting each one as soon as enough cores are free.
+        Models with the largest budgets start first; smaller ones fill the remaining cores.
+        :param models: Dictionary of model names and instances.
+        :param data_dir: Directory containing preprocessed data, or a PreprocessedDataset.
+        :param labels: Optional labels for supervised training.
+        :param output_dir: Directory to save trained models.
+        :return: Tuple of (trained models, training seconds per model), both keyed by model name.
+        :raises RuntimeError: If any model failed; the other models are still trained and saved.
+        """
+        start_time = time.perf_counter()
+        # Loaded once and shared by all models; workers memory-map the same files
+        dataset = data_dir if isinstance(data_dir, PreprocessedDataset) else PreprocessedDataset(data_dir)
+        queue = sorted(models, key=self.budget, reverse=True)
+        trained, timings, failures = {}, {}, {}
+
+        def finish(model_name, job):
+            try:
+                trained[model_name], timings[model_name] = job()
+                logger.info(f"{model_name} trained in {timings[model_name]:.1f}s on {self.budget(model_name)} CPU(s).")
+            except Exception as e:
+                failures[model_name] = e
+                logger.error(f"Training {model_name} failed: {e}")
+
+        if self.max_cpus <= 1 or len(models) <= 1:
+            for model_name in queue:
+                args = (model_name, models[model_name], dataset, labels, output_dir, self.budget(model_name))
+                finish(model_name, lambda: _train_model_job(*args))
+        else:
+            with ProcessPoolExecutor(max_workers=min(len(models), self.max_cpus)) as executor:
+                running = {}
+                while queue or running:
+                    free_cpus = self.max_cpus - sum(self.budget(name) for name in running.values())
+                    for model_name in list(queue):
+                        if self.budget(model_name) <= free_cpus or not running:
+                            queue.remove(model_name)
+                            future = executor.submit(
+                                _train_model_job, model_name, models[model_name], dataset, labels, output_dir,
+                                self.budget(model_name),
+                            )
+                            running[future] = model_name
+                            free_cpus -= self.budget(model_name)
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(running.pop(future), future.result)
+
+        wall_time = time.perf_counter() - start_time
+        summed_time = sum(timings.values())
+        logger.info(
+            f"Trained {len(trained)} models in {wall_time:.1f}s wall clock "
+            f"({summed_time:.1f}s summed, {summed_time / max(wall_time, 1e-9):.1f}x speedup)."
+        )
+        if failures:
+            raise RuntimeError(f"Training failed for: {', '.join(failures)}")
+        return trained, timings
+
+def train_all_models(models, data_dir, labels=None, output_dir="training/checkpoints", max_cpus=None, cpu_budgets=None):
     """
-    Trains and saves all models defined in the system.
+    Trains and saves all models defined in the system, running independent models concurrently.
     :param models: Dictionary of model names and instances.
-    :param data_dir: Directory containing preprocessed data.
+    :param data_dir: Directory containing preprocessed data, or a PreprocessedDataset.
     :param labels: Optional labels for supervised training.
     :param output_dir: Directory to save trained models.
+    :param max_cpus: Total CPU cores shared by all models (defaults to all cores).
+    :param cpu_budgets: Optional dictionary of CPU cores per model name.
+    :return: Dictionary of trained models; models trained in worker processes are copies of the given instances.
     """
-    for model_name, model_instance in models.items():
-        trainer = ModelTrainer(model_instance, model_name, output_dir)
-        
-        for file_name in os.listdir(data_dir):
-            file_path = os.path.join(data_dir, file_name)
-            training_data = joblib.load(file_path)
-
-            # Labels provided for supervised models
-            if labels is not None:
-                trainer.train(training_data, labels)
-            else:
-                trainer.train(training_data)
-        
-        trainer.save_model()
+    scheduler = TrainingScheduler(max_cpus, cpu_budgets)
+    trained, _ = scheduler.run(models, data_dir, labels, output_dir)
+    return trained
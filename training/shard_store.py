@@ -0,0 +1,215 @@
+import json
+import os
+import numpy as np
+from utils.file_manager import atomic_write
+
+INDEX_FILE = "index.json"
+
+class ShardStore:
+    def __init__(self, root, max_shard_rows=None, max_shard_bytes=64 * 2**20):
+        """
+        Columnar on-disk dataset made of NumPy .npy shards plus a JSON index.
+        Rows appended from many sources (e.g. one per raw file) are buffered and written together in
+        shards of a bounded size, so the number of files, and of memory maps needed to read them back,
+        grows with the data volume rather than with the number of sources.
+        :param root: Directory holding the shards and the index.
+        :param max_shard_rows: Optional number of rows after which the buffered rows are written as a shard.
+        :param max_shard_bytes: Size in bytes after which the buffered rows are written as a shard.
+            The rows of one source always stay in a single shard, which may therefore exceed the limits.
+        """
+        self.root = root
+        self.max_shard_rows = max_shard_rows
+        self.max_shard_bytes = max_shard_bytes
+        self.shards = {}  # Shard file name -> {"rows", "shape", "dtype"}
+        self.entries = {}  # Source name -> {"shard", "start", "rows"}, in index order
+        self.next_shard = 0
+        self._buffer = []  # (source, rows) waiting to be written
+        self._buffered_rows = 0
+        self._buffered_bytes = 0
+        self._offsets = None
+        self._open_shards = {}
+        index_path = os.path.join(root, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "r") as file:
+                index = json.load(file)
+            self.shards = index["shards"]
+            self.entries = index["sources"]
+            self.next_shard = index["next_shard"]
+
+    @staticmethod
+    def is_store(path):
+        """
+        Checks whether a directory holds a shard store.
+        :param path: Directory to check.
+        :return: True if the directory has a shard index.
+        """
+        return os.path.isfile(os.path.join(path, INDEX_FILE))
+
+    def append(self, array, source):
+        """
+        Buffers the rows of one source, writing a shard once the buffer reaches the size limits.
+        Rows become visible in the store once their shard is written; call flush() to write the rest.
+        An earlier source of the same name is replaced when the new rows are written.
+        :param array: Array whose first axis indexes rows; object arrays are not supported.
+        :param source: Name of the source the rows come from (e.g. the raw file name).
+        :return: List of the sources whose rows were written to disk by this call.
+        """
+        array = np.ascontiguousarray(array)
+        if array.dtype == object:
+            raise ValueError("Object arrays cannot be stored in shards.")
+        if array.ndim == 0:
+            raise ValueError("Shards need at least one dimension.")
+
+        written = []
+        if self._buffer:
+            first = self._buffer[0][1]
+            # A shard holds a single row shape and dtype
+            if first.shape[1:] != array.shape[1:] or first.dtype != array.dtype:
+                written = self._write_buffer()
+        self._buffer.append((source, array))
+        self._buffered_rows += len(array)
+        self._buffered_bytes += array.nbytes
+        if self._buffered_bytes >= self.max_shard_bytes or (
+            self.max_shard_rows is not None and self._buffered_rows >= self.max_shard_rows
+        ):
+            written += self._write_buffer()
+        return written
+
+    def _write_buffer(self):
+        """
+        Writes the buffered rows as one new shard and points their sources at it.
+        :return: List of the sources written.
+        """
+        if not self._buffer:
+            return []
+        file_name = f"shard-{self.next_shard:05d}.npy"
+        rows = np.concatenate([array for _, array in self._buffer])
+        with atomic_write(os.path.join(self.root, file_name), "wb") as file:
+            np.save(file, rows)
+        self.next_shard += 1
+        self.shards[file_name] = {"rows": len(rows), "shape": list(rows.shape[1:]), "dtype": rows.dtype.str}
+
+        start = 0
+        for source, array in self._buffer:
+            self.entries[source] = {"shard": file_name, "start": start, "rows": len(array)}
+            start += len(array)
+        written = [source for source, _ in self._buffer]
+        self._buffer = []
+        self._buffered_rows = 0
+        self._buffered_bytes = 0
+        self._offsets = None
+        return written
+
+    def location(self, source):
+        """
+        Returns the path of the shard holding the rows of a written source.
+        :param source: Name of the source.
+        :return: Path of the shard file.
+        """
+        return os.path.join(self.root, self.entries[source]["shard"])
+
+    def sort(self):
+        """
+        Orders the sources by name, making the row order independent of the order they were appended in.
+        """
+        self.entries = dict(sorted(self.entries.items()))
+        self._offsets = None
+
+    def flush(self):
+        """
+        Writes the buffered rows, even if fewer than a full shard, and persists the index.
+        :return: List of the sources written by this call.
+        """
+        written = self._write_buffer()
+        self.save_index()
+        return written
+
+    def save_index(self):
+        """
+        Persists the index atomically, leaving buffered rows in memory, then deletes the shards
+        whose rows have all been replaced by newer ones.
+        """
+        referenced = {entry["shard"] for entry in self.entries.values()}
+        unused = [file_name for file_name in self.shards if file_name not in referenced]
+        for file_name in unused:
+            del self.shards[file_name]
+        with atomic_write(os.path.join(self.root, INDEX_FILE)) as file:
+            json.dump({"shards": self.shards, "sources": self.entries, "next_shard": self.next_shard}, file)
+        for file_name in unused:
+            self._open_shards = {key: value for key, value in self._open_shards.items() if key[0] != file_name}
+            path = os.path.join(self.root, file_name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __len__(self):
+        return sum(entry["rows"] for entry in self.entries.values())
+
+    def sources(self):
+        """
+        Lists the written sources in index order.
+        :return: List of source names.
+        """
+        return list(self.entries)
+
+    def shard(self, source, mmap_mode="r"):
+        """
+        Returns the rows of one source, as a view into its shard.
+        Every shard is opened once per store, so reading many sources needs one memory map per shard.
+        :param source: Name of the source.
+        :param mmap_mode: Memory-mapping mode passed to np.load (None reads the shard into memory).
+        :return: Array of the rows of the source.
+        """
+        entry = self.entries[source]
+        key = (entry["shard"], mmap_mode)
+        if key not in self._open_shards:
+            self._open_shards[key] = np.load(os.path.join(self.root, entry["shard"]), mmap_mode=mmap_mode)
+        return self._open_shards[key][entry["start"]:entry["start"] + entry["rows"]]
+
+    def take(self, indices):
+        """
+        Reads rows by their global position, touching only the shards that contain them.
+        :param indices: Integer or array of integer row positions.
+        :return: Row, or array of rows in the order of indices.
+        """
+        if self._offsets is None:
+            self._offsets = np.cumsum([0] + [entry["rows"] for entry in self.entries.values()])
+        scalar = np.ndim(indices) == 0
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        indices = np.where(indices < 0, indices + self._offsets[-1], indices)
+        if indices.size and (indices.min() < 0 or indices.max() >= self._offsets[-1]):
+            raise IndexError("Row index out of range.")
+
+        source_numbers = np.searchsorted(self._offsets, indices, side="right") - 1
+        sources = self.sources()
+        rows = None
+        for source_number in np.unique(source_numbers):
+            selected = np.flatnonzero(source_numbers == source_number)
+            values = self.shard(sources[source_number])[indices[selected] - self._offsets[source_number]]
+            if rows is None:
+                rows = np.empty((len(indices),) + values.shape[1:], dtype=values.dtype)
+            rows[selected] = values
+        return rows[0] if scalar else rows
+
+    def to_matrix(self, out=None):
+        """
+        Concatenates the rows of all sources, in index order, with a single preallocated copy.
+        :param out: Optional preallocated array (e.g. a np.lib.format.open_memmap) to fill.
+        :return: Array of shape (len(self), *row_shape).
+        """
+        if not self.entries:
+            raise ValueError("The shard store is empty.")
+        shards = [self.shards[entry["shard"]] for entry in self.entries.values()]
+        row_shapes = {tuple(shard["shape"]) for shard in shards}
+        if len(row_shapes) > 1:
+            raise ValueError(f"Shards have different row shapes: {sorted(row_shapes)}")
+        dtype = np.result_type(*[np.dtype(shard["dtype"]) for shard in shards])
+
+        if out is None:
+            out = np.empty((len(self),) + row_shapes.pop(), dtype=dtype)
+        elif out.shape != (len(self),) + row_shapes.pop():
+            raise ValueError("out does not match the shape of the stored rows.")
+        offset = 0
+        for source, entry in self.entries.items():
+            out[offset:offset + entry["rows"]] = self.shard(source)
+            offset += entry["rows"]
+        return out
@@ -1,98 +1,324 @@
+import itertools
 import os
+import time
 import joblib
 import logging
 import yaml
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from models.supervised.random_forest_model import RandomForestModel
 from models.supervised.svm_model import SVMModel
 from models.supervised.neural_network_model import NeuralNetworkModel
 from models.unsupervised.kmeans_model import KMeansModel
 from models.unsupervised.dbscan_model import DBSCANModel
-from models.pretrained.bert_model import BERTModel
-from models.pretrained.gpt_model import GPTModel
 from preprocessing.text_preprocessor import TextPreprocessor
+from preprocessing.pdf_cache import PdfTextCache
 from preprocessing.image_preprocessor import ImagePreprocessor
 from preprocessing.tabular_preprocessor import TabularPreprocessor
-from evaluation.performance_metrics import PerformanceMetrics
+from evaluation.performance_metrics import MetricsAccumulator
 from evaluation.dynamic_weight_adjuster import DynamicWeightAdjuster
+from training.manifest import PreprocessingManifest
+from training.model_trainer import train_all_models
+from training.dataset import PreprocessedDataset
+from training.shard_store import ShardStore
+from utils.file_manager import atomic_write
 from utils.logger import setup_logger
 
 # Setup logger
 logger = setup_logger('training_pipeline', 'training/logs/training_pipeline.log')
 
+SUPPORTED_RAW_EXTENSIONS = ('.txt', '.pdf', '.jpg', '.png', '.csv')
+
 def load_config(config_path):
     """Load configuration from YAML file."""
     with open(config_path, 'r') as file:
         config = yaml.safe_load(file)
     return config
 
+def load_labels(labels_path):
+    """
+    Load one label per row of the combined preprocessed data, from a .npy file or the first column of a CSV.
+    Returns None when no labels file is configured or it does not exist.
+    """
+    if not labels_path or not os.path.exists(labels_path):
+        return None
+    if labels_path.endswith('.npy'):
+        return np.load(labels_path, allow_pickle=False)
+    import pandas as pd
+
+    return pd.read_csv(labels_path).iloc[:, 0].to_numpy()
+
+# Preprocessors of the current worker process, built on first use
+_worker_preprocessors = {}
+
+def build_preprocessor(kind, config):
+    """Build the 'text', 'image' or 'tabular' preprocessor from the preprocessing config."""
+    if kind == 'text':
+        return TextPreprocessor(
+            lower_case=config['text']['lower_case'],
+            remove_stopwords=config['text']['remove_stopwords'],
+            num_workers=config['text'].get('num_workers', 1),
+            cache=PdfTextCache(),
+        )
+    elif kind == 'image':
+        return ImagePreprocessor(target_size=tuple(config['image']['resize']), normalize=config['image']['normalize'])
+    else:
+        return TabularPreprocessor(
+            scale_features=config['tabular']['scale'], impute_strategy="mean", chunksize=config['tabular'].get('chunksize'),
+        )
+
+def preprocess_file(file_path, preprocessed_data_dir, config):
+    """
+    Preprocess one raw file; runs inside the worker pool.
+    Numeric arrays are returned for the caller to append to the modality's ShardStore (e.g. processed/tabular/),
+    which packs the rows of many files into each shard. Anything else is saved with joblib.
+    Returns (fingerprint, output path or None, store directory or None, rows or None).
+    """
+    fingerprint = PreprocessingManifest.fingerprint(file_path)
+    if file_path.endswith(('.txt', '.pdf')):
+        kind = 'text'
+    elif file_path.endswith(('.jpg', '.png')):
+        kind = 'image'
+    else:
+        kind = 'tabular'
+    if kind not in _worker_preprocessors:
+        _worker_preprocessors[kind] = build_preprocessor(kind, config)
+    preprocessor = _worker_preprocessors[kind]
+
+    if file_path.endswith('.txt'):
+        with open(file_path, 'r') as file:
+            processed_data = preprocessor.process_text(file.read())
+    elif file_path.endswith('.pdf'):
+        processed_data = preprocessor.process_pdf(file_path)
+    else:
+        processed_data = preprocessor.process(file_path)
+
+    file_name = os.path.basename(file_path)
+    if isinstance(processed_data, np.ndarray) and processed_data.dtype != object:
+        store_dir = os.path.join(preprocessed_data_dir, kind)
+        # An image is one sample, stored as a single row
+        rows = processed_data[np.newaxis] if kind == 'image' else processed_data
+        return fingerprint, None, store_dir, rows
+
+    # Dump next to the target and rename, so an interrupted run never leaves a truncated output
+    output_path = os.path.join(preprocessed_data_dir, file_name)
+    with atomic_write(output_path, "wb") as file:
+        joblib.dump(processed_data, file)
+    return fingerprint, output_path, None, None
+
 def preprocess_data(raw_data_dir, preprocessed_data_dir, config):
-    """Preprocess raw data for training."""
+    """
+    Preprocess raw data for training.
+    Files are processed by a pool of config['num_workers'] processes. A manifest next to the output directory
+    records what has been done, so a rerun only processes new, changed or previously failed files.
+    Returns a summary with the number of processed, skipped and failed files.
+    """
     logger.info("Preprocessing data...")
-    text_processor = TextPreprocessor(config['text'])
-    image_processor = ImagePreprocessor(config['image'])
-    tabular_processor = TabularPreprocessor(config['tabular'])
-    
-    for file_name in os.listdir(raw_data_dir):
+    # The manifest lives outside the output directory, which must only contain preprocessed data
+    # Worker counts only affect speed, so changing them does not invalidate earlier outputs
+    settings = {key: value for key, value in config.items() if key not in ('num_workers', 'shard_mb')}
+    settings['text'] = {key: value for key, value in config['text'].items() if key != 'num_workers'}
+    manifest = PreprocessingManifest(f"{preprocessed_data_dir.rstrip(os.sep)}_manifest.json", settings)
+
+    pending = []
+    skipped = 0
+    for file_name in sorted(os.listdir(raw_data_dir)):
         file_path = os.path.join(raw_data_dir, file_name)
-        if file_name.endswith('.txt'):
-            processed_data = text_processor.process(file_path)
-        elif file_name.endswith(('.jpg', '.png')):
-            processed_data = image_processor.process(file_path)
-        elif file_name.endswith('.csv'):
-            processed_data = tabular_processor.process(file_path)
-        else:
+        if not file_name.endswith(SUPPORTED_RAW_EXTENSIONS):
             logger.warning(f"Unsupported file format: {file_name}")
-            continue
-        
-        output_path = os.path.join(preprocessed_data_dir, file_name)
-        joblib.dump(processed_data, output_path)
-        logger.info(f"Processed data saved to {output_path}")
+        elif manifest.is_current(file_path):
+            skipped += 1
+        else:
+            pending.append((file_path, preprocessed_data_dir))
+    logger.info(f"{len(pending)} files to preprocess, {skipped} already up to date")
+
+    num_workers = config.get('num_workers', 1)
+    file_sizes = {file_path: os.path.getsize(file_path) for file_path, _ in pending}
+    progress = _PreprocessingProgress(len(pending), sum(file_sizes.values()))
+    shard_bytes = int(config.get('shard_mb', 64) * 2**20)
+    stores = {}
+    buffered = {}  # (store directory, source) -> (raw file path, fingerprint) of rows not yet in a shard
+    failed = 0
+
+    def record_written(store_dir, sources):
+        for source in sources:
+            file_path, fingerprint = buffered.pop((store_dir, source))
+            manifest.record(file_path, stores[store_dir].location(source), fingerprint)
+
+    def save(final=False):
+        # Shard indexes first, so the manifest never lists outputs missing from an index.
+        # Checkpoints leave partly filled shards buffered; their files are recorded once written.
+        for store_dir, store in stores.items():
+            if final:
+                record_written(store_dir, store.flush())
+            # Workers finish in any order; sorting after the flush also orders the sources it just indexed
+            store.sort()
+            store.save_index()
+        manifest.save()
+
+    try:
+        for (file_path, _), result, error in _run_preprocessing(pending, config, num_workers):
+            if error is None:
+                fingerprint, output_path, store_dir, rows = result
+                if store_dir is None:
+                    manifest.record(file_path, output_path, fingerprint)
+                else:
+                    if store_dir not in stores:
+                        stores[store_dir] = ShardStore(store_dir, max_shard_bytes=shard_bytes)
+                    source = os.path.basename(file_path)
+                    buffered[(store_dir, source)] = (file_path, fingerprint)
+                    record_written(store_dir, stores[store_dir].append(rows, source))
+            else:
+                failed += 1
+                logger.error(f"Failed to preprocess {file_path}: {error}")
+            if progress.update(file_sizes[file_path]):
+                save()
+    finally:
+        save(final=True)
 
-def train_models(preprocessed_data_dir, model_dir, config):
-    """Train all models using the preprocessed data."""
+    return {"processed": len(pending) - failed, "skipped": skipped, "failed": failed}
+
+def _run_preprocessing(jobs, config, num_workers):
+    """Yield (job, result, error) for each job, keeping at most a few jobs per worker in flight."""
+    if num_workers <= 1:
+        for job in jobs:
+            try:
+                yield job, preprocess_file(*job, config), None
+            except Exception as e:
+                yield job, None, e
+        return
+
+    # Files are already spread across processes; a nested PDF page pool per worker would oversubscribe the CPUs
+    config = {**config, 'text': {**config['text'], 'num_workers': 1}}
+    jobs = iter(jobs)
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        running = {}
+        try:
+            while True:
+                for job in itertools.islice(jobs, num_workers * 4 - len(running)):
+                    running[executor.submit(preprocess_file, *job, config)] = job
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    error = future.exception()
+                    yield job, None if error else future.result(), error
+        finally:
+            for future in running:
+                future.cancel()
+
+class _PreprocessingProgress:
+    """Tracks preprocessing throughput and decides when to report it."""
+
+    def __init__(self, total_files, total_bytes, interval=10.0):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.done_files = 0
+        self.done_bytes = 0
+        self.start_time = time.monotonic()
+        self.last_report = self.start_time
+
+    def update(self, file_bytes):
+        """Count a finished file; log progress and return True at most once per interval."""
+        self.done_files += 1
+        self.done_bytes += file_bytes
+        now = time.monotonic()
+        if now - self.last_report < self.interval and self.done_files < self.total_files:
+            return False
+        self.last_report = now
+        logger.info(self.summary())
+        return True
+
+    def summary(self):
+        elapsed = max(time.monotonic() - self.start_time, 1e-9)
+        return (
+            f"Preprocessed {self.done_files}/{self.total_files} files "
+            f"({self.done_bytes / 2**20:.1f}/{self.total_bytes / 2**20:.1f} MB) in {elapsed:.1f}s: "
+            f"{self.done_files / elapsed:.1f} files/s, {self.done_bytes / 2**20 / elapsed:.1f} MB/s"
+        )
+
+# Trainable models and their section of the models config. The pipeline trains on the numeric arrays of the
+# preprocessed data, so the text models are left out: GPT's train() always raises and BERT needs raw text.
+TRAINABLE_MODELS = {
+    'RandomForest': (RandomForestModel, 'random_forest'),
+    'SVM': (SVMModel, 'svm'),
+    'NeuralNetwork': (NeuralNetworkModel, 'neural_network'),
+    'KMeans': (KMeansModel, 'kmeans'),
+    'DBSCAN': (DBSCANModel, 'dbscan'),
+}
+
+def train_models(preprocessed_data_dir, model_dir, config, training_config=None, labels=None):
+    """
+    Train the models configured in the models config using the preprocessed data, running independent
+    models concurrently. Each config section holds the keyword arguments of the model constructor.
+    Supervised models need labels, one per row of the combined preprocessed data.
+    """
     logger.info("Training models...")
+    training_config = training_config or {}
     models = {
-        'RandomForest': RandomForestModel(config['random_forest']),
-        'SVM': SVMModel(config['svm']),
-        'NeuralNetwork': NeuralNetworkModel(config['neural_network']),
-        'KMeans': KMeansModel(config['kmeans']),
-        'DBSCAN': DBSCANModel(config['dbscan']),
-        'BERT': BERTModel(config['bert']),
-        'GPT': GPTModel(config['gpt']),
+        model_name: model_class(**(config[section] or {}))
+        for model_name, (model_class, section) in TRAINABLE_MODELS.items()
+        if section in config
     }
-    
-    for model_name, model in models.items():
-        logger.info(f"Training {model_name}...")
-        for file_name in os.listdir(preprocessed_data_dir):
-            file_path = os.path.join(preprocessed_data_dir, file_name)
-            data = joblib.load(file_path)
-            model.train(data)
-        
-        model_path = os.path.join(model_dir, f"{model_name}_model.pkl")
-        joblib.dump(model, model_path)
-        logger.info(f"{model_name} model saved to {model_path}")
-
-def evaluate_models(model_dir, preprocessed_data_dir, config):
-    """Evaluate trained models and adjust weights dynamically."""
+
+    return train_all_models(
+        models,
+        PreprocessedDataset(preprocessed_data_dir),
+        labels=labels,
+        output_dir=model_dir,
+        max_cpus=training_config.get('max_cpus'),
+        cpu_budgets=training_config.get('cpu_budgets'),
+    )
+
+def evaluate_models(model_dir, preprocessed_data_dir, config, labels=None):
+    """
+    Evaluate trained models on the labelled preprocessed data and learn their voting weights.
+    Every model predicts the combined data once; the predictions of all models are fed to
+    DynamicWeightAdjuster.update_batch, which writes the weights snapshot when one is configured.
+    Returns the accuracy of each model.
+    """
     logger.info("Evaluating models...")
-    metrics = PerformanceMetrics()
-    weight_adjuster = DynamicWeightAdjuster(config['weight_adjuster'])
-    
-    for model_file in os.listdir(model_dir):
-        model_path = os.path.join(model_dir, model_file)
-        model = joblib.load(model_path)
-        performance_scores = []
-        
-        for file_name in os.listdir(preprocessed_data_dir):
-            file_path = os.path.join(preprocessed_data_dir, file_name)
-            data = joblib.load(file_path)
-            predictions, confidence = model.predict(data)
-            performance_score = metrics.evaluate(predictions, confidence)
-            performance_scores.append(performance_score)
-        
-        avg_score = sum(performance_scores) / len(performance_scores)
-        weight_adjuster.update_weight(model_file, avg_score)
-        logger.info(f"{model_file}: Average performance score = {avg_score:.2f}")
+    if labels is None:
+        logger.warning("No labels available. Skipping evaluation...")
+        return {}
+    weight_adjuster = DynamicWeightAdjuster(**config['weight_adjuster'])
+    data = PreprocessedDataset(preprocessed_data_dir).combined()
+    if data is None:
+        logger.warning(f"No preprocessed data found in {preprocessed_data_dir}. Skipping evaluation...")
+        return {}
+    labels = np.asarray(labels)
+    metrics = MetricsAccumulator()
+
+    predictions = {}
+    for model_file in sorted(os.listdir(model_dir)):
+        if not model_file.endswith("_model.pkl"):
+            continue
+        # Weights are keyed by the registry name the inference pipeline looks up
+        model_name = model_file[:-len("_model.pkl")]
+        try:
+            model = joblib.load(os.path.join(model_dir, model_file))
+            model_predictions = np.asarray(model.predict(data)).ravel()
+        except Exception as e:
+            logger.error(f"Could not evaluate {model_file}: {e}")
+            continue
+        if model_predictions.shape != labels.shape:
+            logger.error(f"{model_file} made {len(model_predictions)} predictions for {len(labels)} labels. Skipping...")
+            continue
+        predictions[model_name] = model_predictions
+        metrics.update(labels, model_predictions, model=model_name)
+
+    for model_name, performance in metrics.per_model().items():
+        logger.info(f"{model_name}: " + ", ".join(f"{metric} = {value:.2f}" for metric, value in performance.items()))
+    if not predictions:
+        logger.warning("No model could be evaluated. Weights are left unchanged.")
+        return {}
+
+    scores = weight_adjuster.update_batch(predictions, labels)
+    if weight_adjuster.snapshot_path:
+        logger.info(f"Model weights saved to {weight_adjuster.snapshot_path}")
+    return scores
 
 def main():
     """Main function to execute the training pipeline."""
@@ -107,8 +333,9 @@ def main():
     os.makedirs(model_dir, exist_ok=True)
     
     preprocess_data(raw_data_dir, preprocessed_data_dir, config['preprocessing'])
-    train_models(preprocessed_data_dir, model_dir, config['models'])
-    evaluate_models(model_dir, preprocessed_data_dir, config['evaluation'])
+    labels = load_labels((config.get('training') or {}).get('labels_path'))
+    train_models(preprocessed_data_dir, model_dir, config['models'], config.get('training'), labels)
+    evaluate_models(model_dir, preprocessed_data_dir, config['evaluation'], labels)
 
 if __name__ == '__main__':
     main()
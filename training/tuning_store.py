@@ -0,0 +1,127 @@
+import json
+import sqlite3
+import threading
+import time
+
+class TuningResultStore:
+    def __init__(self, path="training/tuning_results.sqlite"):
+        """
+        Append-only SQLite store of hyperparameter search results, one row per evaluated fold.
+        Rows are committed as they arrive, so an interrupted search can resume from what was stored.
+        :param path: SQLite database file (":memory:" for a throwaway store).
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                model TEXT NOT NULL,
+                params TEXT NOT NULL,
+                fold INTEGER NOT NULL,
+                context TEXT NOT NULL,
+                score REAL NOT NULL,
+                fit_time REAL NOT NULL,
+                score_time REAL NOT NULL,
+                recorded_at REAL NOT NULL,
+                PRIMARY KEY (model, params, fold, context)
+            )
+            """
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def params_key(params):
+        """
+        Serializes candidate parameters canonically, so equal parameters always give the same key.
+        :param params: Dictionary of parameters.
+        :return: JSON string with sorted keys.
+        """
+        return json.dumps(params, sort_keys=True, default=str)
+
+    def record(self, model, params, fold, score, fit_time, score_time=0.0, context=""):
+        """
+        Stores the result of one fit; results already stored are kept unchanged.
+        :param model: Name of the model.
+        :param params: Dictionary of candidate parameters.
+        :param fold: Index of the cross-validation fold.
+        :param score: Test score of the fold.
+        :param fit_time: Fit time in seconds.
+        :param score_time: Time in seconds spent predicting and scoring the test fold.
+        :param context: Identifies the data and folds the result belongs to; results are only reused within a context.
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    model, self.params_key(params), int(fold), context, float(score), float(fit_time),
+                    float(score_time), time.time(),
+                ),
+            )
+            self._connection.commit()
+
+    def completed(self, model, context=""):
+        """
+        Looks up the folds already evaluated for a model.
+        :param model: Name of the model.
+        :param context: Context the results belong to.
+        :return: Dictionary mapping (params key, fold) to (score, fit time, score time).
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT params, fold, score, fit_time, score_time FROM results WHERE model = ? AND context = ?",
+                (model, context),
+            ).fetchall()
+        return {(row[0], row[1]): tuple(row[2:]) for row in rows}
+
+    def results(self, model=None, context=None):
+        """
+        Summarizes the stored results per candidate.
+        :param model: Optional name of the model to restrict to.
+        :param context: Optional context to restrict to.
+        :return: List of dictionaries with "model", "params", "context", "mean_score", "mean_fit_time",
+            "mean_score_time" and "n_folds", best score first.
+        """
+        query = (
+            "SELECT model, params, context, AVG(score), AVG(fit_time), AVG(score_time), COUNT(*) FROM results"
+            " WHERE (? IS NULL OR model = ?) AND (? IS NULL OR context = ?)"
+            " GROUP BY model, params, context ORDER BY AVG(score) DESC"
+        )
+        with self._lock:
+            rows = self._connection.execute(query, (model, model, context, context)).fetchall()
+        return [
+            {
+                "model": row[0], "params": json.loads(row[1]), "context": row[2],
+                "mean_score": row[3], "mean_fit_time": row[4], "mean_score_time": row[5], "n_folds": row[6],
+            }
+            for row in rows
+        ]
+
+    def fastest_within(self, tolerance=0.01, model=None, context=None, by="score_time"):
+        """
+        Finds the fastest candidate whose score is within a fraction of the best score.
+        Only candidates evaluated on as many folds as the most complete one are considered.
+        :param tolerance: Allowed relative drop from the best mean score (0.01 = within 1%).
+        :param model: Optional name of the model to restrict to; otherwise all models compete.
+        :param context: Optional context to restrict to.
+        :param by: "score_time" to rank by prediction latency on the test folds, or "fit_time" by training time.
+        :return: Result dictionary as returned by results(), or None if nothing is stored.
+        """
+        if by not in ("score_time", "fit_time"):
+            raise ValueError("Invalid by. Choose 'score_time' or 'fit_time'.")
+        results = self.results(model, context)
+        if not results:
+            return None
+        n_folds = max(result["n_folds"] for result in results)
+        complete = [result for result in results if result["n_folds"] == n_folds]
+        best_score = max(result["mean_score"] for result in complete)
+        threshold = best_score - abs(best_score) * tolerance
+        eligible = [result for result in complete if result["mean_score"] >= threshold]
+        return min(eligible, key=lambda result: result[f"mean_{by}"])
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self._connection.close()
@@ -1,2 +1,2 @@
 from .logger import setup_logger
-from .file_manager import create_directory, save_file, load_file, delete_directory
+from .file_manager import create_directory, save_file, load_file, atomic_write, delete_directory
@@ -1,5 +1,7 @@
 import os
 import shutil
+import tempfile
+from contextlib import contextmanager
 
 def create_directory(path: str):
     """
@@ -37,6 +39,37 @@ def load_file(path: str) -> bytes:
     with open(path, "rb") as file:
         return file.read()
 
+@contextmanager
+def atomic_write(path: str, mode: str = "w", encoding: str = None, fsync: bool = False):
+    """
+    Opens a temporary file next to path that replaces path once the block exits without an error.
+    Readers see either the previous or the complete new file, never a partial one; on an error
+    the temporary file is removed and path is left untouched.
+
+    Args:
+        path (str): Path of the file to write.
+        mode (str): "w" for text or "wb" for binary content.
+        encoding (str, optional): Text encoding.
+        fsync (bool): Whether to flush the content to disk before the file is moved into place.
+
+    Yields:
+        File object to write to.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    create_directory(directory)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, mode, encoding=encoding) as file:
+            yield file
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
 def delete_directory(path: str):
     """
     Deletes a directory and its contents.
@@ -0,0 +1,109 @@
+import numpy as np
+
+def encode_labels(values: np.ndarray):
+    """
+    Maps labels to dense integer codes.
+
+    Args:
+        values (np.ndarray): Array of labels of any shape.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Sorted distinct labels and the code of each entry,
+        with the same shape as values.
+    """
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.integer) and values.size:
+        low = values.min()
+        span = int(values.max() - low) + 1
+        # Small integer ranges are encoded with a lookup table instead of a full sort
+        if span <= values.size:
+            offsets = values - low
+            present = np.bincount(offsets.ravel(), minlength=span) > 0
+            codes = (np.cumsum(present) - 1)[offsets]
+            return np.flatnonzero(present) + low, codes
+
+    labels, codes = np.unique(values, return_inverse=True)
+    return labels, codes.reshape(values.shape)
+
+def present_mask(values: np.ndarray) -> np.ndarray:
+    """
+    Marks which entries hold a label, treating None and NaN as missing.
+
+    Args:
+        values (np.ndarray): Array of labels of any shape.
+
+    Returns:
+        np.ndarray: Boolean mask, True where a label is present.
+    """
+    values = np.asarray(values)
+    if values.dtype == object:
+        # NaN is the only value not equal to itself
+        return np.not_equal(values, None) & np.equal(values, values)
+    if np.issubdtype(values.dtype, np.floating):
+        return ~np.isnan(values)
+    return np.ones(values.shape, dtype=bool)
+
+class LabelVocabulary:
+    """
+    Assigns stable integer codes to labels as they are first seen.
+    """
+
+    def __init__(self, labels=None):
+        """
+        Initializes the vocabulary.
+
+        Args:
+            labels (Iterable, optional): Labels to register up front, in code order.
+        """
+        self.labels = []
+        self._codes = {}
+        if labels is not None:
+            self.add(labels)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def add(self, labels) -> np.ndarray:
+        """
+        Registers labels that are not yet known.
+
+        Args:
+            labels (Iterable): Distinct labels to register.
+
+        Returns:
+            np.ndarray: Code of each given label.
+        """
+        codes = []
+        for label in labels:
+            label = label.item() if isinstance(label, np.generic) else label
+            if label not in self._codes:
+                self._codes[label] = len(self.labels)
+                self.labels.append(label)
+            codes.append(self._codes[label])
+        return np.asarray(codes, dtype=np.int64)
+
+    def encode(self, values) -> np.ndarray:
+        """
+        Encodes an array of labels, registering unseen ones.
+        Only the distinct values are looked up in Python; the mapping itself is vectorized.
+
+        Args:
+            values (np.ndarray): Array of labels of any shape.
+
+        Returns:
+            np.ndarray: Integer codes with the same shape as values.
+        """
+        uniques, inverse = encode_labels(values)
+        return self.add(uniques)[inverse]
+
+    def decode(self, codes) -> np.ndarray:
+        """
+        Maps integer codes back to labels.
+
+        Args:
+            codes (np.ndarray): Integer codes.
+
+        Returns:
+            np.ndarray: Labels for the given codes.
+        """
+        return np.asarray(self.labels)[np.asarray(codes)]